@@ -0,0 +1,172 @@
+# ~/pidisplay/cards/atlas.py
+# Pre-scaled icon atlas: every PNG under icons/ is decoded and resized once,
+# packed into state/icons.atlas, and handed to cards as ready RGBA images.
+#
+# File layout:  MAGIC | u32 header length | JSON header | raw RGBA pixels
+# The header carries a signature of (source PNG stats, target sizes); the
+# atlas is rebuilt only when that signature changes.
+import os
+import json
+import time
+import struct
+import hashlib
+import logging
+import threading
+from PIL import Image
+
+from . import base
+from .base import MENU_ICON_SIZE, get_config
+
+ATLAS_PATH = os.path.expanduser("~/pidisplay/state/icons.atlas")
+MAGIC = b"PIATLAS1"
+
+# icons/ sub-directory -> config padding keys (or fixed ints) it is scaled to
+GROUPS = {
+    os.path.join("weather", "base"):                  ("hero_sz",),
+    os.path.join("weather", "layers"):                ("hero_sz",),
+    os.path.join("weather", "layers", "tiny_layers"): ("icon_sz_tiny",),
+    "":                                               ("news_icon_sz",),
+    "menu":                                           (MENU_ICON_SIZE,),
+}
+
+_DEFAULT_SIZES = {"hero_sz": 100, "icon_sz_tiny": 20, "news_icon_sz": 24}
+
+def _sizes_for(keys, padding):
+    return sorted({k if isinstance(k, int) else int(padding.get(k, _DEFAULT_SIZES[k])) for k in keys})
+
+def _sources(icon_dir):
+    """[(relpath, abspath, stat)] for every PNG in a known group, sorted."""
+    out = []
+    for group in GROUPS:
+        d = os.path.join(icon_dir, group)
+        try:
+            names = sorted(os.listdir(d))
+        except OSError:
+            continue
+        for name in names:
+            if name.lower().endswith(".png"):
+                path = os.path.join(d, name)
+                out.append((os.path.join(group, name), path, os.stat(path)))
+    return out
+
+def _signature(sources, plan):
+    h = hashlib.sha1(MAGIC)
+    for rel, _, st in sources:
+        h.update(f"{rel}|{st.st_mtime_ns}|{st.st_size}\n".encode())
+    h.update(json.dumps(plan, sort_keys=True).encode())
+    return h.hexdigest()
+
+class Atlas:
+    """Read-only set of pre-scaled RGBA icons keyed by (relpath, size)."""
+
+    def __init__(self, sig, entries, blob):
+        self.sig = sig
+        self._images = {}
+        view = memoryview(blob)
+        for key, (off, w, h) in entries.items():
+            rel, sz = key.rsplit("@", 1)
+            im = Image.frombuffer("RGBA", (w, h), view[off:off + w * h * 4], "raw", "RGBA", 0, 1)
+            self._images[(rel, int(sz))] = im
+
+    def get(self, rel, size):
+        return self._images.get((rel, int(size)))
+
+    def __len__(self):
+        return len(self._images)
+
+def build(path, sources, plan, sig):
+    entries, chunks, off = {}, [], 0
+    for rel, src, _ in sources:
+        group = os.path.dirname(rel)
+        try:
+            im = Image.open(src).convert("RGBA")
+        except Exception as e:
+            logging.warning(f"Atlas: skipping {rel}: {e}")
+            continue
+        for sz in plan[group]:
+            scaled = im.resize((sz, sz), Image.Resampling.LANCZOS)
+            data = scaled.tobytes()
+            entries[f"{rel}@{sz}"] = (off, sz, sz)
+            chunks.append(data)
+            off += len(data)
+    header = json.dumps({"sig": sig, "entries": entries}).encode()
+    blob = b"".join(chunks)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"   # render pool workers may rebuild at the same time
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header + blob)
+    os.replace(tmp, path)
+    logging.info(f"Atlas rebuilt: {len(entries)} icons, {len(blob)} bytes -> {path}")
+    return Atlas(sig, entries, blob)
+
+def read(path, sig=None):
+    """Load an atlas with a single read. None if missing, corrupt or stale."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:len(MAGIC)] != MAGIC:
+        return None
+    start = len(MAGIC) + 4
+    (hlen,) = struct.unpack_from("<I", data, len(MAGIC))
+    try:
+        header = json.loads(data[start:start + hlen])
+    except ValueError:
+        return None
+    if sig is not None and header.get("sig") != sig:
+        return None
+    return Atlas(header["sig"], header["entries"], memoryview(data)[start + hlen:])
+
+def load(path=None, icon_dir=None, padding=None):
+    """Atlas for the current icons and sizes, rebuilding the cache file if needed."""
+    path = path or ATLAS_PATH
+    icon_dir = icon_dir or base.ICON_DIR
+    if padding is None:
+        padding = get_config().padding
+    plan = {group: _sizes_for(keys, padding) for group, keys in GROUPS.items()}
+    sources = _sources(icon_dir)
+    sig = _signature(sources, plan)
+    atlas = read(path, sig)
+    return atlas if atlas is not None else build(path, sources, plan, sig)
+
+# ----------------------------------------------------------------------
+# Process-wide instance, re-validated when the config snapshot changes or
+# the icon files do (the render server and pool workers are long-lived)
+# ----------------------------------------------------------------------
+RECHECK_SEC = 2.0   # icons/ is re-stat'ed at most this often
+
+_current = None
+_current_cfg = None
+_current_stamp = None
+_checked = 0.0
+_lock = threading.Lock()
+
+def _stamp(icon_dir):
+    """Cheap view of the sources: (relpath, mtime, size) per PNG, no decoding."""
+    return tuple((rel, st.st_mtime_ns, st.st_size) for rel, _, st in _sources(icon_dir))
+
+def get_atlas():
+    global _current, _current_cfg, _current_stamp, _checked
+    cfg = get_config()
+    now = time.monotonic()
+    if _current is not None and _current_cfg is cfg and now - _checked < RECHECK_SEC:
+        return _current
+    with _lock:
+        stamp = _stamp(base.ICON_DIR)
+        if _current is None or _current_cfg is not cfg or _current_stamp != stamp:
+            try:
+                _current = load(padding=cfg.padding)
+            except Exception as e:
+                logging.error(f"Atlas load failed: {e}")
+                _current = Atlas(None, {}, b"")
+            _current_cfg, _current_stamp = cfg, stamp
+        _checked = now
+        return _current
+
+def icon(path, size):
+    """Pre-scaled RGBA icon for an absolute path under ICON_DIR, or None."""
+    rel = os.path.relpath(path, base.ICON_DIR)
+    if rel.startswith(".."):
+        return None
+    return get_atlas().get(rel, size)
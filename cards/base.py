@@ -1,19 +1,29 @@
 # ~/pidisplay/cards/base.py
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 import os
 import json
+import time
+import hashlib
+import threading
 import logging
+import rgb565
+import metrics
+from . import layout
 
 print("base.py is being imported")
 
 W, H = 480, 320
 OUT = os.path.expanduser("~/pidisplay/images")
+STATE_DIR = os.path.expanduser("~/pidisplay/state")
 ICON_DIR = os.path.expanduser("~/pidisplay/icons")
 
 ICON_WEATHER_BASE   = os.path.join(ICON_DIR, "weather", "base")
 ICON_WEATHER_LAYERS = os.path.join(ICON_DIR, "weather", "layers")
 ICON_WEATHER_TINY   = os.path.join(ICON_DIR, "weather", "layers", "tiny_layers")
+MENU_ICON_SIZE      = 24
 
 SOURCE_STYLES = {
     "fox":       {"bg": (230,240,255), "bd": (170,200,255), "icon": "fox.png"},
@@ -26,35 +36,111 @@ SOURCE_STYLES = {
 # LAZY CONFIG
 # ----------------------------------------------------------------------
 def get_config():
-    """Lazy-load config on first use – avoids circular imports"""
-    from config import load
-    return load()
+    """Current config snapshot (lazy import avoids circular imports).
+    Re-parsed only when config.yaml's mtime/size change."""
+    from config import snapshot
+    return snapshot()
 
 # ----------------------------------------------------------------------
 # HELPERS (use get_config() inside each)
 # ----------------------------------------------------------------------
-def font(size):
+# ----------------------------------------------------------------------
+# FONTS (process-wide caches; see font_cache_info())
+# ----------------------------------------------------------------------
+FONT_DIR = "/usr/share/fonts/truetype/dejavu"
+FONT_FACES = {
+    "sans":      os.path.join(FONT_DIR, "DejaVuSans.ttf"),
+    "sans-bold": os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf"),
+    "mono":      os.path.join(FONT_DIR, "DejaVuSansMono.ttf"),
+}
+DEFAULT_FACE = "sans"
+
+# Scratch surface for measuring. Cards draw on RGB images, so textbbox()
+# here gives the same answer as on the card's own ImageDraw.
+_measure_draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+@lru_cache(maxsize=8)
+def _face_bytes(face):
+    """Read a font file once per process; every size is built from these bytes."""
+    with open(FONT_FACES.get(face, face), "rb") as f:
+        return f.read()
+
+@lru_cache(maxsize=64)
+def _font(face, size):
     try:
-        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+        return ImageFont.truetype(BytesIO(_face_bytes(face)), size)
     except:
         return ImageFont.load_default()
 
-def text_size(d, txt, size):
-    l, t, r, b = d.textbbox((0,0), txt, font=font(size))
+@lru_cache(maxsize=4096)
+def _text_bbox(txt, face, size):
+    return _measure_draw.textbbox((0, 0), txt, font=_font(face, size))
+
+def font(size, face=DEFAULT_FACE):
+    return _font(face, size)
+
+def text_bbox(txt, size, face=DEFAULT_FACE):
+    """Cached (l, t, r, b) of txt at (0, 0), keyed by (text, face, size)."""
+    return _text_bbox(txt, face, size)
+
+def text_size(d, txt, size, face=DEFAULT_FACE):
+    """(width, height) of txt's ink. Measured through the cached _text_bbox,
+    not on d: the draw context is unused and only kept so existing
+    text_size(d, ...) call sites keep working (pass None where there is none)."""
+    l, t, r, b = _text_bbox(txt, face, size)
     return r - l, b - t
 
+TIMESTAMP_FMT = "%b %d %I:%M %p"   # top-right stamp on btc / news
+
+def timestamp_width(size, face=DEFAULT_FACE):
+    """Widest TIMESTAMP_FMT text at this size: any month, AM or PM."""
+    months = [datetime(2000, m, 1).strftime("%b") for m in range(1, 13)]
+    return max(text_size(None, f"{mon} 00 00:00 {ap}", size, face)[0]
+               for mon in months for ap in ("AM", "PM"))
+
+def font_cache_info():
+    """Hit/miss counters for the font registry and the measurement cache."""
+    info = {}
+    for name, fn in (("faces", _face_bytes), ("fonts", _font), ("metrics", _text_bbox)):
+        ci = fn.cache_info()
+        info[name] = {"hits": ci.hits, "misses": ci.misses, "size": ci.currsize}
+    return info
+
+# ----------------------------------------------------------------------
+# PHASE TIMINGS (ms spent per phase of the current render; the golden
+# harness resets them per card: state / encode / hash / write / fsync, rest
+# is draw). Each phase also lands in the render.<phase> metrics histogram.
+# ----------------------------------------------------------------------
+phase_ms = {}
+
+def reset_phases():
+    phase_ms.clear()
+
+def _phase_done(name, t0):
+    ms = (time.perf_counter() - t0) * 1000
+    phase_ms[name] = phase_ms.get(name, 0.0) + ms
+    metrics.observe(f"render.{name}", ms)
+
+def state_path(name):
+    """Fetcher state file, e.g. state_path("btc.json"). STATE_DIR is read at
+    call time so tools/render_harness.py can point it elsewhere."""
+    return os.path.join(STATE_DIR, name)
+
 def load_json(path):
+    t0 = time.perf_counter()
     try:
         with open(path) as f:
             return json.load(f)
     except:
         return {}
+    finally:
+        _phase_done("state", t0)
 
 def draw_header(d, title):
     cfg = get_config()
-    BG = tuple(cfg["colors"]["bg"])
-    FG = tuple(cfg["colors"]["fg"])
-    sz = cfg["fonts"]["header_size"]
+    BG = cfg.colors["bg"]
+    FG = cfg.colors["fg"]
+    sz = cfg.fonts["header_size"]
     d.rectangle([0, 0, W, 38], fill=BG)
     d.text((36, 8), title, fill=FG, font=font(sz)) # shifted text left to accomidate menu icon
 
@@ -144,21 +230,21 @@ def wc_to_tiny_layer(code: int):
     return None
 
 def load_rgba(path, size=None):
-    print(f"Attempting to load: {path} (exists: {os.path.exists(path)})")
+    """RGBA icon at size. Icons under ICON_DIR at an atlas size come
+    pre-scaled from cards/atlas.py; anything else is decoded here."""
+    if size and size[0] == size[1]:
+        from . import atlas
+        im = atlas.icon(path, size[0])
+        if im is not None:
+            return im
+    logging.debug(f"Atlas miss, decoding: {path} {size}")
     try:
         im = Image.open(path).convert("RGBA")
         if size:
             im = im.resize(size, Image.Resampling.LANCZOS)
         return im
     except Exception as e:
-        print(f"Load failed for {path}: {e}")
-        return None
-
-def load_icon(path, size):
-    try:
-        im = Image.open(path).convert("RGBA")
-        return im.resize((size, size), Image.Resampling.LANCZOS)
-    except:
+        logging.warning(f"Load failed for {path}: {e}")
         return None
 
 _icon_cache = {}
@@ -166,39 +252,22 @@ def load_icon(path, size):
     key = (path, size)
     if key in _icon_cache:
         return _icon_cache[key]
-    try:
-        img = Image.open(path).convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
-    except Exception:
-        # fallback: simple placeholder if no icon
-        img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-        dr = ImageDraw.Draw(img)
-        dr.rectangle([0, 0, size-1, size-1], outline=(60, 60, 60), width=1)
+    from . import atlas
+    img = atlas.icon(path, size)
+    if img is None:
+        try:
+            img = Image.open(path).convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
+        except Exception:
+            # fallback: simple placeholder if no icon
+            img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            dr = ImageDraw.Draw(img)
+            dr.rectangle([0, 0, size-1, size-1], outline=(60, 60, 60), width=1)
     _icon_cache[key] = img
     return img
 
 def wrap_text_px(d, text, fnt, max_w, max_lines=2):
-    words = text.split()
-    lines = []
-    cur = []
-    for word in words:
-        test = " ".join(cur + [word])
-        w, _ = text_size(d, test, fnt.size)
-        if w <= max_w:
-            cur.append(word)
-        else:
-            if cur:
-                lines.append(" ".join(cur))
-                cur = [word]
-            else:
-                lines.append(word)
-                cur = []
-        if len(lines) >= max_lines:
-            break
-    if cur:
-        lines.append(" ".join(cur))
-    if len(lines) > max_lines:
-        lines[-1] = lines[-1][:-3] + "..."
-    return lines
+    """Kept for older callers; see cards/layout.py."""
+    return list(layout.wrap(text, fnt, max_w, max_lines))
 
 def get_source_style(src: str):
     return SOURCE_STYLES.get((src or "").lower(), SOURCE_STYLES["_default"])
@@ -216,29 +285,102 @@ def is_stale(ts_iso, max_age_sec=180):
     except:
         return True
 
+# ----------------------------------------------------------------------
+# SAVING FRAMES
+# The .raw is what the display blits; it is written only when the encoded
+# frame differs from what's on disk (hash + stat check), so an unchanged
+# redraw costs no SD-card write or fsync. The .png is a preview: written
+# in a background thread when render.png is on, or on demand via
+# save_png() (render_server "preview", render.py --preview).
+# ----------------------------------------------------------------------
+DEFAULT_PNG_COMPRESS = 6   # zlib level for previews; 1 is ~3x faster, ~20% bigger
+
+save_stats = {"writes": 0, "writes_avoided": 0, "bytes_written": 0, "bytes_saved": 0, "png": 0}
+_saved = {}       # raw path -> (digest, size, mtime_ns) of the frame we last wrote
+_last_image = {}  # card -> last rendered PIL image (for previews)
+_png_pool = None
+_png_lock = threading.Lock()
+
+def _frame_digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _unchanged(raw_path, digest, size):
+    """True if raw_path already holds a frame with this digest. Trusts our own
+    record while the file's size/mtime still match it; otherwise hashes the
+    file once (first save after a restart)."""
+    try:
+        st = os.stat(raw_path)
+    except OSError:
+        return False
+    if st.st_size != size:
+        return False
+    known = _saved.get(raw_path)
+    if known and known[1:] == (st.st_size, st.st_mtime_ns):
+        return known[0] == digest
+    with open(raw_path, "rb") as f:
+        on_disk = _frame_digest(f.read())
+    _saved[raw_path] = (on_disk, st.st_size, st.st_mtime_ns)
+    return on_disk == digest
+
 def atomic_save(img, name):
-    png_path = os.path.join(OUT, f"{name}.png")
     raw_path = os.path.join(OUT, f"{name}.raw")
-    tmp_png = png_path + ".tmp"
     tmp_raw = raw_path + ".tmp"
+    _last_image[name] = img
 
-    img.save(tmp_png, "PNG", optimize=True)
+    t0 = time.perf_counter()
+    data = rgb565.encode(img)  # RGB565 little-endian, vectorized
+    _phase_done("encode", t0)
+
+    t0 = time.perf_counter()
+    digest = _frame_digest(data)
+    unchanged = _unchanged(raw_path, digest, len(data))
+    _phase_done("hash", t0)
+    if unchanged:
+        save_stats["writes_avoided"] += 1
+        save_stats["bytes_saved"] += len(data)
+    else:
+        t0 = time.perf_counter()
+        with open(tmp_raw, "wb") as f:
+            f.write(data)
+            f.flush()
+            _phase_done("write", t0)
+            t0 = time.perf_counter()
+            os.fsync(f.fileno())
+        os.replace(tmp_raw, raw_path)
+        _phase_done("fsync", t0)
+        st = os.stat(raw_path)
+        _saved[raw_path] = (digest, st.st_size, st.st_mtime_ns)
+        save_stats["writes"] += 1
+        save_stats["bytes_written"] += len(data)
+
+    render_cfg = get_config().get("render") or {}
+    png_path = os.path.join(OUT, f"{name}.png")
+    if render_cfg.get("png") and not (unchanged and os.path.exists(png_path)):
+        save_png(name)
+    return raw_path
+
+def _write_png(img, png_path, level):
+    tmp_png = png_path + ".tmp"
+    t0 = time.perf_counter()
+    img.save(tmp_png, "PNG", compress_level=level)
     os.replace(tmp_png, png_path)
+    metrics.observe("render.png", (time.perf_counter() - t0) * 1000)
+    save_stats["png"] += 1
+    return png_path
 
-    data = bytearray()
-    pixels = img.convert("RGB").load()
-    for y in range(H):
-        for x in range(W):
-            r, g, b = pixels[x, y]
-            r5 = (r >> 3) & 0x1F
-            g6 = (g >> 2) & 0x3F
-            b5 = (b >> 3) & 0x1F
-            pixel = (r5 << 11) | (g6 << 5) | b5
-            data.extend(pixel.to_bytes(2, "little"))
-    with open(tmp_raw, "wb") as f:
-        f.write(data)
-        f.flush()
-        os.fsync(f.fileno())
-    os.replace(tmp_raw, raw_path)
-
-    return png_path
\ No newline at end of file
+def save_png(name, compress=None):
+    """Write OUT/<name>.png from the last frame rendered in this process, or
+    from the .raw on disk, in the PNG worker thread. Returns a Future whose
+    result is the path. compress defaults to render.png_compress."""
+    global _png_pool
+    img = _last_image.get(name)
+    if img is None:
+        with open(os.path.join(OUT, f"{name}.raw"), "rb") as f:
+            img = Image.fromarray(rgb565.decode_array(f.read(), W, H))
+    if compress is None:
+        compress = (get_config().get("render") or {}).get("png_compress", DEFAULT_PNG_COMPRESS)
+    with _png_lock:
+        if _png_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _png_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="png")
+    return _png_pool.submit(_write_png, img, os.path.join(OUT, f"{name}.png"), int(compress))
@@ -0,0 +1,65 @@
+# ~/pidisplay/cards/layout.py
+# Pixel-width text wrapping for card cells (news headlines, etc.)
+from functools import lru_cache
+
+ELLIPSIS = "…"
+
+@lru_cache(maxsize=8192)
+def advance(fnt, txt):
+    """Advance width of txt in pixels. Fonts come from base.font(), which
+    hands back the same object per (face, size), so fnt is a stable key."""
+    return fnt.getlength(txt)
+
+def fit_ellipsis(fnt, text, max_w):
+    """Longest prefix of text that fits max_w with an ellipsis appended.
+    Binary search over the character count; returns text untouched if it fits."""
+    text = text.rstrip()
+    if advance(fnt, text) <= max_w:
+        return text
+    lo, hi = 0, len(text)  # invariant: prefix of length lo fits
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if fnt.getlength(text[:mid].rstrip() + ELLIPSIS) <= max_w:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + ELLIPSIS
+
+@lru_cache(maxsize=1024)
+def wrap(text, fnt, max_w, max_lines=2):
+    """Greedy word wrap to max_w pixels, at most max_lines lines.
+
+    Word widths are measured once and lines are built from running sums, so
+    the work is linear in the number of words. If the text doesn't fit, the
+    last line is filled with as much of the remainder as fits before an
+    ellipsis. Returns a tuple of lines (cached per (text, font, max_w, max_lines)).
+    """
+    words = (text or "").split()
+    if not words or max_lines < 1:
+        return ()
+    widths = [advance(fnt, w) for w in words]
+    space = advance(fnt, " ")
+
+    lines = []
+    i, n = 0, len(words)
+    while i < n:
+        start, w = i, widths[i]
+        i += 1
+        while i < n and w + space + widths[i] <= max_w:
+            w += space + widths[i]
+            i += 1
+        if len(lines) == max_lines - 1 and i < n:
+            # Last allowed line but words remain: ellipsize the whole remainder
+            lines.append(fit_ellipsis(fnt, " ".join(words[start:]), max_w))
+            break
+        line = " ".join(words[start:i])
+        lines.append(fit_ellipsis(fnt, line, max_w) if w > max_w else line)
+    return tuple(lines)
+
+def layout_cache_info():
+    """Hit/miss counters for laid-out lines and word advances."""
+    info = {}
+    for name, fn in (("lines", wrap), ("advances", advance)):
+        ci = fn.cache_info()
+        info[name] = {"hits": ci.hits, "misses": ci.misses, "size": ci.currsize}
+    return info
@@ -1,64 +1,46 @@
 # ~/pidisplay/cards/news.py
 from .base import *
-import json
+from .base import _phase_done
+from . import layout
+import time
+import logging
+import sqlite3
+import news_store
+import news_cluster
 from datetime import datetime, timezone
-import re
-import hashlib
-
-def _norm_key(t):
-    return re.sub(r"[^a-z0-9 ]+", " ", (t or "").lower())
-
-def _similar(a: str, b: str, thresh=0.85):
-    ta = set(_norm_key(a).split())
-    tb = set(_norm_key(b).split())
-    if not ta or not tb: return False
-    j = len(ta & tb) / len(ta | tb)
-    return j >= thresh
 
 def cluster_news(items, top_n=5):
-    groups = []
-    for it in sorted(items, key=lambda x: x.get("ts",""), reverse=True):
-        placed = False
-        for g in groups:
-            if _similar(it.get("title",""), g[0].get("title","")):
-                g.append(it); placed = True; break
-        if not placed:
-            groups.append([it])
-
-    reps = []
-    for g in groups:
-        rep = max(g, key=lambda it: it.get("ts",""))
-        rep = dict(rep)
-        rep["count"] = len(g)
-        reps.append(rep)
-    reps.sort(key=lambda it: it.get("ts",""), reverse=True)
-    return reps[:top_n]
-
-def older_than_24h(ts):
+    """Near-duplicate groups, newest first, each rep carrying "count".
+    Items from the store already carry their "cluster"; anything else is
+    clustered here, newest first, with the same LSH engine."""
+    if not all("cluster" in it for it in items):
+        c = news_cluster.Clusterer()
+        items = sorted(items, key=lambda x: x.get("ts", ""), reverse=True)
+        items = [dict(it, cluster=c.add(i, it.get("title", ""))) for i, it in enumerate(items)]
+    return news_cluster.group(items, top_n)
+
+def load_recent(sources):
+    """Last 24 h of headlines from these sources, newest first. The store
+    filters on its (source, ts) index, so nothing else is read or parsed."""
+    t0 = time.perf_counter()
     try:
-        t = datetime.fromisoformat(ts.replace("Z","+00:00"))
-        return (datetime.now(timezone.utc) - t).total_seconds() > 24*3600
-    except:
-        return True
+        with news_store.NewsStore(state_path(news_store.DB_NAME)) as store:
+            return store.recent(sources, now=datetime.now(timezone.utc).timestamp())
+    except sqlite3.Error as e:
+        logging.warning(f"news store unreadable: {e}")
+        return []
+    finally:
+        _phase_done("state", t0)
 
 def render():
     cfg = get_config()
-    data = load_json(os.path.expanduser("~/pidisplay/state/news.json"))
-    img = Image.new("RGB", (W, H), tuple(cfg["colors"]["bg"]))
+    img = Image.new("RGB", (W, H), cfg.colors["bg"])
     d = ImageDraw.Draw(img)
+    draw_header(d, "News")
 
-    title = "News"
-    if data and data.get("loc", {}).get("city"):
-        title += f" • {data['loc']['city']}"
-    draw_header(d, title)
-
-    items = data.get("items", []) or []
-
-    # New: Filter items by enabled sources from config
-    enabled_sources = {s.lower() for s, enabled in cfg.get("sources", {}).get("news", {}).items() if enabled}
-    items = [it for it in items if (it.get("source") or "").lower() in enabled_sources]
-
-    items = [it for it in items if not older_than_24h(it.get("ts", ""))]
+    # Only the sources enabled in config
+    enabled_sources = sorted(s.lower() for s, enabled in cfg.get("sources", {}).get("news", {}).items() if enabled)
+    items = load_recent(enabled_sources)
     clusters = cluster_news(items, top_n=5) if items else []
 
     if not clusters:
@@ -67,10 +49,10 @@ def render():
         return atomic_save(img, "news")
 
     # === Top-right timestamp ===
-    stamp = datetime.now().strftime("%b %d %I:%M %p")
-    sw, _ = text_size(d, stamp, cfg["fonts"]["timestamp_size"])
-    d.text((W - sw - cfg["padding"]["timestamp_x"], cfg["padding"]["timestamp_y"]),
-           stamp, fill=tuple(cfg["colors"]["time_stamp"]), font=font(cfg["fonts"]["timestamp_size"]))
+    stamp = datetime.now().strftime(TIMESTAMP_FMT)
+    sw, _ = text_size(d, stamp, cfg.fonts["timestamp_size"])
+    d.text((W - sw - cfg.padding["timestamp_x"], cfg.padding["timestamp_y"]),
+           stamp, fill=cfg.colors["time_stamp"], font=font(cfg.fonts["timestamp_size"]))
 
     y = 38 + 6  # below header
     for cluster in clusters:
@@ -102,13 +84,13 @@ def render():
         # Badge
         if count > 1:
             badge = f"×{count}"
-            bw = d.textbbox((0,0), badge, font=font(14))[2]
+            bw = text_bbox(badge, 14)[2]
             bx0 = icon_x - 6 - bw - 6
             d.rounded_rectangle([bx0, y0 + 6, bx0 + bw + 12, y0 + 24], radius=3, fill=(max(0, bg[0]-18), max(0, bg[1]-18), max(0, bg[2]-18)))
             d.text((bx0 + 6, y0 + 6), badge, fill=(20,20,20), font=font(14))
 
         # Title
-        lines = wrap_text_px(d, title, font(19), icon_x - 8 - 12, max_lines=2)
+        lines = layout.wrap(title, font(19), icon_x - 8 - 12, max_lines=2)
         for i, line in enumerate(lines):
             d.text((12 + 8, y0 + 8 + i*22), line, fill=(20,20,20), font=font(19))
 
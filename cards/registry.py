@@ -0,0 +1,93 @@
+# ~/pidisplay/cards/registry.py
+# What each card's output depends on, so a render can be skipped when none
+# of it changed (render_coordinator.py) and a config edit re-renders only
+# the cards that read the edited keys (config_diff.py):
+#   state   - files under base.STATE_DIR the card reads
+#   config  - config.yaml keys the card reads: "section.key", or a whole
+#             "section". Keep in step with the cfg.colors/fonts/padding
+#             lookups in the card (and base.draw_header for HEADER).
+#   every   - seconds per time bucket for cards that show the time at that
+#             granularity (clock: minutes; weather: "Coming Up" hours and
+#             the 30 min stale footer), None if only data changes matter
+#
+# The header timestamps on btc/news say when the card was last redrawn, so
+# they follow data changes rather than the wall clock.
+import os
+import json
+import hashlib
+from collections import namedtuple
+from . import base
+
+Card = namedtuple("Card", "name state config every")
+
+HEADER = ("colors.bg", "colors.fg", "fonts.header_size")   # base.draw_header
+TIMESTAMP = ("colors.time_stamp", "fonts.timestamp_size", "padding.timestamp_x", "padding.timestamp_y")
+
+CARDS = {
+    "clock":   Card("clock", (), ("colors.bg", "colors.fg", "colors.accent",
+                                  "fonts.clock_time_size", "fonts.clock_date_size"), 60),
+    "weather": Card("weather", ("weather.json",), HEADER + TIMESTAMP + (
+                    "colors.accent", "colors.muted", "colors.day_bg",
+                    "fonts.big_temp_size", "fonts.footer_size", "fonts.weather_desc_size",
+                    "fonts.weather_coming_up_size", "fonts.weather_hourly_time_size",
+                    "fonts.weather_hourly_temp_size", "fonts.weather_hourly_pop_size",
+                    "padding.hourly_y", "padding.hourly_col_w", "padding.time_dy", "padding.temp_dy",
+                    "padding.pop_dy", "padding.icon_dx", "padding.icon_dy", "padding.icon_sz_tiny",
+                    "padding.hero_sz", "padding.hero_x", "padding.hero_y", "padding.coming_up_y"), 900),
+    "btc":     Card("btc", ("btc.json",), HEADER + TIMESTAMP + (
+                    "colors.accent", "colors.muted", "fonts.btc_price_size", "fonts.btc_change_size"), None),
+    # WAL mode: committed rows land in news.db-wal until a checkpoint.
+    # (The news_* fonts/padding defaults aren't read yet: sizes are literals.)
+    "news":    Card("news", ("news.db", "news.db-wal"), HEADER + TIMESTAMP + ("sources",), None),
+}
+
+def cards_for_state(filename):
+    """Cards that read this state file (basename)."""
+    return [c.name for c in CARDS.values() if filename in c.state]
+
+def cards_for_config(keys):
+    """Cards that read any of these config keys ("section" or "section.key")."""
+    out = []
+    for c in CARDS.values():
+        for key in keys:
+            section = key.split(".", 1)[0]
+            if key in c.config or section in c.config or any(k.startswith(key + ".") for k in c.config):
+                out.append(c.name)
+                break
+    return out
+
+def config_value(cfg, key):
+    """cfg["section"] or cfg["section"]["key"] for a dotted key (None if absent)."""
+    section, _, sub = key.partition(".")
+    value = cfg.get(section)
+    if sub:
+        value = value.get(sub) if hasattr(value, "get") else None
+    return value
+
+def _plain(obj):
+    """Config snapshot section -> JSON-able (mappings/tuples are frozen)."""
+    if hasattr(obj, "items"):
+        return {str(k): _plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(v) for v in obj]
+    return obj
+
+def fingerprint(card, cfg, now):
+    """sha1 over the card's state files, config keys and time bucket."""
+    h = hashlib.sha1()
+    for name in card.state:
+        h.update(name.encode() + b"\0")
+        try:
+            with open(base.state_path(name), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"\0missing")
+    for key in card.config:
+        h.update(key.encode() + b"\0")
+        h.update(json.dumps(_plain(config_value(cfg, key)), sort_keys=True).encode())
+    if card.every:
+        h.update(b"t%d" % (now // card.every))
+    return h.hexdigest()
+
+def output_exists(name):
+    return os.path.exists(os.path.join(base.OUT, f"{name}.raw"))
@@ -1,15 +1,107 @@
 # ~/pidisplay/config.py
 import yaml
 import os
+import threading
+import time
+import metrics
 from pathlib import Path
+from types import MappingProxyType
 
 CONFIG_PATH = Path(os.path.expanduser("~/pidisplay/config.yaml"))
 
-def load():
-    if not CONFIG_PATH.exists():
+# ----------------------------------------------------------------------
+# Snapshot: parsed once per (path, mtime, size), immutable, shareable
+# between the watchdog thread and the render path without locking.
+# ----------------------------------------------------------------------
+_snapshot = None
+_lock = threading.Lock()
+_parse_count = 0
+
+def _freeze(obj):
+    """dict -> read-only mapping, list -> tuple, recursively."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+class ConfigSnapshot:
+    """Read-only view of config.yaml.
+
+    Indexes like the old dict (cfg["fonts"]["header_size"]), with lists
+    already turned into tuples, plus precomputed sections:
+    cfg.colors["bg"] is an (r, g, b) tuple, cfg.fonts / cfg.padding map
+    names to ints.
+    """
+    __slots__ = ("path", "stamp", "data", "colors", "fonts", "padding")
+
+    def __init__(self, path, stamp, raw):
+        raw = raw or {}
+        set_ = object.__setattr__
+        set_(self, "path", str(path))
+        set_(self, "stamp", stamp)            # (st_mtime_ns, st_size)
+        set_(self, "data", _freeze(raw))
+        set_(self, "colors", MappingProxyType(
+            {k: tuple(int(c) for c in v) for k, v in (raw.get("colors") or {}).items()}))
+        set_(self, "fonts", MappingProxyType(
+            {k: int(v) for k, v in (raw.get("fonts") or {}).items()}))
+        set_(self, "padding", MappingProxyType(
+            {k: int(v) for k, v in (raw.get("padding") or {}).items()}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is read-only")
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        return self.data.items()
+
+    def __repr__(self):
+        return f"<ConfigSnapshot {self.path} stamp={self.stamp}>"
+
+def snapshot():
+    """Current config. Costs one stat() unless config.yaml changed."""
+    global _snapshot, _parse_count
+    path = CONFIG_PATH
+    if not path.exists():
         save_default()
-    with open(CONFIG_PATH) as f:
-        return yaml.safe_load(f)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    snap = _snapshot
+    if snap is not None and snap.stamp == stamp and snap.path == str(path):
+        return snap
+    with _lock:
+        snap = _snapshot
+        if snap is not None and snap.stamp == stamp and snap.path == str(path):
+            return snap
+        t0 = time.perf_counter()
+        with open(path) as f:
+            raw = yaml.safe_load(f)
+        _parse_count += 1
+        metrics.observe("config.parse", (time.perf_counter() - t0) * 1000)
+        snap = ConfigSnapshot(path, stamp, raw)
+        _snapshot = snap   # single reference swap; readers never see a half-built config
+        return snap
+
+def parse_count():
+    """How many times config.yaml has been YAML-parsed in this process."""
+    return _parse_count
+
+def load():
+    return snapshot()
 
 def save_default():
     default = {
@@ -18,9 +110,14 @@ def save_default():
         "intervals": {"clock": 5, "weather": 10, "btc": 8, "news": 12},  # Slide delays in viewer (seconds per card)
         "colors": {"bg": [12,12,12], "fg": [235,235,235], "accent": [0,100,255], "muted": [220,220,220], "day_bg": [55,175,255], "time_stamp": [200,200,200]},
         "fonts": {"timestamp_size": 20, "header_size": 19, "footer_size": 18, "big_temp_size": 56, "clock_time_size": 92, "clock_date_size": 36, "btc_price_size": 72, "btc_change_size": 32, "weather_desc_size": 26, "weather_coming_up_size": 18, "weather_hourly_time_size": 16, "weather_hourly_temp_size": 20, "weather_hourly_pop_size": 14, "news_title_size": 19, "news_badge_size": 14},
+        "live_clock": {"card": True, "overlay": False, "overlay_cards": ["btc", "news"], "seconds": False},  # Drawn every second by the display process
+        "transitions": {"swipe": "slide", "auto": "fade", "fps": 30, "duration_ms": 300},  # none | slide | fade
+        "fetch": {"intervals": {"btc": 30, "weather": 600, "geo": 21600, "fox": 180, "breitbart": 180}, "coalesce_s": 20, "concurrency": 3, "render": True},  # fetch_daemon.py
+        "metrics": {"enabled": True, "export_interval": 60},  # state/metrics.json + metrics.prom
+        "render": {"watch": True, "png": False, "png_compress": 6},  # render_server re-renders cards when their inputs change; .png previews off (on demand)
         "padding": {"timestamp_x": 12, "timestamp_y": 12, "hourly_y": 180, "hourly_col_w": 72, "time_dy": 0, "temp_dy": 18, "pop_dy": 38, "icon_dx": 36, "icon_dy": 16, "icon_sz_tiny": 20, "hero_sz": 100, "hero_x": 170, "hero_y": 58, "coming_up_y": 156, "footer_y": 290, "news_top_margin": 6, "news_cell_h": 53, "news_gap": 2, "news_l_margin": 12, "news_r_margin": 12, "news_pad": 8, "news_icon_sz": 24, "news_border": 1}
     }
     for card in default["cards"]["order"]:
         default["cards"]["enabled"][card] = True
     with open(CONFIG_PATH, "w") as f:
-        yaml.dump(default, f)
\ No newline at end of file
+        yaml.dump(default, f)
@@ -0,0 +1,57 @@
+# config_diff.py - What a config.yaml edit affects
+#
+# Compares two config snapshots key by key (one level into each section:
+# "colors.bg", "intervals.news", "cards.order") and maps the changed keys to
+#   cards       - cards whose frames depend on them (cards/registry.py)
+#   subsystems  - display-side state to refresh without any render:
+#                 slideshow (order, enabled, intervals), transitions,
+#                 live_clock (its glyphs use the clock/timestamp styling),
+#                 metrics; fetch / render are picked up by their daemons.
+#
+#   impact = config_diff.diff(old_cfg, new_cfg)
+#   impact.cards        -> ["weather"]
+#   impact.subsystems   -> {"slideshow"}
+from collections import namedtuple
+
+from cards import registry
+
+Impact = namedtuple("Impact", "keys cards subsystems")
+
+SUBSYSTEMS = {
+    "cards": "slideshow",
+    "intervals": "slideshow",
+    "transitions": "transitions",
+    "live_clock": "live_clock",
+    "metrics": "metrics",
+    "fetch": "fetch",
+    "render": "render",
+}
+
+# live_clock.LiveClock styling (see its __init__)
+LIVE_CLOCK_KEYS = ("colors.bg", "colors.accent", "colors.time_stamp", "fonts.clock_time_size",
+                   "fonts.timestamp_size", "padding.timestamp_x", "padding.timestamp_y")
+
+def changed_keys(old, new):
+    """Sorted dotted keys whose values differ. Sections that are mappings on
+    both sides are compared per key; anything else as a whole."""
+    keys = set()
+    for section in set(old.keys()) | set(new.keys()):
+        a, b = old.get(section), new.get(section)
+        if a == b:
+            continue
+        if hasattr(a, "keys") and hasattr(b, "keys"):
+            keys.update(f"{section}.{k}" for k in set(a.keys()) | set(b.keys()) if a.get(k) != b.get(k))
+        else:
+            keys.add(section)
+    return sorted(keys)
+
+def diff(old, new):
+    keys = changed_keys(old, new)
+    subsystems = set()
+    for key in keys:
+        section = key.split(".", 1)[0]
+        if section in SUBSYSTEMS:
+            subsystems.add(SUBSYSTEMS[section])
+        if key in LIVE_CLOCK_KEYS or (key == section and section in ("colors", "fonts", "padding")):
+            subsystems.add("live_clock")
+    return Impact(keys, registry.cards_for_config(keys), subsystems)
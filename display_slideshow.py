@@ -8,47 +8,58 @@ sys.path.insert(0, os.path.dirname(__file__))
 import glob
 import time
 import logging
-import subprocess
 from pathlib import Path
 from config import load as load_config
 import watchdog.events
 import watchdog.observers
 import queue
 import threading  # Added for Thread
-import input_handler  # New: Import the input module
-from PIL import Image  # For composites
-import numpy as np  # For fast RGB565 conversion
+import input_handler  # Touch reader: evdev -> Gesture objects
+import framebuffer  # mmap'd /dev/fb1 with sysfs geometry
+import fbwriter  # Tile-diff framebuffer writes
+import frame_cache  # In-memory composited frames
+import overlay  # RGB565 sprite blending
+import live_clock  # 1 Hz clock from glyph sprites
+import transitions  # Slide/fade between cached frames
+import metrics  # Stage timing histograms -> state/metrics.json
+import render  # Parallel re-render (RenderPool)
+import render_server  # Is the render server already re-rendering on config changes?
+import config_diff  # Which cards/subsystems a config edit touches
+import slide_scheduler  # Wait for input/frames/config until the next slide is due
+import numpy as np
 from cards import base  # Fixed import
+from cards import atlas  # Pre-scaled icons
 
 # ----------------------------------------------------------------------
 # Constants
 # ----------------------------------------------------------------------
-FB                = "/dev/fb1"
-W, H              = 480, 320
-EXPECTED_SIZE     = W * H * 2                     # 307200 bytes
+FB                = framebuffer.DEFAULT_DEVICE    # /dev/fb1, or $PIDISPLAY_FB (a plain file runs headless)
 IMAGE_DIR         = os.path.expanduser("~/pidisplay/images")
 DEFAULT_INTERVAL  = 8  # Fallback if no per-card interval
 CONFIG_PATH       = Path(os.path.expanduser("~/pidisplay/config.yaml"))
 
 MENU_ICON_NORMAL = os.path.join(base.ICON_DIR, "menu", "menu.png")
 MENU_ICON_PRESSED = os.path.join(base.ICON_DIR, "menu", "menu_pressed.png")
-MENU_ICON_SIZE = 24
+MENU_ICON_SIZE = base.MENU_ICON_SIZE
 MENU_ICON_POS = (4, 7)  # Top-left, centered in 38px header
 
-# Pre-load icons at start for speed
-normal_icon = None
-pressed_icon = None
-try:
-    normal_icon = Image.open(MENU_ICON_NORMAL).convert("RGBA").resize((MENU_ICON_SIZE, MENU_ICON_SIZE), Image.Resampling.LANCZOS)
-    logging.info(f"Pre-loaded normal icon: size {normal_icon.size}")
-except Exception as e:
-    logging.error(f"Pre-load normal icon failed: {e}")
+# Menu icons come pre-scaled from the icon atlas (cards/atlas.py) and are
+# pre-encoded as RGB565 + alpha sprites (overlay.py); loaded in main()
+normal_sprite = None
+pressed_sprite = None
 
-try:
-    pressed_icon = Image.open(MENU_ICON_PRESSED).convert("RGBA").resize((MENU_ICON_SIZE, MENU_ICON_SIZE), Image.Resampling.LANCZOS)
-    logging.info(f"Pre-loaded pressed icon: size {pressed_icon.size}")
-except Exception as e:
-    logging.error(f"Pre-load pressed icon failed: {e}")
+def load_menu_icons():
+    global normal_sprite, pressed_sprite
+    sprites = {}
+    for name, path in (("normal", MENU_ICON_NORMAL), ("pressed", MENU_ICON_PRESSED)):
+        icon = atlas.icon(path, MENU_ICON_SIZE)
+        if icon:
+            sprites[name] = overlay.Sprite(icon)   # .raw order; the writer converts for the panel
+            logging.info(f"Loaded {name} menu sprite from atlas: size {icon.size}")
+        else:
+            sprites[name] = None
+            logging.error(f"Menu icon missing from atlas: {name}")
+    normal_sprite, pressed_sprite = sprites["normal"], sprites["pressed"]
 
 # ----------------------------------------------------------------------
 # Logging
@@ -62,86 +73,296 @@ logging.basicConfig(
 # Global state (re-loaded on config change)
 # ----------------------------------------------------------------------
 CONFIG          = load_config()
-config_changed  = False          # set by watchdog handler
+pending_impact  = None           # config_diff.Impact of edits the main loop hasn't applied yet
+config_lock     = threading.Lock()   # CONFIG and pending_impact change together
+CONFIG_DEBOUNCE = 0.3            # seconds: editors save as truncate + write (+ rename) bursts
 
-# Input queue from thread
+# One queue for everything the main loop reacts to: touch gestures from the
+# input thread, {"type": "frame_ready"} from FrameHandler, {"type": "config"}
+# from reload_config
 event_queue = queue.Queue()
 
 # Slideshow state
 paused = False
 menu_active = False
+menu_overlay = False   # menu.raw is on screen; the next tap closes it (main loop)
 current_index = 0
 
 # ----------------------------------------------------------------------
 # Watchdog handler – reload config when config.yaml changes
 # ----------------------------------------------------------------------
 class ConfigHandler(watchdog.events.FileSystemEventHandler):
-    def on_modified(self, event):
-        if event.src_path.endswith("config.yaml"):
-            global CONFIG, config_changed
-            CONFIG = load_config()
-            config_changed = True
-            logging.info("Config reloaded – will re-render cards")
+    """Reload once per burst of events, CONFIG_DEBOUNCE after the last one."""
+    def __init__(self):
+        self._timer = None
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ("created", "modified", "moved", "closed"):
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if os.path.basename(path) != CONFIG_PATH.name:
+            return
+        with config_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(CONFIG_DEBOUNCE, reload_config)
+            self._timer.daemon = True
+            self._timer.start()
+
+def reload_config():
+    global CONFIG, pending_impact
+    try:
+        new = load_config()
+    except Exception as e:   # half-saved or invalid YAML: keep showing the old config
+        logging.error(f"Config reload failed, keeping the current one: {e}")
+        return
+    with config_lock:
+        old = CONFIG
+        if new is old:   # same (mtime, size) snapshot: a duplicate event
+            return
+        impact = config_diff.diff(old, new)
+        CONFIG = new
+        if pending_impact is not None:   # main loop hasn't picked up the last edit yet
+            impact = config_diff.Impact(sorted(set(pending_impact.keys) | set(impact.keys)),
+                                        sorted(set(pending_impact.cards) | set(impact.cards)),
+                                        pending_impact.subsystems | impact.subsystems)
+        pending_impact = impact
+    metrics.configure(new)
+    logging.info(f"Config reloaded: {', '.join(impact.keys) or 'no changes'}")
+    event_queue.put({"type": "config"})
+
+def apply_config(impact):
+    """Main loop side of a config edit: order/intervals are read fresh every
+    slide, so only cards whose styling/sources changed get re-rendered."""
+    global live_clock_gen
+    if "live_clock" in impact.subsystems:
+        live_clock_gen += 1
+    if impact.cards:
+        logging.info(f"Config change re-renders {', '.join(impact.cards)}")
+        rerender(impact.cards)
+    elif impact.keys:
+        logging.info(f"Config change applied without rendering ({', '.join(sorted(impact.subsystems)) or '-'})")
+
+class FrameHandler(watchdog.events.FileSystemEventHandler):
+    """A card's .raw was replaced (renders end in os.replace): wake the main
+    loop, which shows the new frame now if the card is on screen."""
+    def on_moved(self, event):
+        path = event.dest_path
+        if path.endswith(".raw"):
+            event_queue.put({"type": "frame_ready", "card": os.path.basename(path)[:-len(".raw")], "path": path})
+
+# ----------------------------------------------------------------------
+# Re-render after a config change, off the display loop
+# ----------------------------------------------------------------------
+_rerender_lock = threading.Lock()
+_rerender_running = False
+_rerender_cards = set()   # queued for the next pass (config changed again while rendering)
+
+def server_watching():
+    try:
+        return bool(render_server.request("ping", timeout=2).get("watch"))
+    except (OSError, ValueError):
+        return False
+
+def rerender(cards):
+    """Start re-rendering these cards in the background; returns at once.
+    New frames show up through FrameHandler as each card finishes."""
+    global _rerender_running
+    with _rerender_lock:
+        _rerender_cards.update(cards)
+        if _rerender_running:
+            return
+        _rerender_running = True
+    threading.Thread(target=_rerender_worker, daemon=True, name="rerender").start()
+
+def _rerender_worker():
+    global _rerender_running
+    while True:
+        with _rerender_lock:
+            if not _rerender_cards:
+                _rerender_running = False
+                return
+            cards = sorted(_rerender_cards)
+            _rerender_cards.clear()
+        try:
+            if server_watching():
+                logging.info("Render server is re-rendering the affected cards")
+            else:
+                t0 = time.perf_counter()
+                results = render.render_parallel(cards,
+                    on_done=lambda name, r: logging.info(
+                        f"Re-rendered {name}: {r['ms']} ms" if r["ok"] else f"Re-render {name} failed: {r.get('error')}"))
+                logging.info(f"Re-rendered {len(results)} card(s) after config change in "
+                             f"{(time.perf_counter() - t0) * 1000:.0f} ms ({sum(r['ok'] for r in results.values())}/{len(results)} ok)")
+        except Exception as e:
+            logging.error(f"Re-render failed: {e}")
 
 # ----------------------------------------------------------------------
 # Blit a .raw file to the framebuffer
 # ----------------------------------------------------------------------
+fb_device = None   # framebuffer.Framebuffer: opened and mmap'd once
+fb_writer = None   # FramebufferWriter on top of it
+frames = frame_cache.FrameCache()  # card -> composited RGB565 frames
+fb_lock = threading.Lock()         # main loop and live clock thread share the writer
+shown_card = None                  # card currently on screen (None: menu/raw overlay)
+
+def get_writer():
+    global fb_device, fb_writer
+    if fb_writer is None:
+        fb_device = framebuffer.open_framebuffer(FB)
+        fb_writer = fbwriter.FramebufferWriter(fb_device)
+    return fb_writer
+
+input_ts = None     # kernel timestamp of the input event being answered
+loop_thread = None  # the thread running main(); other writers (live clock) don't answer input
+
+def input_answered():
+    """First framebuffer write after an input event: record the latency."""
+    global input_ts
+    if input_ts is not None and threading.current_thread() is loop_thread:
+        metrics.observe("display.input_latency", max(0.0, (time.time() - input_ts) * 1000))
+        input_ts = None
+
+def push_frame(data, label):
+    """Send one encoded frame through the tile-diff writer."""
+    with fb_lock, metrics.span("display.fb_write"):
+        st = get_writer().write(data)
+        input_answered()
+    logging.info(f"Blitted {label}: {st.bytes_written} bytes in {st.spans} span(s), "
+                 f"{st.tiles_changed}/{st.tiles_total} tiles changed, {st.ms} ms")
+
 def blit(raw_path: str):
+    global shown_card
+    shown_card = None
     try:
-        if os.path.getsize(raw_path) != EXPECTED_SIZE:
+        get_writer()
+        if os.path.getsize(raw_path) != fb_device.frame_bytes:
             raise ValueError(f"Size mismatch: {raw_path}")
-        with open(raw_path, "rb") as src, open(FB, "r+b", buffering=0) as dst:
-            dst.seek(0)
-            dst.write(src.read())
-        logging.info(f"Blitted {os.path.basename(raw_path)}")
+        with open(raw_path, "rb") as src:
+            push_frame(src.read(), os.path.basename(raw_path))
     except Exception as e:
         logging.error(f"Blit failed for {raw_path}: {e}")
 
-def composite_blit(raw_path, card, pressed=False):
-    """Composite menu button over card PNG, convert to RGB565, blit temp raw"""
-    png_path = os.path.join(IMAGE_DIR, f"{card}.png")
-    if not os.path.exists(png_path):
-        logging.warning(f"No PNG for {card} - blitting raw without overlay")
-        blit(raw_path)
+def load_raw(raw_path):
+    """A card's .raw (already RGB565 from cards/base.atomic_save) as an HxW array."""
+    with open(raw_path, "rb") as f, metrics.span("display.load_raw"):
+        data = f.read()
+    if len(data) != fb_device.frame_bytes:
+        raise ValueError(f"Size mismatch: {raw_path}")
+    return np.frombuffer(data, dtype="<u2").reshape(fb_device.height, fb_device.width)
+
+def with_menu_button(raw_path):
+    """Card frame with the normal menu sprite blended in (RGB565 domain, 24x24 only)."""
+    with metrics.span("display.composite"):
+        frame = card_base(raw_path).copy()
+        if normal_sprite:
+            overlay.blend(frame, normal_sprite, *MENU_ICON_POS)
+    return frame
+
+def card_base(raw_path):
+    """The card's frame without any overlay, from the cache."""
+    card = os.path.basename(raw_path).split(".")[0]
+    frame, _ = frames.get(card, "base", raw_path, load_raw)
+    return frame
+
+def composite_blit(raw_path, card, pressed=False, transition=None, direction=1):
+    """Show a card with the menu button. Frames come from the in-memory cache
+    and are rebuilt only when the renderer has replaced the card's .raw.
+    transition: "swipe" or "auto" to animate from what's on screen now
+    (mode per the transitions: config section)."""
+    global shown_card
+    get_writer()
+    try:
+        frame, hit = frames.get(card, "normal", raw_path, with_menu_button)
+    except Exception as e:
+        logging.error(f"Composite failed for {card}: {e}")
         return
+    if transition and card != shown_card:
+        animate(frame, transition, direction)
+    push_frame(frame, f"{card} (cache {'hit' if hit else 'miss'}, "
+                      f"hit rate {frames.hit_rate:.0%} of {frames.hits + frames.misses})")
+    shown_card = card
+    draw_live_clock(card, force=True)  # the card's baked-in time is stale
+    if pressed:
+        menu_button(raw_path, pressed=True)
 
-    logging.info(f"Starting composite for {card}, pressed={pressed}")
-    img = Image.open(png_path).convert("RGB")
-    icon = pressed_icon if pressed else normal_icon
-    if icon:
-        img.paste(icon, MENU_ICON_POS, icon)  # Alpha overlay
-        logging.info("Pasted icon successfully")
+def menu_button(raw_path, pressed):
+    """Swap the menu sprite on screen: re-blend 24x24 pixels over the clean card."""
+    sprite = pressed_sprite if pressed else normal_sprite
+    if sprite is None:
+        return
+    x, y = MENU_ICON_POS
+    try:
+        under = card_base(raw_path)[y:y + sprite.height, x:x + sprite.width]
+    except Exception as e:
+        logging.error(f"Menu button redraw failed: {e}")
+        return
+    with fb_lock:
+        with metrics.span("display.fb_patch"):
+            get_writer().patch(x, y, overlay.blend_block(under, sprite))
+        input_answered()
+
+def animate(frame, kind, direction=1):
+    tcfg = CONFIG.get("transitions") or {}
+    mode = tcfg.get(kind, "none")
+    if mode == "none":
+        return
+    try:
+        with fb_lock, metrics.span(f"display.transition.{mode}"):
+            st = transitions.run(get_writer(), get_writer().read(), frame, mode, direction,
+                                 fps=tcfg.get("fps", transitions.DEFAULT_FPS),
+                                 duration=tcfg.get("duration_ms", 300) / 1000,
+                                 on_write=input_answered)
+    except Exception as e:
+        logging.error(f"Transition failed: {e}")
+        return
+    logging.info(f"Transition {st.mode}: {st.frames_shown} frames, {st.frames_dropped} dropped, "
+                 f"{st.ms} ms ({st.fps} fps)")
+
+# ----------------------------------------------------------------------
+# Live clock (1 Hz, glyph sprites, bounding box only)
+# ----------------------------------------------------------------------
+_live_clocks = {}   # (placement, live_clock_gen) -> LiveClock
+live_clock_gen = 0  # bumped when a config edit touches the clock's styling
+
+def live_clock_for(card):
+    lc = CONFIG.get("live_clock") or {}
+    if card == "clock" and lc.get("card", True):
+        placement = "card"
+    elif lc.get("overlay", False) and card in lc.get("overlay_cards", ("btc", "news")):
+        placement = "corner"
     else:
-        logging.warning("No icon available - skipping paste")
-
-    # Fast RGB565 with numpy (no byteswap for LE Pi)
-    pixels = np.array(img, dtype=np.uint16)
-    r = (pixels[:, :, 0] >> 3) & 0x1F
-    g = (pixels[:, :, 1] >> 2) & 0x3F
-    b = (pixels[:, :, 2] >> 3) & 0x1F
-    packed = (r << 11) | (g << 5) | b
-    data = packed.astype(np.uint16).tobytes('C')  # C order, no swap
-
-    temp_raw = os.path.join(IMAGE_DIR, "temp_overlay.raw")
-    tmp_temp = temp_raw + ".tmp"
-    with open(tmp_temp, "wb") as f:
-        f.write(data)
-        f.flush()
-        os.fsync(f.fileno())
-    os.replace(tmp_temp, temp_raw)  # Atomic save
-    logging.info("Wrote temp raw atomically")
-    blit(temp_raw)
+        return None
+    key = (placement, live_clock_gen)
+    clk = _live_clocks.get(key)
+    if clk is None:
+        _live_clocks.clear()    # styling changed (or first use): rebuild glyphs
+        clk = _live_clocks[key] = live_clock.LiveClock(CONFIG, placement,
+                                                       seconds=lc.get("seconds", False))
+    return clk
+
+def draw_live_clock(card, force=False):
+    if card is None:
+        return
     try:
-        os.remove(temp_raw)
-        logging.info("Removed temp raw")
+        clk = live_clock_for(card)
+        if clk is not None:
+            with fb_lock:
+                with metrics.span("display.live_clock"):
+                    clk.tick(get_writer(), force=force)
     except Exception as e:
-        logging.error(f"Failed to remove temp raw: {e}")
+        logging.error(f"Live clock draw failed: {e}")
+
+def live_clock_thread():
+    while True:
+        time.sleep(1.0 - (time.time() % 1.0) + 0.01)   # just after each second boundary
+        draw_live_clock(shown_card)
 
 # ----------------------------------------------------------------------
 # Handle unified input event
 # ----------------------------------------------------------------------
 def handle_input_event(event, current_index, raw_files):
-    global paused, menu_active
+    global paused, menu_active, menu_overlay
     logging.info(f"Handling event: {event}")
     # Get current path/card for press effect
     path = raw_files[current_index] if raw_files else ''
@@ -150,20 +371,22 @@ def handle_input_event(event, current_index, raw_files):
     # Menu tap check first
     if event['type'] == 'tap' and event['cal_y'] < 38 and event['cal_x'] < (4 + MENU_ICON_SIZE + 4):
         logging.info("Menu tap detected - starting press effect")
-        composite_blit(path, card, pressed=True)
+        menu_button(path, pressed=True)
         time.sleep(0.2)  # Shorter for snappier feedback
-        composite_blit(path, card, pressed=False)
+        menu_button(path, pressed=False)
         menu_active = not menu_active
         return current_index  # Skip nav
 
     if event['type'] in ['tap', 'swipe_left', 'swipe_right']:
         if event['type'] == 'swipe_left' or event['zone'] == 'left':
             current_index = (current_index - 1) % len(raw_files)
-            composite_blit(raw_files[current_index], os.path.basename(raw_files[current_index]).split(".")[0])  # Use composite for nav too
+            composite_blit(raw_files[current_index], os.path.basename(raw_files[current_index]).split(".")[0],
+                           transition="swipe", direction=-1)  # Use composite for nav too
             return current_index
         elif event['type'] == 'swipe_right' or event['zone'] == 'right':
             current_index = (current_index + 1) % len(raw_files)
-            composite_blit(raw_files[current_index], os.path.basename(raw_files[current_index]).split(".")[0])
+            composite_blit(raw_files[current_index], os.path.basename(raw_files[current_index]).split(".")[0],
+                           transition="swipe", direction=1)
             return current_index
     elif event['type'] == 'long_press' and event['zone'] == 'center':
         paused = not paused
@@ -173,77 +396,109 @@ def handle_input_event(event, current_index, raw_files):
         menu_path = os.path.join(IMAGE_DIR, "menu.raw")
         if os.path.exists(menu_path):
             blit(menu_path)
+            menu_overlay = True   # main() closes it on the next tap
             logging.info("Displayed menu overlay")
-            # Drain queue for interactions (e.g., tap zones in menu)
-            while menu_active:
-                while not event_queue.empty():
-                    close_event = event_queue.get()
-                    if close_event['type'] == 'tap':
-                        menu_active = False
-                        logging.info("Closed menu overlay")
-                        blit(raw_files[current_index])  # Restore
-                        break
-                time.sleep(0.1)
     elif event['type'] in ['swipe_up', 'swipe_down']:
         logging.info(f"Vertical swipe detected: {event['type']} - Ready for scroll/menu use")
+    elif event['type'].startswith(('pinch_', 'two_finger_swipe_')):
+        logging.info(f"Gesture {event['type']} not bound yet")
     return current_index
 
 # ----------------------------------------------------------------------
 # Main loop
 # ----------------------------------------------------------------------
 def main():
+    metrics.process = "display"
+    metrics.configure(CONFIG)
+    load_menu_icons()
+
     # Start input thread
     input_thread = threading.Thread(target=input_handler.input_handler, args=(event_queue,))
     input_thread.daemon = True
     input_thread.start()
 
+    # Live clock redraws its bounding box once a second
+    clock_thread = threading.Thread(target=live_clock_thread, daemon=True)
+    clock_thread.start()
+
     # Start watchdog
     observer = watchdog.observers.Observer()
     observer.schedule(ConfigHandler(), path=str(CONFIG_PATH.parent), recursive=False)
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    observer.schedule(FrameHandler(), path=IMAGE_DIR, recursive=False)
     observer.start()
-    logging.info("Watching config.yaml for changes")
+    logging.info("Watching config.yaml and card frames for changes")
 
-    global config_changed, current_index, paused, menu_active
+    global pending_impact, current_index, paused, menu_active, menu_overlay, input_ts, loop_thread
+    loop_thread = threading.current_thread()
+    slides = slide_scheduler.SlideScheduler(event_queue)
 
     while True:
+        # One config snapshot per pass; reload_config swaps it with the impact
+        with config_lock:
+            cfg, impact, pending_impact = CONFIG, pending_impact, None
+        if impact is not None:
+            apply_config(impact)
+
         # Gather .raw files
-        enabled_cards = {c for c, on in CONFIG["cards"]["enabled"].items() if on}
+        enabled_cards = {c for c, on in cfg["cards"]["enabled"].items() if on}
         raw_files = [
             os.path.join(IMAGE_DIR, card + ".raw")
-            for card in CONFIG["cards"]["order"]
+            for card in cfg["cards"]["order"]
             if card in enabled_cards and os.path.exists(os.path.join(IMAGE_DIR, card + ".raw"))
         ]
 
-        # Re-render if config changed
-        if config_changed:
-            try:
-                subprocess.run(["/home/pi/venv/bin/python", "/home/pi/pidisplay/render.py"], check=True)
-                logging.info("All cards re-rendered after config change")
-            except Exception as e:
-                logging.error(f"Re-render failed: {e}")
-            config_changed = False
-
         if not raw_files:
-            logging.warning("No .raw files for enabled cards – sleeping")
-            time.sleep(DEFAULT_INTERVAL)
+            logging.warning("No .raw files for enabled cards – waiting")
+            slides.start(DEFAULT_INTERVAL)
+            slides.wait()   # a frame landing or a config edit ends the wait early
+            slides.hold()
             continue
+        current_index %= len(raw_files)
 
-        # Process all queued events (drain fully)
-        while not event_queue.empty():
-            event = event_queue.get()
-            current_index = handle_input_event(event, current_index, raw_files)
+        def interval_of(i):
+            return cfg["intervals"].get(os.path.basename(raw_files[i]).split(".")[0], DEFAULT_INTERVAL)
 
-        # Show current card with per-card interval (skip if paused/menu)
-        if paused or menu_active:
-            time.sleep(0.1)  # Yield
+        # Show the current card when its slide starts (skip if paused/menu)
+        if slides.deadline is None and not (paused or menu_active):
+            path = raw_files[current_index]
+            card = os.path.basename(path).split(".")[0]
+            composite_blit(path, card, transition="auto")  # Always overlay button
+            metrics.maybe_export()
+            slides.start(interval_of(current_index))
+
+        event = slides.wait()
+        if event is None:   # slide is due
+            current_index = (current_index + 1) % len(raw_files)
+            continue
+        if event["type"] == "config":
+            continue
+        if event["type"] == "frame_ready":
+            if event["card"] == shown_card and not menu_active:   # paused still shows fresh data
+                composite_blit(event["path"], event["card"])
             continue
 
-        path = raw_files[current_index]
-        card = os.path.basename(path).split(".")[0]
-        composite_blit(path, card)  # Always overlay button
-        interval = CONFIG["intervals"].get(card, DEFAULT_INTERVAL)
-        time.sleep(interval)
-        current_index = (current_index + 1) % len(raw_files)
+        if menu_overlay:
+            # Other gestures are ignored while the overlay is up; a tap closes it
+            if event["type"] == "tap":
+                menu_overlay = menu_active = False
+                logging.info("Closed menu overlay")
+                input_ts = event.get("ts")
+                path = raw_files[current_index]
+                composite_blit(path, os.path.basename(path).split(".")[0])   # latest frame from the cache
+                input_ts = None
+                if not paused:
+                    slides.start(interval_of(current_index))
+            continue
+
+        before, was_paused = current_index, paused
+        input_ts = event.get("ts")
+        current_index = handle_input_event(event, current_index, raw_files)
+        input_ts = None   # no frame for this one (pause toggle, vertical swipe)
+        if paused or menu_active:
+            slides.hold()
+        elif current_index != before or was_paused:
+            slides.start(interval_of(current_index))   # navigated/resumed: a full slide from now
 
 if __name__ == "__main__":
     try:
@@ -2,19 +2,16 @@
 
 # fb_show.py
 import sys, os
+sys.path.insert(0, os.path.dirname(__file__))
 from PIL import Image
+import framebuffer
 
-FB = "/dev/fb1"
-W, H = 480, 320
-# fb1 is 16bpp RGB565 little-endian on your panel
-RAW_FMT = "BGR;16"   # if colors look swapped, change to "RGB;16"
+FB = framebuffer.DEFAULT_DEVICE   # geometry and pixel order come from sysfs / the driver
 
 def blit(path):
-    img = Image.open(path).convert("RGB").resize((W, H), Image.BICUBIC)
-    data = img.tobytes("raw", RAW_FMT)
-    with open(FB, "r+b", buffering=0) as f:
-        f.seek(0)
-        f.write(data)
+    with framebuffer.open_framebuffer(FB) as fb:
+        img = Image.open(path).convert("RGB").resize((fb.width, fb.height), Image.BICUBIC)
+        fb.show(img)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -0,0 +1,140 @@
+# fbwriter.py - Dirty-rectangle framebuffer writer
+#
+# Keeps the last frame pushed to the panel, diffs each new frame against
+# it in fixed-size tiles, merges changed tiles into row spans and copies
+# only those spans into the mmap'd device (framebuffer.Framebuffer). A clock tick or timestamp change then costs a few KB
+# over SPI instead of the full 307,200 bytes.
+#
+# fbtft refreshes the panel in whole rows (deferred-io dirty range is a
+# y-range), so by default spans are written full-width: same SPI cost as a
+# clipped rectangle, one contiguous copy per span. full_rows=False clips each row
+# to the changed tile columns instead.
+#
+# Frames and patches come in rgb565.DEFAULT_ORDER (what cards/base writes to
+# .raw and what sprites are packed in); on a panel reporting the other order
+# each written span is converted on the way out (rgb565.swap_rb).
+
+import os
+import time
+from collections import namedtuple
+import numpy as np
+import framebuffer
+import rgb565
+
+BYTES_PER_PIXEL = 2
+TILE = (32, 16)   # (w, h) in pixels
+
+FrameStats = namedtuple("FrameStats", "bytes_written spans tiles_changed tiles_total ms")
+
+def _runs(flags):
+    """[(start, stop)] for each run of True in a 1-D bool array."""
+    idx = np.flatnonzero(flags)
+    if idx.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(idx) > 1)
+    starts = np.concatenate(([idx[0]], idx[breaks + 1]))
+    stops = np.concatenate((idx[breaks], [idx[-1]])) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+class FramebufferWriter:
+    def __init__(self, fb=framebuffer.DEFAULT_DEVICE, tile=TILE, full_rows=True):
+        """fb: a framebuffer.Framebuffer, or a device/file path to open one."""
+        self._owns_fb = isinstance(fb, (str, os.PathLike))
+        self.fb = framebuffer.open_framebuffer(os.fspath(fb)) if self._owns_fb else fb
+        self.width, self.height = self.fb.width, self.fb.height
+        self.tile_w, self.tile_h = tile
+        self.full_rows = full_rows
+        self.swap = self.fb.order != rgb565.DEFAULT_ORDER
+        self._row_starts = np.arange(0, self.height, self.tile_h)
+        self._col_starts = np.arange(0, self.width, self.tile_w)
+        self._last = None     # HxW uint16, what the panel currently shows
+        self.frames = 0
+        self.bytes_total = 0
+        self.bytes_saved = 0
+
+    def close(self):
+        if self._owns_fb and self.fb is not None:
+            self.fb.close()
+        self.fb = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def invalidate(self):
+        """Forget the last frame; the next write() goes out in full."""
+        self._last = None
+
+    def _as_frame(self, frame):
+        if isinstance(frame, np.ndarray):
+            a = frame
+        else:
+            a = np.frombuffer(frame, dtype="<u2")
+        if a.size != self.width * self.height:
+            raise ValueError(f"Frame has {a.size} pixels, expected {self.width * self.height}")
+        return a.reshape(self.height, self.width)
+
+    def dirty_spans(self, new):
+        """([(y0, y1, x0, x1)], tiles_changed): pixel rectangles covering
+        every changed tile, one per run of changed tile rows."""
+        tiles_total = len(self._row_starts) * len(self._col_starts)
+        if self._last is None:
+            return [(0, self.height, 0, self.width)], tiles_total
+        diff = self._last != new
+        tiles = np.logical_or.reduceat(diff, self._row_starts, axis=0)
+        tiles = np.logical_or.reduceat(tiles, self._col_starts, axis=1)
+        spans = []
+        for r0, r1 in _runs(tiles.any(axis=1)):
+            cols = _runs(tiles[r0:r1].any(axis=0))
+            c0, c1 = cols[0][0], cols[-1][1]
+            spans.append((r0 * self.tile_h, min(self.height, r1 * self.tile_h),
+                          c0 * self.tile_w, min(self.width, c1 * self.tile_w)))
+        return spans, int(tiles.sum())
+
+    def write(self, frame):
+        """Push a full RGB565 frame (bytes or HxW uint16); only changed spans hit the device."""
+        t0 = time.perf_counter()
+        new = self._as_frame(frame)
+        spans, tiles_changed = self.dirty_spans(new)
+        dst = self.fb.array
+        written = 0
+        for y0, y1, x0, x1 in spans:
+            if self.full_rows:
+                x0, x1 = 0, self.width
+            if self.swap:
+                rgb565.swap_rb(new[y0:y1, x0:x1], out=dst[y0:y1, x0:x1])
+            else:
+                dst[y0:y1, x0:x1] = new[y0:y1, x0:x1]
+            written += (y1 - y0) * (x1 - x0) * BYTES_PER_PIXEL
+        if self._last is None:
+            self._last = new.copy()
+        else:
+            np.copyto(self._last, new)
+        self.frames += 1
+        self.bytes_total += written
+        self.bytes_saved += self.height * self.width * BYTES_PER_PIXEL - written
+        return FrameStats(written, len(spans), tiles_changed,
+                          len(self._row_starts) * len(self._col_starts),
+                          round((time.perf_counter() - t0) * 1000, 2))
+
+    def patch(self, x, y, block):
+        """Write a small HxW block at (x, y), e.g. a re-blended sprite, and keep
+        the last-frame copy in sync so the next diff stays correct."""
+        h, w = block.shape
+        if self.swap:
+            rgb565.swap_rb(block, out=self.fb.array[y:y + h, x:x + w])
+        else:
+            self.fb.array[y:y + h, x:x + w] = block
+        if self._last is not None:
+            self._last[y:y + h, x:x + w] = block
+        written = h * w * BYTES_PER_PIXEL
+        self.bytes_total += written
+        return written
+
+    def read(self):
+        """What the panel shows (HxW uint16), in DEFAULT_ORDER like the frames
+        written to it."""
+        frame = self.fb.read()
+        return rgb565.swap_rb(frame, out=frame) if self.swap else frame
@@ -1,22 +1,39 @@
 #!/usr/bin/env python3
 
 # fetch_btc.py
-import os, json, time, requests
+import os, json, time
 from datetime import datetime
+import http_client
 
 STATE_DIR = os.path.expanduser("~/pidisplay/state")
-os.makedirs(STATE_DIR, exist_ok=True)
 OUT = os.path.join(STATE_DIR, "btc.json")
 TMP = OUT + ".tmp"
 
-def fetch_coinbase_btc():
+SPOT_URL = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
+HIST_URL = "https://api.coinbase.com/v2/prices/BTC-USD/historic?period=day"
+
+def _save(obj):
+    os.makedirs(os.path.dirname(OUT), exist_ok=True)
+    with open(TMP, "w") as f:
+        json.dump(obj, f)
+    os.replace(TMP, OUT)
+
+async def fetch(http):
+    """One BTC update over a shared http_client.ConnectionPool."""
     try:
+        spot_r = (await http.get(SPOT_URL, timeout=5)).raise_for_status()
+        hist_r = (await http.get(HIST_URL, timeout=5)).raise_for_status()
+        if spot_r.unchanged and hist_r.unchanged and os.path.exists(OUT):
+            http.parse_avoided(2)
+            print("BTC unchanged (http cache)")
+            return
+
         # Coinbase spot price
-        spot = requests.get("https://api.coinbase.com/v2/prices/BTC-USD/spot", timeout=5).json()
+        spot = spot_r.json()
         price = float(spot["data"]["amount"])
 
         # Historical (yesterday) price for 24h change calc
-        hist = requests.get("https://api.coinbase.com/v2/prices/BTC-USD/historic?period=day", timeout=5).json()
+        hist = hist_r.json()
         data = hist["data"]["prices"]
         if len(data) >= 2:
             old_price = float(data[-1]["price"])
@@ -32,17 +49,20 @@ def fetch_coinbase_btc():
             "src": "coinbase"
         }
 
-        with open(TMP, "w") as f:
-            json.dump(result, f)
-        os.replace(TMP, OUT)
+        _save(result)
         print("✅ BTC data updated:", result)
     except Exception as e:
-        print("❌ BTC fetch failed:", e)
         # Keep last known file if available
         if not os.path.exists(OUT):
-            with open(TMP, "w") as f:
-                json.dump({"error": str(e), "ts": datetime.utcnow().isoformat()+"Z"}, f)
-            os.replace(TMP, OUT)
+            _save({"error": str(e), "ts": datetime.utcnow().isoformat()+"Z"})
+        raise
+
+def fetch_coinbase_btc():
+    """One-shot entry point (timer/service); the daemon calls fetch() directly."""
+    try:
+        http_client.run_once(fetch, "btc")
+    except Exception as e:
+        print("❌ BTC fetch failed:", e)
 
 if __name__ == "__main__":
     fetch_coinbase_btc()
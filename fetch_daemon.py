@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# fetch_daemon.py - One long-running process for every fetcher
+#
+# Replaces the per-source oneshot timers (btc-update, weather_fetch,
+# geo_fetch, news-fox, news-breitbart). Each source's fetch(http) coroutine
+# runs on one shared keep-alive http_client.ConnectionPool, which also caps
+# requests in flight. Sources that come due within fetch.coalesce_s of each
+# other run in the same wakeup, so the Wi-Fi radio powers up once instead of
+# several times. After each batch the affected cards are re-rendered through
+# render_server (in-process if it isn't running).
+#
+# The fetch_*.py main() functions still work as one-shots for manual runs.
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import time
+import asyncio
+import logging
+import importlib
+from collections import namedtuple
+
+import config
+import metrics
+import http_client
+import http_cache
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+
+Source = namedtuple("Source", "module cards interval after")
+
+# name -> where its fetch(http) lives, which cards it feeds, default interval (s),
+# and sources that must finish first when both are in the same batch
+SOURCES = {
+    "geo":       Source("fetch_geo", ("weather",), 6 * 3600, ()),
+    "weather":   Source("fetch_weather", ("weather",), 600, ("geo",)),
+    "btc":       Source("fetch_btc", ("btc",), 30, ()),
+    "fox":       Source("fetch_news.fetch_fox", ("news",), 180, ()),
+    "breitbart": Source("fetch_news.fetch_breitbart", ("news",), 180, ()),
+}
+DEFAULT_COALESCE = 20.0   # seconds
+CONFIG_POLL = 30.0        # longest sleep, so config edits are picked up
+
+def load_fetch(name):
+    """The source's fetch coroutine function (imported on first use)."""
+    return importlib.import_module(SOURCES[name].module).fetch
+
+def intervals_from(cfg):
+    """{source: seconds} from fetch.intervals; 0 / false disables a source."""
+    conf = (cfg.get("fetch") or {}).get("intervals") or {}
+    out = {}
+    for name, src in SOURCES.items():
+        iv = conf.get(name, src.interval)
+        if iv:
+            out[name] = float(iv)
+    return out
+
+class Scheduler:
+    """Next-due times per source, with a coalescing window."""
+
+    def __init__(self, intervals, coalesce=DEFAULT_COALESCE, now=0.0):
+        self.intervals = {}
+        self.next_due = {}
+        self.coalesce = coalesce
+        self.set_intervals(intervals, now)
+
+    def set_intervals(self, intervals, now):
+        for name in list(self.next_due):
+            if name not in intervals:
+                del self.next_due[name]
+        for name, iv in intervals.items():
+            if name not in self.next_due:
+                self.next_due[name] = now          # new source: run at once
+            elif iv != self.intervals.get(name):
+                self.next_due[name] = min(self.next_due[name], now + iv)
+        self.intervals = dict(intervals)
+
+    def next_wake(self):
+        return min(self.next_due.values()) if self.next_due else None
+
+    def due(self, now):
+        """Sources due now; if any are, also those due within the window."""
+        if not any(t <= now for t in self.next_due.values()):
+            return []
+        return sorted(n for n, t in self.next_due.items() if t <= now + self.coalesce)
+
+    def done(self, name, now):
+        if name in self.intervals:
+            self.next_due[name] = now + self.intervals[name]
+
+def stages(batch):
+    """Split a batch so sources run after their `after` dependencies."""
+    first = [n for n in batch if not set(SOURCES[n].after) & set(batch)]
+    rest = [n for n in batch if n not in first]
+    return [s for s in (first, rest) if s]
+
+async def run_source(http, name, fetch):
+    t0 = time.perf_counter()
+    try:
+        await fetch(http)
+        ok = True
+    except Exception as e:
+        logging.exception(f"{name}: fetch failed: {e}")
+        ok = False
+    ms = (time.perf_counter() - t0) * 1000
+    metrics.observe(f"fetch.{name}", ms)
+    return name, ok, ms
+
+async def run_batch(http, batch, fetchers=None, cache=None):
+    """Run one batch on the shared pool (through the HTTP cache when given,
+    one counter set per source); returns [(name, ok, ms)]."""
+    results = []
+    for stage in stages(batch):
+        fns = {n: (fetchers or {}).get(n) or load_fetch(n) for n in stage}
+        results += await asyncio.gather(*(run_source(cache.client(http, n) if cache else http, n, fn)
+                                          for n, fn in fns.items()))
+    return results
+
+def request_render(cards):
+    """Refresh the cards a batch fed; the render server skips unchanged ones.
+    Renders in-process only when no server is running."""
+    import render_server
+    try:
+        reply = render_server.refresh_remote(cards)
+        results = reply.get("results") or {}
+    except (FileNotFoundError, ConnectionRefusedError):
+        results = render_server.render_local(cards)   # no server running
+    except (OSError, ValueError) as e:
+        # Timed out or garbled: the server may still be writing these cards
+        logging.warning(f"render refresh of {', '.join(cards)} failed: {e!r}")
+        return
+    logging.info("rendered " + ", ".join(f"{n} {'skipped' if r.get('skipped') else str(r['ms']) + 'ms'}"
+                                         f"{'' if r['ok'] else ' FAILED'}" for n, r in results.items()))
+
+async def run(snapshot=config.snapshot, fetchers=None, render=request_render,
+              clock=time.monotonic, max_batches=None, pool=None, cache=None):
+    """Scheduler loop. fetchers/render/clock/max_batches/pool/cache are for tests."""
+    cfg = snapshot()
+    fcfg = cfg.get("fetch") or {}
+    sched = Scheduler(intervals_from(cfg), float(fcfg.get("coalesce_s", DEFAULT_COALESCE)), clock())
+    http = pool or http_client.ConnectionPool(int(fcfg.get("concurrency", http_client.DEFAULT_LIMIT)))
+    cache = cache or http_cache.HTTPCache()
+    batches = 0
+    try:
+        while max_batches is None or batches < max_batches:
+            cfg = snapshot()
+            fcfg = cfg.get("fetch") or {}
+            sched.coalesce = float(fcfg.get("coalesce_s", DEFAULT_COALESCE))
+            sched.set_intervals(intervals_from(cfg), clock())
+            wake = sched.next_wake()
+            delay = CONFIG_POLL if wake is None else wake - clock()
+            if delay > 0:
+                await asyncio.sleep(min(delay, CONFIG_POLL))
+                continue
+            batch = sched.due(clock())
+            results = await run_batch(http, batch, fetchers, cache)
+            for name, _, _ in results:
+                sched.done(name, clock())
+            batches += 1
+            logging.info("batch: " + ", ".join(f"{n} {'ok' if ok else 'FAILED'} {ms:.0f}ms" for n, ok, ms in results)
+                         + f" | pool {http.stats()}")
+            for n, _, _ in results:
+                st = cache.stats.get(n) or {}
+                logging.info(f"cache {n}: {st.get('not_modified', 0)} x 304, {st.get('fresh', 0)} fresh, "
+                             f"{st.get('bytes_saved', 0)} bytes saved, {st.get('parses_avoided', 0)} parses avoided")
+            try:
+                cache.save_stats()
+            except OSError as e:
+                logging.warning(f"http cache stats: {e}")
+            cards = sorted({c for n, ok, _ in results if ok for c in SOURCES[n].cards})
+            if cards and render and fcfg.get("render", True):
+                await asyncio.to_thread(render, cards)
+            metrics.configure(cfg)
+            metrics.maybe_export()
+    finally:
+        if pool is None:
+            await http.close()
+
+def main():
+    metrics.process = "fetch_daemon"
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        logging.info("Stopped by user")
+
+if __name__ == "__main__":
+    main()
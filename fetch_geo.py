@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 
 # fetch_geo.py
-import os, json, time, requests, subprocess
+import os, json, time, asyncio, subprocess
 from datetime import datetime
+import http_client
 
 STATE_DIR = os.path.expanduser("~/pidisplay/state")
-os.makedirs(STATE_DIR, exist_ok=True)
 OUT = os.path.join(STATE_DIR, "geo.json")
 TMP = OUT + ".tmp"
 
@@ -16,10 +16,16 @@ def set_timezone(tz):
     except Exception as e:
         print("WARN: failed to set timezone/ntp:", e)
 
-def main():
+async def fetch(http):
+    """One geo update over a shared http_client.ConnectionPool."""
+    os.makedirs(STATE_DIR, exist_ok=True)
     try:
-        r = requests.get("http://ip-api.com/json", timeout=6)
+        r = await http.get("http://ip-api.com/json", timeout=6)
         r.raise_for_status()
+        if r.unchanged and os.path.exists(OUT):
+            http.parse_avoided()   # same answer as last time: skip timedatectl too
+            print("geo unchanged (http cache)")
+            return
         j = r.json()
         data = {
             "lat": j.get("lat"),
@@ -32,19 +38,26 @@ def main():
             "src": "ip-api.com"
         }
         if data["tz"]:
-            set_timezone(data["tz"])
+            await asyncio.to_thread(set_timezone, data["tz"])
 
         with open(TMP, "w") as f:
             json.dump(data, f)
         os.replace(TMP, OUT)
         print("✅ geo updated:", data)
     except Exception as e:
-        print("❌ geo fetch failed:", e)
         # if we have no geo at all, write a minimal file
         if not os.path.exists(OUT):
             with open(TMP, "w") as f:
                 json.dump({"error": str(e), "ts": datetime.utcnow().isoformat()+"Z"}, f)
             os.replace(TMP, OUT)
+        raise
+
+def main():
+    """One-shot entry point (timer/service); the daemon calls fetch() directly."""
+    try:
+        http_client.run_once(fetch, "geo")
+    except Exception as e:
+        print("❌ geo fetch failed:", e)
 
 if __name__ == "__main__":
     main()
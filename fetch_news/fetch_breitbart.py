@@ -1,20 +1,19 @@
 #!/usr/bin/env python3
-import os, json, re, hashlib, feedparser
-import requests
+import os, sys, re, hashlib, asyncio
+import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import http_client
+import news_store
+import rss_stream
 
-STATE = os.path.expanduser("~/pidisplay/state/news.json")
-TMP   = STATE + ".tmp"
 SRC   = "breitbart"
+STOP_AFTER_SEEN = 3   # see fetch_fox
 # Breitbart’s feed is commonly mirrored via FeedBurner; keep as provisional.
 FEEDS = [
     "https://feeds.feedburner.com/breitbart"
 ]
 
-def load():
-    try: return json.load(open(STATE))
-    except: return {"updated": None, "items": []}
-
 def norm_title(t):
     return re.sub(r"[^a-z0-9 ]+", " ", (t or "").lower()).split()
 
@@ -22,28 +21,52 @@ def mk_id(source, title):
     base = source + "|" + " ".join(norm_title(title))
     return hashlib.sha1(base.encode()).hexdigest()[:16]
 
-def older_than_24h(ts):
-    t = datetime.fromisoformat(ts.replace("Z","+00:00"))
-    return (datetime.now(timezone.utc) - t).total_seconds() > 24*3600
+def parse(content, known):
+    """Up to 25 entries, newest first, streamed until STOP_AFTER_SEEN stored
+    ids in a row. Malformed XML falls back to a full feedparser parse."""
+    try:
+        return list(rss_stream.entries(content, seen=lambda e: mk_id(SRC, e.title) in known,
+                                       stop_after=STOP_AFTER_SEEN, limit=25))
+    except ET.ParseError:
+        import feedparser
+        return (feedparser.parse(content).entries or [])[:25]
 
-def main():
-    j = load()
-    items = j["items"]
-    seen = {it["id"] for it in items}
+def known_ids():
+    with news_store.NewsStore() as store:
+        return store.ids(SRC)
+
+def store_batch(batch):
+    """Insert, cluster and prune in one store session: (added, pruned, total)."""
+    with news_store.NewsStore() as store:
+        return store.add(batch), store.prune(), store.count(SRC)
 
+async def fetch(http):
+    """One poll over a shared http_client.ConnectionPool (same flow as
+    fetch_fox.fetch: parse first, then one batch insert into news_store)."""
+    known = await asyncio.to_thread(known_ids)   # SQLite work stays off the event loop
+    feeds = []
     for url in FEEDS:
         try:
             # Fetch with timeout to prevent hangs
-            response = requests.get(url, headers={"User-Agent": "pidisplay/1.0 (+https://github.com/yourrepo)", "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"}, timeout=30)
+            response = await http.get(url, headers={"Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"}, timeout=30)
             response.raise_for_status()
+            if response.unchanged:
+                http.parse_avoided()   # 304 / still fresh: entries already merged
+                continue
             feed_content = response.content
-            feed = feedparser.parse(feed_content)
+            feeds.append(await asyncio.to_thread(parse, feed_content, known))
         except Exception as e:
             print(f"Error fetching/parsing {url}: {str(e)}")
             continue  # Skip to next feed on error
 
+    if not feeds:
+        print(f"news[{SRC}] unchanged")
+        return
+
+    batch, seen = [], set()
+    for feed in feeds:
         # If the feed is down/empty, skip quietly.
-        for e in (feed.entries or [])[:25]:
+        for e in feed:
             title = (getattr(e, "title", "") or "").strip()
             if not title: continue
             link  = getattr(e, "link", None)
@@ -53,18 +76,15 @@ def main():
             if re.search(r"\b(breaking|urgent|developing)\b", title, re.I):
                 tags.append("breaking")
             now = datetime.now(timezone.utc).isoformat().replace("+00:00","Z")
-            items.append({"id":_id, "source":SRC, "title":title, "url":link, "ts":now, "tags":tags})
+            batch.append({"id":_id, "source":SRC, "title":title, "url":link, "ts":now, "tags":tags})
             seen.add(_id)
 
-    items = [it for it in items if not older_than_24h(it["ts"])]
-    items.sort(key=lambda it: it["ts"], reverse=True)
-    items = items[:200]
+    added, pruned, total = await asyncio.to_thread(store_batch, batch)
+    print(f"news[{SRC}] ok new={added} pruned={pruned} total={total}")
 
-    j["items"] = items
-    j["updated"] = datetime.now(timezone.utc).isoformat().replace("+00:00","Z")
-    with open(TMP, "w") as f: json.dump(j, f)
-    os.replace(TMP, STATE)
-    print(f"news[{SRC}] ok total={len(items)}")
+def main():
+    """One-shot entry point (timer/service); the daemon calls fetch() directly."""
+    http_client.run_once(fetch, SRC)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 # fetch_weather.py
-import os, json, requests
+import os, json
 from datetime import datetime, timezone, timedelta
+import http_client
 
 STATE = os.path.expanduser("~/pidisplay/state")
-os.makedirs(STATE, exist_ok=True)
 GEO = os.path.join(STATE, "geo.json")
 OUT = os.path.join(STATE, "weather.json")
 TMP = OUT + ".tmp"
@@ -37,7 +37,9 @@ _PHASE_FRACTION = {
     "Waning Crescent": 0.875,
 }
 
-def main():
+async def fetch(http):
+    """One weather update over a shared http_client.ConnectionPool."""
+    os.makedirs(STATE, exist_ok=True)
     geo = load(GEO) or {}
     lat = geo.get("lat")
     lon = geo.get("lon")
@@ -102,7 +104,7 @@ def main():
                     "q": f"{lat},{lon}",
                     "dt": today_str,
                 }
-                ra = requests.get("https://api.weatherapi.com/v1/astronomy.json", params=params_astro, timeout=6)
+                ra = await http.get("https://api.weatherapi.com/v1/astronomy.json", params=params_astro, timeout=6)
                 ra.raise_for_status()
                 j_astro = ra.json()
                 moon_phase_name = j_astro.get("astronomy", {}).get("astro", {}).get("moon_phase")
@@ -131,7 +133,8 @@ def main():
 
     try:
         # Forecast request (authoritative for sunrise/sunset and hourly)
-        rf = requests.get("https://api.open-meteo.com/v1/forecast", params=params_forecast, timeout=6)
+        # An unchanged (cached) forecast is still rebuilt: "updated" drives the card's STALE footer
+        rf = await http.get("https://api.open-meteo.com/v1/forecast", params=params_forecast, timeout=6)
         rf.raise_for_status()
         j_forecast = rf.json()
 
@@ -185,9 +188,16 @@ def main():
         print("✅ weather updated for", tz, "@", lat, lon)
 
     except Exception as e:
-        print("❌ weather fetch failed:", e)
         if not os.path.exists(OUT):
             save_atomic({"error": str(e), "updated": datetime.utcnow().isoformat()+"Z"}, OUT)
+        raise
+
+def main():
+    """One-shot entry point (timer/service); the daemon calls fetch() directly."""
+    try:
+        http_client.run_once(fetch, "weather")
+    except Exception as e:
+        print("❌ weather fetch failed:", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+# frame_cache.py - Composited RGB565 frames kept in memory by the slideshow
+#
+# Each card's frames (normal + pressed menu variants) are keyed by the
+# source file's (inode, mtime, size). The renderers replace files with
+# os.replace(), so a new inode means a new render; anything else is a hit
+# and showing the card is just a memory -> framebuffer copy.
+
+import os
+import threading
+
+def source_key(path):
+    """(inode, mtime_ns, size) of path, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+class FrameCache:
+    def __init__(self):
+        self._cards = {}     # card -> (source key, {variant: frame})
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, card, variant, source_path, build):
+        """(frame, hit) for (card, variant). build(source_path) runs on a miss
+        or when the source file changed since it was cached."""
+        key = source_key(source_path)
+        with self._lock:
+            entry = self._cards.get(card)
+            if entry is not None and entry[0] == key and variant in entry[1]:
+                self.hits += 1
+                return entry[1][variant], True
+        frame = build(source_path)
+        with self._lock:
+            entry = self._cards.get(card)
+            if entry is None or entry[0] != key:
+                entry = (key, {})       # renderer replaced the file: drop stale variants
+                self._cards[card] = entry
+            entry[1][variant] = frame
+            self.misses += 1
+        return frame, False
+
+    def peek(self, card, variant="normal"):
+        """Last cached frame for a card, valid or not (None if never built)."""
+        entry = self._cards.get(card)
+        return entry[1].get(variant) if entry else None
+
+    def invalidate(self, card=None):
+        with self._lock:
+            if card is None:
+                self._cards.clear()
+            else:
+                self._cards.pop(card, None)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,153 @@
+# framebuffer.py - /dev/fbN as an mmap'd NumPy array, geometry from sysfs
+#
+# Visible width/height and pixel order come from FBIOGET_VSCREENINFO (sysfs
+# virtual_size is the whole panning area, bigger than the screen when the
+# driver double-buffers); stride and bits-per-pixel from /sys/class/graphics/fbN.
+# The device is opened and mapped once.
+# FakeFramebuffer backs the same API with a regular file so the slideshow
+# (and tests) can run headless: set PIDISPLAY_FB=/tmp/fb1.raw.
+
+import os
+import mmap
+import stat
+import fcntl
+import struct
+import logging
+from collections import namedtuple
+import numpy as np
+import rgb565
+
+DEFAULT_DEVICE = os.environ.get("PIDISPLAY_FB", "/dev/fb1")
+SYSFS_ROOT = "/sys/class/graphics"
+FBIOGET_VSCREENINFO = 0x4600
+
+# Fallback when a plain file stands in for the device
+FAKE_W, FAKE_H = 480, 320
+
+Geometry = namedtuple("Geometry", "width height stride bpp order")
+
+def _read_sysfs(root, name, attr):
+    with open(os.path.join(root, name, attr)) as f:
+        return f.read().strip()
+
+def screen_info(fd):
+    """Leading fields of struct fb_var_screeninfo (xres, yres, xres_virtual,
+    ..., red/green/blue bitfields), or None if the ioctl fails."""
+    try:
+        buf = fcntl.ioctl(fd, FBIOGET_VSCREENINFO, bytes(160))
+    except OSError:
+        return None
+    return struct.unpack_from("20I", buf)
+
+def pixel_order(fd, info=None):
+    """'rgb' or 'bgr' from the red/blue bitfield offsets, or None if the ioctl fails."""
+    fields = info or screen_info(fd)
+    if fields is None:
+        return None
+    red_offset, blue_offset = fields[8], fields[14]
+    return "rgb" if red_offset > blue_offset else "bgr"
+
+def read_geometry(device=DEFAULT_DEVICE, sysfs_root=SYSFS_ROOT, fd=None):
+    """Geometry of /dev/fbN: visible size and order from the driver (fd),
+    stride and bpp from /sys/class/graphics/fbN. Without an fd the size
+    falls back to sysfs virtual_size."""
+    name = os.path.basename(device)
+    info = screen_info(fd) if fd is not None else None
+    if info is not None and info[0] and info[1]:
+        w, h = info[0], info[1]
+    else:
+        w, h = (int(v) for v in _read_sysfs(sysfs_root, name, "virtual_size").split(","))
+    bpp = int(_read_sysfs(sysfs_root, name, "bits_per_pixel"))
+    try:
+        stride = int(_read_sysfs(sysfs_root, name, "stride"))
+    except OSError:
+        stride = w * bpp // 8
+    order = (pixel_order(fd, info) if info is not None else None) or rgb565.DEFAULT_ORDER
+    return Geometry(w, h, stride, bpp, order)
+
+class Framebuffer:
+    """An mmap'd framebuffer. .array is an HxW uint16 view straight onto the
+    device memory: assigning into it is the write."""
+
+    def __init__(self, device=DEFAULT_DEVICE, geometry=None, sysfs_root=SYSFS_ROOT):
+        self.device = device
+        self._fd = os.open(device, os.O_RDWR)
+        try:
+            self.geometry = geometry or read_geometry(device, sysfs_root, self._fd)
+            if self.geometry.bpp != 16:
+                raise ValueError(f"{device}: {self.geometry.bpp} bpp not supported (RGB565 only)")
+            self.size = self.geometry.stride * self.geometry.height
+            self._mm = mmap.mmap(self._fd, self.size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        except Exception:
+            os.close(self._fd)
+            raise
+        g = self.geometry
+        rows = np.ndarray((g.height, g.stride // 2), dtype="<u2", buffer=self._mm)
+        self.array = rows[:, :g.width]
+        logging.info(f"Framebuffer {device}: {g.width}x{g.height} {g.bpp}bpp stride={g.stride} {g.order}565")
+
+    width = property(lambda self: self.geometry.width)
+    height = property(lambda self: self.geometry.height)
+    order = property(lambda self: self.geometry.order)
+    frame_bytes = property(lambda self: self.geometry.width * self.geometry.height * 2)
+
+    def encode(self, img):
+        """PIL image -> frame bytes in this device's pixel order."""
+        return rgb565.encode(img, order=self.order)
+
+    def write(self, frame):
+        """Copy a full packed frame (bytes or HxW uint16) onto the device."""
+        if isinstance(frame, np.ndarray):
+            src = frame
+        else:
+            src = np.frombuffer(frame, dtype="<u2")
+        if src.size != self.width * self.height:
+            raise ValueError(f"Frame has {src.size} pixels, expected {self.width * self.height}")
+        self.array[...] = src.reshape(self.height, self.width)
+
+    def show(self, img):
+        if img.size != (self.width, self.height):
+            img = img.resize((self.width, self.height))
+        self.write(self.encode(img))
+
+    def fill(self, r, g, b):
+        self.array[...] = rgb565.pack_pixel(r, g, b, self.order)
+
+    def read(self):
+        """Copy of what's currently on screen (HxW uint16)."""
+        return self.array.copy()
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if self._mm is not None:
+            self.array = None
+            self._mm.close()
+            self._mm = None
+            os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class FakeFramebuffer(Framebuffer):
+    """Regular file standing in for /dev/fbN (headless runs, tests)."""
+
+    def __init__(self, path, width=FAKE_W, height=FAKE_H, stride=None, order=rgb565.DEFAULT_ORDER):
+        stride = stride or width * 2
+        size = stride * height
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            with open(path, "wb") as f:
+                f.truncate(size)
+        super().__init__(path, Geometry(width, height, stride, 16, order))
+
+def open_framebuffer(device=DEFAULT_DEVICE):
+    """Framebuffer for a /dev/fbN character device, FakeFramebuffer for a plain file."""
+    try:
+        is_dev = stat.S_ISCHR(os.stat(device).st_mode)
+    except FileNotFoundError:
+        is_dev = device.startswith("/dev/")
+    return Framebuffer(device) if is_dev else FakeFramebuffer(device)
@@ -0,0 +1,164 @@
+# http_cache.py - On-disk HTTP cache with conditional GET for the fetchers
+#
+# Each cached URL is two files under state/http_cache/: <sha1>.body (the
+# decoded body) and <sha1>.json (ETag, Last-Modified, expiry, sizes).
+#
+#   fresh (Cache-Control max-age not yet expired) -> no request at all
+#   stale with a validator -> If-None-Match / If-Modified-Since; on 304 the
+#                             stored body is handed back
+#
+# Either way the Response comes back with .from_cache set ("fresh" / "304")
+# so a fetcher can tell the body is the one it already processed and skip
+# parsing it (http.parse_avoided() counts that). Per-source counters are
+# kept in state/http_cache/stats.json.
+
+import os
+import json
+import time
+import hashlib
+import logging
+from urllib.parse import urlencode
+
+from http_client import Response
+
+CACHE_DIR = os.path.expanduser("~/pidisplay/state/http_cache")
+STATS_FILE = "stats.json"
+
+COUNTERS = ("requests", "network", "not_modified", "fresh", "bytes_in", "bytes_saved", "parses_avoided")
+
+def _key(url):
+    return hashlib.sha1(url.encode()).hexdigest()
+
+def cache_control(headers):
+    """{directive: value or True} from a Cache-Control header."""
+    out = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            out[name.lower()] = value.strip('"') if value else True
+    return out
+
+def max_age(headers):
+    """Seconds the response may be reused without asking, or 0."""
+    cc = cache_control(headers)
+    if "no-store" in cc or "no-cache" in cc:
+        return 0
+    try:
+        age = int(headers.get("age", 0) or 0)
+        return max(int(cc.get("max-age", 0)) - age, 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+class HTTPCache:
+    def __init__(self, root=None, clock=time.time):
+        self.root = root or CACHE_DIR
+        self.clock = clock
+        self.stats = {}      # source -> {counter: n}
+        try:
+            with open(os.path.join(self.root, STATS_FILE)) as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def client(self, http, source):
+        """A pool view whose get() goes through this cache, counted under source."""
+        return CachedClient(http, self, source)
+
+    def count(self, source, **inc):
+        st = self.stats.setdefault(source, dict.fromkeys(COUNTERS, 0))
+        for k, v in inc.items():
+            st[k] = st.get(k, 0) + v
+
+    def save_stats(self):
+        os.makedirs(self.root, exist_ok=True)
+        _write_atomic(os.path.join(self.root, STATS_FILE), json.dumps(self.stats, indent=1, sort_keys=True).encode())
+
+    def load(self, url):
+        """(meta, body) for url, or None."""
+        base = os.path.join(self.root, _key(url))
+        try:
+            with open(base + ".json") as f:
+                meta = json.load(f)
+            with open(base + ".body", "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if len(body) != meta.get("size"):
+            return None
+        return meta, body
+
+    def store(self, url, resp, source, meta=None):
+        """Remember a 200 (or refresh the validators/expiry after a 304)."""
+        headers = resp.headers
+        if "no-store" in cache_control(headers):
+            return
+        meta = dict(meta or {})
+        meta.update({
+            "source": source,
+            "etag": headers.get("etag") or meta.get("etag"),
+            "last_modified": headers.get("last-modified") or meta.get("last_modified"),
+            "expires": self.clock() + max_age(headers),
+            "checked": self.clock(),
+        })
+        if resp.from_cache is None:
+            meta.update({"size": len(resp.content), "wire_bytes": resp.wire_bytes,
+                         "headers": {k: v for k, v in headers.items() if k in ("content-type", "cache-control")}})
+        if not (meta.get("etag") or meta.get("last_modified") or meta["expires"] > self.clock()):
+            return   # nothing to revalidate with and not cacheable: don't bother
+        base = os.path.join(self.root, _key(url))
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            if resp.from_cache is None:
+                _write_atomic(base + ".body", resp.content)
+            _write_atomic(base + ".json", json.dumps(meta).encode())
+        except OSError as e:
+            logging.warning(f"http cache: store failed for {source}: {e}")
+
+class CachedClient:
+    """Wraps a ConnectionPool (or anything with its get()) for one source."""
+
+    def __init__(self, http, cache, source):
+        self.http = http
+        self.cache = cache
+        self.source = source
+
+    def stats(self):
+        return self.http.stats()
+
+    def parse_avoided(self, n=1):
+        self.cache.count(self.source, parses_avoided=n)
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params)
+        cache, src = self.cache, self.source
+        cache.count(src, requests=1)
+        hit = cache.load(url)
+        if hit is not None:
+            meta, body = hit
+            if meta.get("expires", 0) > cache.clock():
+                cache.count(src, fresh=1, bytes_saved=meta.get("wire_bytes", len(body)))
+                return Response(url, 200, "OK (fresh)", dict(meta.get("headers") or {}), body, 0, "fresh")
+            headers = dict(headers or {})
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        resp = await self.http.get(url, headers=headers, timeout=timeout)
+        cache.count(src, network=1, bytes_in=resp.wire_bytes)
+        if resp.status == 304 and hit is not None:
+            meta, body = hit
+            cache.count(src, not_modified=1, bytes_saved=max(meta.get("wire_bytes", len(body)) - resp.wire_bytes, 0))
+            merged = dict(meta.get("headers") or {}, **resp.headers)
+            resp = Response(url, 200, "OK (not modified)", merged, body, resp.wire_bytes, "304")
+            cache.store(url, resp, src, meta)
+            return resp
+        if resp.status == 200:
+            cache.store(url, resp, src)
+        return resp
@@ -0,0 +1,254 @@
+# http_client.py - Small asyncio HTTP/1.1 client with a keep-alive connection pool
+#
+# Used by fetch_daemon.py and the fetch_* one-shots. One pool per process:
+# connections to the same (scheme, host, port) are kept open between
+# requests, so a 30 s BTC poll reuses its TLS session instead of doing a
+# fresh handshake each time, and a semaphore caps how many requests are in
+# flight at once across all sources.
+#
+# Deliberately small: GET only, gzip, Content-Length / chunked / read-to-close
+# bodies, redirects (up to MAX_REDIRECTS hops), one retry when a reused idle
+# connection turns out to be dead.
+
+import ssl
+import json
+import gzip
+import time
+import asyncio
+from urllib.parse import urljoin, urlsplit, urlencode
+
+USER_AGENT = "pidisplay/1.0 (+https://github.com/yourrepo)"
+DEFAULT_TIMEOUT = 10.0   # seconds per request, connect included
+DEFAULT_LIMIT = 3        # requests in flight across the whole pool
+IDLE_TTL = 60.0          # drop idle connections older than this
+MAX_REDIRECTS = 5
+REDIRECTS = (301, 302, 303, 307, 308)
+
+class HTTPError(Exception):
+    def __init__(self, status, reason, url):
+        super().__init__(f"{status} {reason} for {url}")
+        self.status = status
+
+class Response:
+    __slots__ = ("url", "status", "reason", "headers", "content", "wire_bytes", "from_cache")
+
+    def __init__(self, url, status, reason, headers, content, wire_bytes, from_cache=None):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers      # lower-case names
+        self.content = content      # decoded body bytes
+        self.wire_bytes = wire_bytes
+        self.from_cache = from_cache  # None, "fresh" or "304" (see http_cache.py)
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 400
+
+    @property
+    def unchanged(self):
+        """Body is the cached one this source already processed."""
+        return self.from_cache is not None
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        """Raises on errors and on a redirect that wasn't followed (no Location,
+        or more than MAX_REDIRECTS hops). 304 is an answer to a conditional GET."""
+        if self.status >= 400 or (300 <= self.status < 400 and self.status != 304):
+            raise HTTPError(self.status, self.reason, self.url)
+        return self
+
+class _Conn:
+    __slots__ = ("reader", "writer", "idle_since")
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        self.idle_since = time.monotonic()
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    def __init__(self, limit=DEFAULT_LIMIT, timeout=DEFAULT_TIMEOUT, ssl_context=None):
+        self.timeout = timeout
+        self._sem = asyncio.Semaphore(limit)
+        self._idle = {}     # (scheme, host, port) -> [_Conn]
+        self._ssl = ssl_context
+        self.requests = 0
+        self.connections_opened = 0
+        self.reused = 0
+        self.redirects = 0
+        self.bytes_in = 0
+        self.parses_avoided = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for conns in self._idle.values():
+            for c in conns:
+                c.close()
+        self._idle.clear()
+
+    def stats(self):
+        return {"requests": self.requests, "connections_opened": self.connections_opened,
+                "reused": self.reused, "redirects": self.redirects, "bytes_in": self.bytes_in}
+
+    def parse_avoided(self, n=1):
+        """Fetchers call this when they skip an unchanged body (counted per source by http_cache)."""
+        self.parses_avoided += n
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        """GET url (params are urlencoded onto it). Returns a Response for any
+        status; call .raise_for_status() like requests. Redirects are followed
+        (relative Locations resolved against the request URL) and the timeout
+        covers every hop."""
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params)
+        async with self._sem:
+            return await asyncio.wait_for(self._follow(url, headers or {}), timeout or self.timeout)
+
+    async def _follow(self, url, headers):
+        for hop in range(MAX_REDIRECTS + 1):
+            resp = await self._get(url, headers)
+            location = resp.headers.get("location")
+            if resp.status not in REDIRECTS or not location or hop == MAX_REDIRECTS:
+                return resp   # a 3xx left over here is reported by raise_for_status
+            url = urljoin(url, location)
+            self.redirects += 1
+
+    async def _get(self, url, headers):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{port}"
+        fields = {"host": ("Host", host), "user-agent": ("User-Agent", USER_AGENT),
+                  "accept-encoding": ("Accept-Encoding", "gzip"), "connection": ("Connection", "keep-alive")}
+        for k, v in headers.items():
+            fields[k.lower()] = (k, v)   # caller headers replace the defaults, whatever their case
+        lines = [f"GET {path} HTTP/1.1"] + [f"{k}: {v}" for k, v in fields.values()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        for attempt in (0, 1):
+            conn = self._checkout(key) if attempt == 0 else None
+            reused = conn is not None
+            if conn is None:
+                conn = await self._open(key)
+            try:
+                conn.writer.write(request)
+                await conn.writer.drain()
+                resp, keep = await self._read_response(conn, url)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError, EOFError):
+                conn.close()
+                if not reused:
+                    raise
+                # server dropped the idle connection: retry once on a fresh one
+            except BaseException:
+                conn.close()
+                raise
+        self.requests += 1
+        self.reused += reused
+        self.bytes_in += resp.wire_bytes
+        if keep:
+            conn.idle_since = time.monotonic()
+            self._idle.setdefault(key, []).append(conn)
+        else:
+            conn.close()
+        return resp
+
+    def _checkout(self, key):
+        conns = self._idle.get(key)
+        now = time.monotonic()
+        while conns:
+            c = conns.pop()
+            if now - c.idle_since < IDLE_TTL and not c.reader.at_eof():
+                return c
+            c.close()
+        return None
+
+    async def _open(self, key):
+        scheme, host, port = key
+        ctx = None
+        if scheme == "https":
+            ctx = self._ssl or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=ctx,
+                                                       server_hostname=host if ctx else None)
+        self.connections_opened += 1
+        return _Conn(reader, writer)
+
+    async def _read_response(self, conn, url):
+        r = conn.reader
+        while True:
+            status_line = await r.readline()
+            if not status_line:
+                raise EOFError("connection closed before response")
+            version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+            status = int(status)
+            headers, wire = {}, len(status_line)
+            while True:
+                line = await r.readline()
+                wire += len(line)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = line.decode("latin-1").partition(":")
+                headers[k.strip().lower()] = v.strip()
+            if status >= 200 or status == 101:
+                break   # skip 1xx interim responses
+
+        keep = "close" not in headers.get("connection", "").lower() and version != "HTTP/1.0"
+        if status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = await r.readline()
+                wire += len(size_line)
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await r.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await r.readexactly(size))
+                await r.readexactly(2)
+                wire += size + 2
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await r.readexactly(int(headers["content-length"]))
+            wire += len(body)
+        else:
+            body = await r.read()
+            wire += len(body)
+            keep = False
+        if headers.get("content-encoding", "").lower() == "gzip" and body:
+            body = gzip.decompress(body)
+        return Response(url, status, reason, headers, body, wire), keep
+
+def run_once(fetch, source=None, limit=DEFAULT_LIMIT):
+    """Run `async fetch(http)` on a fresh pool (the fetch_* one-shot mains).
+    With a source name, requests go through the on-disk http_cache."""
+    async def _main():
+        async with ConnectionPool(limit) as pool:
+            if source is None:
+                return await fetch(pool)
+            import http_cache
+            cache = http_cache.HTTPCache()
+            try:
+                return await fetch(cache.client(pool, source))
+            finally:
+                cache.save_stats()
+    return asyncio.run(_main())
@@ -1,26 +1,51 @@
-# input_handler.py - Threaded touchscreen event polling and gesture detection
+# input_handler.py - Touchscreen reader: evdev decoding, contact tracking, gestures
+#
+# Three layers, each usable on its own (tests replay recorded byte streams
+# through all of them, see tests/test_input_handler.py):
+#   EventDecoder    bytes from /dev/input/eventN -> (sec, usec, type, code, value),
+#                   batch-decoded with struct.iter_unpack; the event size follows
+#                   the platform's struct timeval (16 bytes on 32-bit, 24 on 64-bit)
+#   TouchTracker    evdev events -> one frame of contacts per SYN_REPORT.
+#                   Multi-touch protocol B (ABS_MT_SLOT / TRACKING_ID / POSITION)
+#                   or, for single-touch panels like the ADS7846, BTN_TOUCH + ABS_X/Y
+#   GestureMachine  contact frames -> Gesture: tap, long_press, swipe_<dir>,
+#                   two_finger_tap, two_finger_swipe_<dir>, pinch_in / pinch_out
+#
+# Record a stream on the Pi and replay it anywhere:
+#   python input_handler.py --record /tmp/touch.bin
+#   python input_handler.py --replay /tmp/touch.bin
 
 import os
-import struct
+import math
 import time
-import logging
 import queue
-import threading
+import struct
 import select
+import logging
+import argparse
+import threading
 
 EVENT_DEVICE = "/dev/input/event0"
-EVENT_SIZE = 16  # 32-bit
-EVENT_FORMAT = "IIHHi"  # unsigned int sec/usec, ushort type/code, int value
+EVENT_FORMAT = "@llHHi"   # struct input_event: timeval (2 x long), type, code, value
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+READ_EVENTS = 64          # events per read()
 W, H = 480, 320
 
-# Input constants
+# From linux/input-event-codes.h
+EV_SYN = 0x00
 EV_KEY = 0x01
 EV_ABS = 0x03
+SYN_REPORT = 0x00
+SYN_DROPPED = 0x03
+BTN_TOUCH = 0x14a
 ABS_X = 0x00
 ABS_Y = 0x01
-BTN_TOUCH = 0x14a
+ABS_MT_SLOT = 0x2f
+ABS_MT_POSITION_X = 0x35
+ABS_MT_POSITION_Y = 0x36
+ABS_MT_TRACKING_ID = 0x39
 
-# Calibration
+# Calibration (raw 0-4095, panel mounted rotate=90)
 X_MIN, X_MAX = 50, 4000
 Y_MIN, Y_MAX = 50, 4000
 
@@ -31,112 +56,368 @@ ZONE_RIGHT = (2*W//3, W)
 ZONE_TOP = (0, H//2)
 ZONE_BOTTOM = (H//2, H)
 
-# Gestures
+# Gestures (screen pixels, seconds)
 LONG_PRESS_SEC = 1.0
-TWO_FINGER_SEC = 0.3  # Between ups for multi-tap
-MIN_TAP_SEC = 0.05    # Debounce noise
-SWIPE_THRESHOLD = 200 # Pixels for swipe (increased for longer gestures)
+TWO_FINGER_SEC = 0.3    # single-touch panels: a second tap this soon after the first is "two finger"
+MIN_TAP_SEC = 0.05      # Debounce noise
+TAP_SLOP_PX = 24        # movement still counted as a tap / long press
+SWIPE_MIN_PX = 50       # shortest swipe ...
+SWIPE_MIN_SPEED = 400   # ... if released at this many px/s
+SWIPE_SLOW_PX = 150     # a slow drag this long is a swipe too
+SWIPE_AXIS_RATIO = 2.0  # main axis must dominate the other by this much
+PINCH_MIN_PX = 40       # change in finger spread for a pinch
+VELOCITY_WINDOW = 0.1   # release speed is measured over the last 100 ms
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
-def input_handler(event_queue: queue.Queue):
-    """Thread to poll /dev/input/event0 and queue unified events."""
-    touch_fd = None
+def calibrate(raw_x, raw_y):
+    """Raw panel coordinates -> screen pixels (swap + invert for rotate=90)."""
+    ax, ay = 4095 - raw_y, raw_x
+    cal_x = max(0, min(W, int((ax - X_MIN) * W / (X_MAX - X_MIN))))
+    cal_y = max(0, min(H, int((ay - Y_MIN) * H / (Y_MAX - Y_MIN))))
+    return cal_x, cal_y
+
+# ----------------------------------------------------------------------
+# Events out
+# ----------------------------------------------------------------------
+class Gesture:
+    """One recognised gesture. Reads like the dicts the slideshow used to
+    get (event['type'], event.get('ts')) as well as by attribute."""
+    __slots__ = ("type", "ts", "cal_x", "cal_y", "zone", "vertical_zone", "duration",
+                 "delta_x", "delta_y", "velocity", "fingers", "scale")
+
+    def __init__(self, type, ts, cal_x, cal_y, duration=0.0, delta_x=0, delta_y=0,
+                 velocity=0.0, fingers=1, scale=1.0):
+        self.type = type
+        self.ts = ts                      # kernel timestamp of the frame that completed it
+        self.cal_x, self.cal_y = cal_x, cal_y
+        self.zone = 'left' if cal_x < ZONE_LEFT[1] else 'center' if cal_x < ZONE_CENTER[1] else 'right'
+        self.vertical_zone = 'top' if cal_y < ZONE_TOP[1] else 'bottom'
+        self.duration = duration
+        self.delta_x, self.delta_y = delta_x, delta_y
+        self.velocity = velocity          # px/s at release
+        self.fingers = fingers
+        self.scale = scale                # pinch: end spread / start spread
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        extra = f" scale={self.scale:.2f}" if self.type.startswith("pinch") else ""
+        return (f"<Gesture {self.type} at ({self.cal_x},{self.cal_y}) {self.zone} "
+                f"d=({self.delta_x},{self.delta_y}) {self.duration:.2f}s {self.velocity:.0f}px/s "
+                f"x{self.fingers}{extra}>")
+
+# ----------------------------------------------------------------------
+# Layer 1: bytes -> evdev tuples
+# ----------------------------------------------------------------------
+class EventDecoder:
+    """Splits a byte stream into input_event tuples. Keeps a partial event
+    across feeds (the kernel never splits one, recordings may)."""
+    __slots__ = ("fmt", "size", "_rest")
+
+    def __init__(self, fmt=EVENT_FORMAT):
+        self.fmt = fmt
+        self.size = struct.calcsize(fmt)
+        self._rest = b""
+
+    def feed(self, data):
+        if self._rest:
+            data = self._rest + data
+        whole = len(data) - len(data) % self.size
+        self._rest = bytes(data[whole:])
+        return struct.iter_unpack(self.fmt, memoryview(data)[:whole])
+
+# ----------------------------------------------------------------------
+# Layer 2: evdev -> contact frames
+# ----------------------------------------------------------------------
+class TouchTracker:
+    """Protocol B slots, or BTN_TOUCH + ABS_X/Y on single-touch panels.
+    Once a device sends ABS_MT_* its legacy single-touch emulation is ignored."""
+    __slots__ = ("machine", "multitouch", "_slot", "_slots", "_touch", "_x", "_y")
+
+    def __init__(self, machine=None):
+        self.machine = machine or GestureMachine()
+        self.multitouch = False
+        self._slot = 0
+        self._slots = {}     # slot -> [tracking_id, raw_x, raw_y]
+        self._touch = False  # single-touch: BTN_TOUCH down
+        self._x = self._y = 0
+
+    def handle(self, sec, usec, ev_type, code, value):
+        """One evdev event; returns the gestures completed by it (usually none)."""
+        if ev_type == EV_ABS:
+            if code >= ABS_MT_SLOT:
+                self.multitouch = True
+                self.machine.single_touch = False
+                if code == ABS_MT_SLOT:
+                    self._slot = value
+                    return ()
+                s = self._slots.setdefault(self._slot, [-1, 0, 0])
+                if code == ABS_MT_TRACKING_ID:
+                    s[0] = value
+                elif code == ABS_MT_POSITION_X:
+                    s[1] = value
+                elif code == ABS_MT_POSITION_Y:
+                    s[2] = value
+            elif code == ABS_X:
+                self._x = value
+            elif code == ABS_Y:
+                self._y = value
+        elif ev_type == EV_KEY and code == BTN_TOUCH:
+            self._touch = bool(value)
+        elif ev_type == EV_SYN and code == SYN_REPORT:
+            return self.machine.frame(sec + usec / 1e6, self.contacts())
+        elif ev_type == EV_SYN and code == SYN_DROPPED:
+            logging.warning("Input buffer overrun (SYN_DROPPED); state resyncs at the next report")
+        return ()
+
+    def contacts(self):
+        """{contact id: (cal_x, cal_y)} of everything touching right now."""
+        if self.multitouch:
+            return {tid: calibrate(x, y) for tid, x, y in self._slots.values() if tid >= 0}
+        return {0: calibrate(self._x, self._y)} if self._touch else {}
+
+# ----------------------------------------------------------------------
+# Layer 3: contact frames -> gestures
+# ----------------------------------------------------------------------
+IDLE, ONE, HELD, MULTI = "idle", "one", "held", "multi"
+
+class Track:
+    """One finger: where it started, where it is, recent samples for speed."""
+    __slots__ = ("t0", "x0", "y0", "t", "x", "y", "sum_x", "sum_y", "n", "recent", "moved")
+
+    def __init__(self, t, x, y):
+        self.t0, self.x0, self.y0 = t, x, y
+        self.t, self.x, self.y = t, x, y
+        self.sum_x, self.sum_y, self.n = x, y, 1
+        self.recent = [(t, x, y)]
+        self.moved = False   # ever left the tap slop
+
+    def move(self, t, x, y):
+        self.t, self.x, self.y = t, x, y
+        self.sum_x += x
+        self.sum_y += y
+        self.n += 1
+        self.recent.append((t, x, y))
+        while len(self.recent) > 2 and self.recent[1][0] <= t - VELOCITY_WINDOW:
+            self.recent.pop(0)
+        if not self.moved and math.hypot(x - self.x0, y - self.y0) > TAP_SLOP_PX:
+            self.moved = True
+
+    def velocity(self):
+        t0, x0, y0 = self.recent[0]
+        if self.t > t0:
+            return math.hypot(self.x - x0, self.y - y0) / (self.t - t0)
+        return 0.0
+
+def _direction(dx, dy):
+    if abs(dx) >= SWIPE_AXIS_RATIO * abs(dy):
+        return "left" if dx < 0 else "right"
+    if abs(dy) >= SWIPE_AXIS_RATIO * abs(dx):
+        return "up" if dy < 0 else "down"
+    return None   # diagonal
+
+def _swipe(dx, dy, speed):
+    """'left'/'right'/'up'/'down' if this displacement + release speed is a swipe."""
+    dist = math.hypot(dx, dy)
+    if dist >= SWIPE_MIN_PX and (speed >= SWIPE_MIN_SPEED or dist >= SWIPE_SLOW_PX):
+        return _direction(dx, dy)
+    return None
+
+class GestureMachine:
+    """idle -> one (a finger down) -> held (long press fired) or multi (a
+    second finger) -> idle when every finger is up; extra fingers while held
+    are ignored. The gesture is decided on release,
+    except long_press, which fires after LONG_PRESS_SEC without movement."""
+
+    def __init__(self):
+        self.state = IDLE
+        self.tracks = {}
+        self.single_touch = True   # TouchTracker clears this for protocol B devices
+        self._last_tap = None      # ts of the last tap (single-touch two-finger emulation)
+        self._multi = None         # [t0, start spread, start centroid, last spread, last centroid, fingers]
+
+    def frame(self, t, contacts):
+        """Contacts for one SYN_REPORT at kernel time t. Returns [Gesture]."""
+        out = []
+        for cid, (x, y) in contacts.items():
+            tr = self.tracks.get(cid)
+            if tr is None:
+                self.tracks[cid] = Track(t, x, y)
+            else:
+                tr.move(t, x, y)
+        gone = [self.tracks.pop(cid) for cid in [c for c in self.tracks if c not in contacts]]
+
+        if self.state == IDLE and contacts:
+            self.state = ONE
+        if self.state == ONE:
+            out += self.tick(t)
+        if self.state == ONE and len(contacts) >= 2:
+            self.state = MULTI
+        if self.state == MULTI:
+            self._track_multi(t)
+
+        if not contacts and self.state != IDLE:
+            if self.state == ONE and gone:
+                out += self._release_one(t, gone[0])
+            elif self.state == MULTI:
+                out += self._release_multi(t)
+            self.state = IDLE
+            self._multi = None
+            self.tracks.clear()
+        return out
+
+    def tick(self, now):
+        """Fire long_press once a still finger has been down long enough.
+        Called per frame and by the reader when the device is quiet."""
+        if self.state != ONE or len(self.tracks) != 1:
+            return []
+        tr = next(iter(self.tracks.values()))
+        if tr.moved or now - tr.t0 < LONG_PRESS_SEC:
+            return []
+        self.state = HELD
+        return [Gesture("long_press", now, round(tr.sum_x / tr.n), round(tr.sum_y / tr.n),
+                        duration=now - tr.t0, delta_x=tr.x - tr.x0, delta_y=tr.y - tr.y0)]
+
+    def _release_one(self, t, tr):
+        dur = t - tr.t0
+        dx, dy = tr.x - tr.x0, tr.y - tr.y0
+        speed = tr.velocity()
+        way = _swipe(dx, dy, speed)
+        if way:
+            return [Gesture(f"swipe_{way}", t, tr.x0, tr.y0, dur, dx, dy, speed)]
+        if tr.moved or dur < MIN_TAP_SEC:
+            return []   # a slow short drag, or contact bounce
+        if dur >= LONG_PRESS_SEC:   # no frames while held (protocol B sends changes only)
+            return [Gesture("long_press", t, round(tr.sum_x / tr.n), round(tr.sum_y / tr.n), dur, dx, dy)]
+        kind = "tap"
+        if self.single_touch and self._last_tap is not None and t - self._last_tap < TWO_FINGER_SEC:
+            kind = "two_finger_tap"
+        self._last_tap = None if kind != "tap" else t
+        return [Gesture(kind, t, round(tr.sum_x / tr.n), round(tr.sum_y / tr.n), dur, dx, dy, speed,
+                        fingers=2 if kind != "tap" else 1)]
+
+    def _spread(self):
+        a, b = sorted(self.tracks.items())[:2]
+        (ax, ay), (bx, by) = (a[1].x, a[1].y), (b[1].x, b[1].y)
+        return math.hypot(ax - bx, ay - by), ((ax + bx) / 2, (ay + by) / 2)
+
+    def _track_multi(self, t):
+        if len(self.tracks) < 2:
+            return   # fingers lifting one at a time: keep the last two-finger spread
+        spread, centre = self._spread()
+        if self._multi is None:
+            t0 = min(tr.t0 for tr in self.tracks.values())
+            self._multi = [t0, spread, centre, spread, centre, len(self.tracks)]
+        else:
+            m = self._multi
+            m[3], m[4] = spread, centre
+            m[5] = max(m[5], len(self.tracks))
+
+    def _release_multi(self, t):
+        if self._multi is None:
+            return []
+        t0, s0, (cx0, cy0), s1, (cx1, cy1), fingers = self._multi
+        dur = t - t0
+        dx, dy = round(cx1 - cx0), round(cy1 - cy0)
+        cx, cy = round(cx1), round(cy1)
+        if abs(s1 - s0) >= PINCH_MIN_PX:
+            scale = s1 / s0 if s0 else 1.0
+            return [Gesture("pinch_out" if s1 > s0 else "pinch_in", t, cx, cy, dur, dx, dy,
+                            fingers=fingers, scale=scale)]
+        speed = math.hypot(dx, dy) / dur if dur > 0 else 0.0
+        way = _swipe(dx, dy, speed)
+        if way:
+            return [Gesture(f"two_finger_swipe_{way}", t, round(cx0), round(cy0), dur, dx, dy, speed,
+                            fingers=fingers)]
+        if math.hypot(dx, dy) <= TAP_SLOP_PX and dur < LONG_PRESS_SEC:
+            return [Gesture("two_finger_tap", t, cx, cy, dur, dx, dy, speed, fingers=fingers)]
+        return []
+
+# ----------------------------------------------------------------------
+# Reader thread
+# ----------------------------------------------------------------------
+def input_handler(event_queue: queue.Queue, device=EVENT_DEVICE):
+    """Thread to read the touchscreen and queue Gestures."""
     try:
-        touch_fd = os.open(EVENT_DEVICE, os.O_RDONLY | os.O_NONBLOCK)
-        logging.info(f"Input thread opened {EVENT_DEVICE}")
+        touch_fd = os.open(device, os.O_RDONLY | os.O_NONBLOCK)
+        logging.info(f"Input thread opened {device} ({EVENT_SIZE}-byte events)")
     except Exception as e:
-        logging.error(f"Input thread failed to open {EVENT_DEVICE}: {e}")
+        logging.error(f"Input thread failed to open {device}: {e}")
         return
 
-    touch_down_time = 0.0
-    last_up_time = 0.0
-    touch_count = 0
-    x_list = []
-    y_list = []
-    delta_x = 0
-    delta_y = 0
-
+    decoder = EventDecoder()
+    tracker = TouchTracker()
     try:
         while True:
             ready, _, _ = select.select([touch_fd], [], [], 0.1)
+            gestures = []
             if ready:
-                buf = os.read(touch_fd, EVENT_SIZE * 10)
-                num_events = len(buf) // EVENT_SIZE
-                events = [struct.unpack(EVENT_FORMAT, buf[i*EVENT_SIZE:(i+1)*EVENT_SIZE]) for i in range(num_events)]
-                for ev_time_sec, ev_time_usec, ev_type, ev_code, ev_value in events:
-                    ev_time = ev_time_sec + ev_time_usec / 1e6
-                    if ev_type == EV_ABS:
-                        if ev_code == ABS_X:
-                            x_list.append(ev_value)
-                            if len(x_list) > 1:
-                                delta_x += x_list[-1] - x_list[-2]
-                        elif ev_code == ABS_Y:
-                            y_list.append(ev_value)
-                            if len(y_list) > 1:
-                                delta_y += y_list[-1] - y_list[-2]
-                    elif ev_type == EV_KEY and ev_code == BTN_TOUCH:
-                        if ev_value == 1:  # Down
-                            if touch_down_time == 0.0:
-                                touch_down_time = ev_time
-                                touch_count += 1
-                                x_list, y_list = [x_list[-1]] if x_list else [], [y_list[-1]] if y_list else []  # Carry last for multi
-                        else:  # Up
-                            if touch_down_time > 0.0:
-                                duration = ev_time - touch_down_time
-                                if duration < MIN_TAP_SEC:
-                                    continue  # Debounce
-                                # Average position
-                                avg_raw_x = sum(x_list) / len(x_list) if x_list else 0
-                                avg_raw_y = sum(y_list) / len(y_list) if y_list else 0
-                                # Calibrate
-                                temp = avg_raw_x
-                                avg_raw_x = 4095 - avg_raw_y
-                                avg_raw_y = temp
-                                cal_x = max(0, min(W, int((avg_raw_x - X_MIN) * W / (X_MAX - X_MIN))))
-                                cal_y = max(0, min(H, int((avg_raw_y - Y_MIN) * H / (Y_MAX - Y_MIN))))
-                                zone = 'left' if cal_x < ZONE_LEFT[1] else 'center' if cal_x < ZONE_CENTER[1] else 'right'
-                                vertical_zone = 'top' if cal_y < ZONE_TOP[1] else 'bottom'
-                                # Rotate deltas 90 CCW to match logical (flip/invert signs post-cal)
-                                temp_dx = delta_x
-                                delta_x = -delta_y  # Adjust based on rotation
-                                delta_y = temp_dx
-                                event_type = 'tap'
-                                if duration > LONG_PRESS_SEC:
-                                    event_type = 'long_press'
-                                elif touch_count >= 2 and (ev_time - last_up_time) < TWO_FINGER_SEC:
-                                    event_type = 'two_finger_tap'
-                                elif abs(delta_x) > SWIPE_THRESHOLD and abs(delta_y) < SWIPE_THRESHOLD / 2:
-                                    event_type = 'swipe_left' if delta_x < 0 else 'swipe_right'
-                                elif abs(delta_y) > SWIPE_THRESHOLD and abs(delta_x) < SWIPE_THRESHOLD / 2:
-                                    event_type = 'swipe_up' if delta_y < 0 else 'swipe_down'
-                                event = {'type': event_type, 'zone': zone, 'vertical_zone': vertical_zone, 'duration': duration, 'count': touch_count, 'cal_x': cal_x, 'cal_y': cal_y, 'delta_x': delta_x, 'delta_y': delta_y}
-                                event_queue.put(event)
-                                logging.info(f"Queued input event: {event}")
-                                touch_down_time = 0.0
-                                last_up_time = ev_time
-                                if event_type != 'two_finger_tap':  # Reset count after non-multi
-                                    touch_count = 0
-                                x_list, y_list = [], []
-                                delta_x, delta_y = 0, 0
-    except KeyboardInterrupt:
-        pass
+                try:
+                    buf = os.read(touch_fd, EVENT_SIZE * READ_EVENTS)
+                except BlockingIOError:
+                    continue
+                if not buf:
+                    break
+                for ev in decoder.feed(buf):
+                    gestures.extend(tracker.handle(*ev))
+            else:
+                gestures = tracker.machine.tick(time.time())   # long press while the panel is quiet
+            for g in gestures:
+                event_queue.put(g)
+                logging.info(f"Queued input event: {g}")
+    except (KeyboardInterrupt, OSError) as e:
+        if isinstance(e, OSError):
+            logging.error(f"Input read failed: {e}")
     finally:
-        if touch_fd:
-            os.close(touch_fd)
+        os.close(touch_fd)
         logging.info("Input thread stopped")
 
-if __name__ == "__main__":
+def replay(data, fmt=EVENT_FORMAT):
+    """[Gesture] for a recorded byte stream (no long-press ticks between reads)."""
+    tracker = TouchTracker()
+    out = []
+    for ev in EventDecoder(fmt).feed(data):
+        out.extend(tracker.handle(*ev))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Print touch gestures, or record/replay raw events")
+    ap.add_argument("--device", default=EVENT_DEVICE)
+    ap.add_argument("--record", metavar="FILE", help="append raw events from the device to FILE")
+    ap.add_argument("--replay", metavar="FILE", help="print the gestures in a recording")
+    args = ap.parse_args()
+
+    if args.replay:
+        with open(args.replay, "rb") as f:
+            for g in replay(f.read()):
+                print(g)
+        return
+    if args.record:
+        with open(args.device, "rb", buffering=0) as src, open(args.record, "ab") as dst:
+            print(f"Recording {args.device} -> {args.record} (Ctrl+C to stop)")
+            try:
+                while True:
+                    dst.write(src.read(EVENT_SIZE * READ_EVENTS))
+            except KeyboardInterrupt:
+                return
     q = queue.Queue()
-    t = threading.Thread(target=input_handler, args=(q,))
-    t.start()
+    threading.Thread(target=input_handler, args=(q, args.device), daemon=True).start()
     try:
         while True:
             try:
-                event = q.get(timeout=1)
-                print(f"Received event: {event}")
+                print(f"Received event: {q.get(timeout=1)}")
             except queue.Empty:
                 pass
     except KeyboardInterrupt:
         print("Stopped")
-    t.join()
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
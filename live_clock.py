@@ -0,0 +1,111 @@
+# live_clock.py - 1 Hz clock drawn by the display process from RGB565 glyph sprites
+#
+# Glyphs ("0-9", ":", " ", "A", "P", "M") are rasterized once per
+# (font size, color) into overlay sprites. Each tick composes only the
+# clock's bounding box and hands it to FramebufferWriter.patch(); if the
+# text hasn't changed since the last tick nothing is drawn at all.
+#
+# Two placements:
+#   "card"   - the clock card's big time line (same font/position as cards/clock.py)
+#   "corner" - a small top-right clock over the timestamp of btc / news; the
+#              box blanks the card's whole stamp ("Nov 10 04:07 PM", see
+#              base.TIMESTAMP_FMT) so no stale date is left beside it
+
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw
+
+import overlay
+import rgb565
+from cards import base
+
+GLYPHS = "0123456789: APM"
+CARD_Y = 60     # cards/clock.py draws the time at y=60
+
+class GlyphSet:
+    """Pre-rasterized glyph sprites for one font size and color."""
+
+    def __init__(self, size, color, order=rgb565.DEFAULT_ORDER):
+        fnt = base.font(size)
+        self.size = size
+        boxes = [fnt.getbbox(ch) for ch in GLYPHS if ch != " "]
+        self.top = min(b[1] for b in boxes)         # ink extent relative to d.text() origin
+        self.height = max(b[3] for b in boxes) - self.top
+        self.advance = {}
+        self.sprites = {}
+        for ch in GLYPHS:
+            adv = int(round(fnt.getlength(ch)))
+            self.advance[ch] = adv
+            if ch == " ":
+                continue
+            l, _, r, _ = fnt.getbbox(ch)
+            img = Image.new("RGBA", (max(adv, r) + 1, self.height), (0, 0, 0, 0))
+            ImageDraw.Draw(img).text((0, -self.top), ch, fill=tuple(color) + (255,), font=fnt)
+            self.sprites[ch] = overlay.Sprite(img, order)
+
+    def width(self, text):
+        return sum(self.advance[ch] for ch in text)
+
+@lru_cache(maxsize=8)
+def glyph_set(size, color, order=rgb565.DEFAULT_ORDER):
+    return GlyphSet(size, tuple(color), order)
+
+def clock_text(now=None, seconds=False):
+    """Same format as cards/clock.py ('4:07 PM'), optionally with seconds."""
+    now = now or datetime.now()
+    h = now.hour % 12 or 12
+    text = f"{h}:{now.minute:02d}"
+    if seconds:
+        text += f":{now.second:02d}"
+    return text + (" PM" if now.hour >= 12 else " AM")
+
+class LiveClock:
+    """Draws one placement of the clock into a framebuffer writer."""
+
+    def __init__(self, cfg, placement="card", order=rgb565.DEFAULT_ORDER, seconds=False, width=base.W):
+        self.placement = placement
+        self.seconds = seconds
+        bg = cfg.colors["bg"]
+        if placement == "card":
+            self.glyphs = glyph_set(cfg.fonts["clock_time_size"], cfg.colors["accent"], order)
+        else:
+            self.glyphs = glyph_set(cfg.fonts["timestamp_size"], cfg.colors["time_stamp"], order)
+        self.bg = rgb565.pack_pixel(*bg, order)
+        if placement == "card":
+            self.box_x, self.box_w = 0, width
+            self.box_y = CARD_Y + self.glyphs.top
+            self.text_right = None
+        else:
+            # From the left of the widest stamp a card can draw (or of the clock,
+            # if that is wider) to the right edge, so no stamp text survives
+            size = cfg.fonts["timestamp_size"]
+            right = width - cfg.padding["timestamp_x"]
+            widest = max(base.timestamp_width(size),
+                         self.glyphs.width("00:00:00 PM" if seconds else "00:00 PM"))
+            self.box_x = max(0, right - widest - 4)
+            self.box_w = width - self.box_x
+            self.box_y = cfg.padding["timestamp_y"] + self.glyphs.top
+            self.text_right = right - self.box_x
+        self.box_h = self.glyphs.height
+        self.last_text = None
+
+    def render(self, text):
+        """HxW uint16 block for the clock's bounding box."""
+        block = np.full((self.box_h, self.box_w), self.bg, dtype=np.uint16)
+        tw = self.glyphs.width(text)
+        x = (self.box_w - tw) // 2 if self.placement == "card" else self.text_right - tw
+        for ch in text:
+            sprite = self.glyphs.sprites.get(ch)
+            if sprite is not None:
+                overlay.blend(block, sprite, x, 0)
+            x += self.glyphs.advance[ch]
+        return block
+
+    def tick(self, writer, now=None, force=False):
+        """Redraw if the visible text changed (or force). Returns bytes written."""
+        text = clock_text(now, self.seconds)
+        if text == self.last_text and not force:
+            return 0
+        self.last_text = text
+        return writer.patch(self.box_x, self.box_y, self.render(text))
@@ -0,0 +1,178 @@
+# metrics.py - Timing spans aggregated into in-process histograms
+#
+#   with metrics.span("display.fb_write"):
+#       ...
+#   metrics.observe("render.png", ms)
+#
+# Each span name gets a fixed-bucket histogram (count, sum, max, buckets).
+# maybe_export() writes them every export_interval seconds to
+# state/metrics.json and a Prometheus text file (node_exporter textfile
+# collector format). Several processes (render server, display) share the
+# files: each export replaces only this process's section under a flock.
+#
+# Switch off with metrics.enabled: false in config.yaml; span() then hands
+# back a shared no-op object and observe() returns immediately.
+
+import os
+import json
+import time
+import fcntl
+import bisect
+import logging
+import threading
+import sys
+
+STATE_DIR = os.path.expanduser("~/pidisplay/state")
+JSON_PATH = os.path.join(STATE_DIR, "metrics.json")
+PROM_PATH = os.path.join(STATE_DIR, "metrics.prom")
+
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+DEFAULT_EXPORT_INTERVAL = 60   # seconds
+
+enabled = True
+export_interval = DEFAULT_EXPORT_INTERVAL
+process = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)   # last slot: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        if ms > self.max:
+            self.max = ms
+
+    def to_dict(self):
+        cum, buckets = 0, {}
+        for le, n in zip(BUCKETS_MS + ("+Inf",), self.counts):
+            cum += n
+            buckets[str(le)] = cum
+        return {"count": self.count, "sum_ms": round(self.sum, 3), "max_ms": round(self.max, 3),
+                "avg_ms": round(self.sum / self.count, 3) if self.count else 0.0, "buckets": buckets}
+
+_hists = {}
+_lock = threading.Lock()
+_last_export = 0.0
+_cfg = None
+
+def observe(name, ms):
+    if not enabled:
+        return
+    h = _hists.get(name)
+    if h is None:
+        with _lock:
+            h = _hists.setdefault(name, Histogram())
+    h.observe(ms)
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, (time.perf_counter() - self.t0) * 1000)
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+def span(name):
+    """Context manager timing its block into histogram `name` (ms)."""
+    return _Span(name) if enabled else _NO_SPAN
+
+def snapshot():
+    """{span name: histogram dict} for this process."""
+    with _lock:
+        return {name: h.to_dict() for name, h in sorted(_hists.items())}
+
+def reset():
+    with _lock:
+        _hists.clear()
+
+def configure(cfg):
+    """Apply the metrics: section of a config snapshot (cheap when unchanged)."""
+    global _cfg, enabled, export_interval
+    if cfg is _cfg:
+        return
+    _cfg = cfg
+    m = cfg.get("metrics") or {}
+    enabled = bool(m.get("enabled", True))
+    export_interval = float(m.get("export_interval", DEFAULT_EXPORT_INTERVAL))
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+def _prom_label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"')
+
+def to_prometheus(processes):
+    """Prometheus text format for {process: {span: histogram dict}}. Seconds, per convention."""
+    lines = ["# HELP pidisplay_span_seconds Time spent in instrumented pidisplay stages.",
+             "# TYPE pidisplay_span_seconds histogram"]
+    for proc, spans in sorted(processes.items()):
+        for name, h in sorted(spans.items()):
+            labels = f'process="{_prom_label(proc)}",span="{_prom_label(name)}"'
+            for le, n in h["buckets"].items():
+                le_s = le if le == "+Inf" else repr(float(le) / 1000)
+                lines.append(f'pidisplay_span_seconds_bucket{{{labels},le="{le_s}"}} {n}')
+            lines.append(f"pidisplay_span_seconds_sum{{{labels}}} {h['sum_ms'] / 1000:.6f}")
+            lines.append(f"pidisplay_span_seconds_count{{{labels}}} {h['count']}")
+    return "\n".join(lines) + "\n"
+
+def _write_atomic(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def export(json_path=None, prom_path=None):
+    """Merge this process's histograms into metrics.json and rewrite the .prom file."""
+    json_path = json_path or JSON_PATH
+    prom_path = prom_path or PROM_PATH
+    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+    with open(json_path + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(json_path) as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            doc = {}
+        procs = doc.get("processes") or {}
+        procs[process] = {"updated": time.strftime("%Y-%m-%dT%H:%M:%S"), "pid": os.getpid(), "spans": snapshot()}
+        doc = {"processes": procs}
+        _write_atomic(json_path, json.dumps(doc, indent=1, sort_keys=True) + "\n")
+        _write_atomic(prom_path, to_prometheus({p: v["spans"] for p, v in procs.items()}))
+
+def maybe_export(now=None):
+    """Export if export_interval has passed since the last one. Call from loops."""
+    global _last_export
+    if not enabled:
+        return False
+    now = time.monotonic() if now is None else now
+    if now - _last_export < export_interval and _last_export:
+        return False
+    _last_export = now
+    try:
+        export()
+    except OSError as e:
+        logging.warning(f"Metrics export failed: {e}")
+    return True
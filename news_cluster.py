@@ -0,0 +1,122 @@
+# news_cluster.py - Incremental near-duplicate clustering for headlines
+#
+# Same rule as cards/news.py's old pairwise pass: a headline joins a
+# cluster when the Jaccard similarity of its token set with the cluster
+# leader's is >= THRESHOLD. Instead of testing every group, each title gets
+# a MinHash signature once at ingest and LSH banding (BANDS x ROWS) picks
+# the few leaders worth an exact Jaccard check:
+#
+#   P(candidate) = 1 - (1 - s**ROWS)**BANDS  ->  s=0.85: 0.99999, s=0.3: 0.12
+#
+# Leaders are tried in creation order and the first that passes wins, as
+# before. news_store.py persists tokens, band keys and cluster ids in
+# news.db, so a render only groups what is already assigned; Clusterer is
+# the in-memory version for ad-hoc lists and tools/bench_news_cluster.py.
+
+import re
+import zlib
+
+import numpy as np
+
+THRESHOLD = 0.85
+BANDS, ROWS = 16, 4
+NUM_PERM = BANDS * ROWS
+_rng = np.random.default_rng(0x6E657773)      # fixed: keys stored in news.db must stay stable
+_SEEDS = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+_MIX = _rng.integers(1, 1 << 63, ROWS, dtype=np.uint64) | np.uint64(1)
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+def tokens(title):
+    """Token set the similarity rule compares (lower-case a-z0-9 words)."""
+    return frozenset(_NON_WORD.sub(" ", (title or "").lower()).split())
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _fmix64(h):
+    """MurmurHash3's 64-bit finalizer (uint64 arrays wrap, which is the point)."""
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(0xFF51AFD7ED558CCD)
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(0xC4CEB9FE1A85EC53)
+    h ^= h >> np.uint64(33)
+    return h
+
+def signature(toks):
+    """NUM_PERM-wide MinHash of a token set: per seed, min over tokens of
+    fmix64(crc32(token) ^ seed), all seeds at once in numpy."""
+    x = np.fromiter((zlib.crc32(t.encode()) for t in toks), np.uint64, len(toks))
+    return _fmix64(x[:, None] ^ _SEEDS).min(axis=0)
+
+def band_keys(toks):
+    """One signed 64-bit key per band (SQLite INTEGER); empty sets get none."""
+    if not toks:
+        return []
+    sig = signature(toks).reshape(BANDS, ROWS)
+    return [int(k) for k in (sig * _MIX).sum(axis=1).view(np.int64)]
+
+def pick(toks, candidates, threshold=THRESHOLD):
+    """First (cluster, leader tokens) in creation order that toks joins, else None."""
+    for cluster, lead in candidates:
+        if jaccard(toks, lead) >= threshold:
+            return cluster
+    return None
+
+class Clusterer:
+    """In-memory LSH index: add() items in order, get their cluster ids."""
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.buckets = {}    # (band, key) -> [cluster ids]
+        self.leaders = {}    # cluster id -> (creation order, tokens)
+        self.compared = 0    # exact Jaccard checks done
+
+    def add(self, item_id, title):
+        toks = tokens(title)
+        keys = band_keys(toks)
+        seen = set()
+        for band_key in enumerate(keys):
+            seen.update(self.buckets.get(band_key, ()))
+        candidates = sorted(seen, key=lambda c: self.leaders[c][0])
+        self.compared += len(candidates)
+        cluster = pick(toks, ((c, self.leaders[c][1]) for c in candidates), self.threshold)
+        if cluster is None:
+            cluster = item_id
+            self.leaders[cluster] = (len(self.leaders), toks)
+            for band_key in enumerate(keys):
+                self.buckets.setdefault(band_key, []).append(cluster)
+        return cluster
+
+def group(items, top_n=5):
+    """Representatives of already-assigned items (newest first, each with
+    "cluster"): newest item per cluster plus "count", newest clusters first."""
+    reps = {}
+    for it in sorted(items, key=lambda x: x.get("ts", ""), reverse=True):
+        rep = reps.get(it["cluster"])
+        if rep is None:
+            reps[it["cluster"]] = rep = dict(it, count=0)
+        rep["count"] += 1
+    return list(reps.values())[:top_n]
+
+def pairwise(items, top_n=5, threshold=THRESHOLD):
+    """The original O(items x groups) pass cards/news.py used, kept as the
+    reference tests and the benchmark compare against."""
+    groups = []
+    for it in sorted(items, key=lambda x: x.get("ts", ""), reverse=True):
+        toks = tokens(it.get("title", ""))
+        for g in groups:
+            if jaccard(toks, tokens(g[0].get("title", ""))) >= threshold:
+                g.append(it)
+                break
+        else:
+            groups.append([it])
+    reps = []
+    for g in groups:
+        rep = dict(max(g, key=lambda it: it.get("ts", "")))
+        rep["count"] = len(g)
+        reps.append(rep)
+    reps.sort(key=lambda it: it.get("ts", ""), reverse=True)
+    return reps[:top_n]
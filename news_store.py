@@ -0,0 +1,219 @@
+# news_store.py - Headline store shared by the news fetchers and cards/news.py
+#
+# SQLite in WAL mode (state/news.db): fetchers in different processes insert
+# concurrently without the read-modify-write of news.json losing items, and
+# the card reads while they write. Timestamps are stored as epoch seconds
+# with an index on (source, ts), so "enabled sources, last 24 h" and
+# expiry are index range scans instead of parsing every timestamp.
+# Dedup is INSERT OR IGNORE on the id (fetch_news mk_id: source + title).
+#
+# New items are clustered as they are inserted (news_cluster.py): the lsh
+# table holds each cluster leader's band keys, so recent() hands the card
+# items with their "cluster" already assigned.
+#
+# On first open an existing state/news.json is imported once.
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import news_cluster
+from datetime import datetime, timezone
+
+STATE_DIR = os.path.expanduser("~/pidisplay/state")
+DB_NAME = "news.db"
+LEGACY_JSON = "news.json"
+MAX_AGE = 24 * 3600
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id      TEXT PRIMARY KEY,
+    source  TEXT NOT NULL,
+    title   TEXT NOT NULL,
+    url     TEXT,
+    ts      INTEGER NOT NULL,   -- epoch seconds, UTC
+    ts_iso  TEXT NOT NULL,      -- same instant as '...Z', what cards sort/print
+    tags    TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS items_source_ts ON items (source, ts);
+CREATE INDEX IF NOT EXISTS items_ts ON items (ts);
+"""
+
+# v2: near-duplicate clusters (news_cluster.py)
+SCHEMA_V2 = """
+ALTER TABLE items ADD COLUMN cluster TEXT;
+CREATE TABLE IF NOT EXISTS clusters (
+    id      TEXT PRIMARY KEY,   -- leader item id
+    tokens  TEXT NOT NULL       -- leader's token set, space-joined
+);
+CREATE TABLE IF NOT EXISTS lsh (
+    band    INTEGER NOT NULL,
+    key     INTEGER NOT NULL,
+    cluster TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lsh_band_key ON lsh (band, key);
+CREATE INDEX IF NOT EXISTS items_cluster ON items (cluster);
+"""
+
+def to_epoch(ts_iso):
+    """'2025-11-10T18:00:00Z' (or +00:00) -> epoch seconds; None if unparseable."""
+    try:
+        t = datetime.fromisoformat((ts_iso or "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=timezone.utc)
+    return int(t.timestamp())
+
+def to_iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class NewsStore:
+    def __init__(self, path=None, legacy_json=None):
+        """path defaults to STATE_DIR/news.db; legacy_json to news.json next to it."""
+        self.path = path or os.path.join(STATE_DIR, DB_NAME)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")   # WAL: durable at checkpoint, never corrupt
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._init_schema(legacy_json or os.path.join(os.path.dirname(self.path), LEGACY_JSON))
+
+    def _init_schema(self, legacy_json):
+        n = 0
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            version = self.db.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return   # another process got here first
+            if version < 1:
+                self._run(SCHEMA)
+            if version < 2:
+                self._run(SCHEMA_V2)
+                rows = self.db.execute("SELECT id, title FROM items ORDER BY rowid").fetchall()
+                for item_id, title in rows:
+                    self._assign(item_id, title)
+            if version < 1:
+                try:
+                    with open(legacy_json) as f:
+                        items = json.load(f).get("items") or []
+                except (OSError, ValueError, AttributeError):
+                    items = []
+                n = self._insert(items)
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        if n:
+            logging.info(f"news store: imported {n} items from {legacy_json}")
+
+    def _run(self, script):
+        for stmt in script.split(";"):
+            if stmt.strip():
+                self.db.execute(stmt)
+
+    def _assign(self, item_id, title):
+        """Cluster one stored item: LSH candidates from the lsh table, exact
+        Jaccard against their leaders, else it leads a new cluster."""
+        toks = news_cluster.tokens(title)
+        keys = news_cluster.band_keys(toks)
+        cluster = None
+        if keys:
+            where = " OR ".join(["(l.band = ? AND l.key = ?)"] * len(keys))
+            args = [v for band_key in enumerate(keys) for v in band_key]
+            candidates = self.db.execute(
+                f"SELECT DISTINCT c.id, c.tokens, c.rowid FROM lsh l JOIN clusters c ON c.id = l.cluster "
+                f"WHERE {where} ORDER BY c.rowid", args)
+            cluster = news_cluster.pick(toks, ((c, frozenset(t.split())) for c, t, _ in candidates))
+        if cluster is None:
+            cluster = item_id
+            self.db.execute("INSERT OR IGNORE INTO clusters (id, tokens) VALUES (?, ?)",
+                            (cluster, " ".join(sorted(toks))))
+            self.db.executemany("INSERT INTO lsh (band, key, cluster) VALUES (?, ?, ?)",
+                                [(band, key, cluster) for band, key in enumerate(keys)])
+        self.db.execute("UPDATE items SET cluster = ? WHERE id = ?", (cluster, item_id))
+        return cluster
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _insert(self, items):
+        """INSERT OR IGNORE, then cluster just the rows that were new."""
+        rows, ids = [], set()
+        for it in items:
+            epoch = to_epoch(it.get("ts"))
+            if epoch is None or not it.get("id") or not it.get("title") or it["id"] in ids:
+                continue
+            ids.add(it["id"])
+            rows.append((it["id"], (it.get("source") or "").lower(), it["title"], it.get("url"),
+                         epoch, to_iso(epoch), ",".join(it.get("tags") or ())))
+        known = self.known(ids)
+        rows = [r for r in rows if r[0] not in known]
+        self.db.executemany("INSERT OR IGNORE INTO items (id, source, title, url, ts, ts_iso, tags) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        for r in rows:
+            self._assign(r[0], r[2])
+        return len(rows)
+
+    def add(self, items):
+        """Insert a batch in one transaction; duplicates (same id) are ignored.
+        Returns how many were new."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            return self._insert(items)
+
+    def known(self, ids):
+        """The subset of ids already stored."""
+        ids = list(ids)
+        found = set()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            q = f"SELECT id FROM items WHERE id IN ({','.join('?' * len(chunk))})"
+            found.update(r[0] for r in self.db.execute(q, chunk))
+        return found
+
+    def ids(self, source):
+        """Every stored id for one source (the fetchers' "already seen" set)."""
+        return {r[0] for r in self.db.execute("SELECT id FROM items WHERE source = ?", (source,))}
+
+    def recent(self, sources, since=None, now=None, limit=None):
+        """Items from these sources newer than `since` (epoch; default the
+        last 24 h before now), newest first, as dicts like news.json had."""
+        sources = [s.lower() for s in sources]
+        if not sources:
+            return []
+        if since is None:
+            since = (now if now is not None else time.time()) - MAX_AGE
+        q = (f"SELECT id, source, title, url, ts_iso, tags, cluster FROM items "
+             f"WHERE source IN ({','.join('?' * len(sources))}) AND ts >= ? "
+             f"ORDER BY ts DESC, rowid")
+        args = [*sources, int(since)]
+        if limit:
+            q += " LIMIT ?"
+            args.append(int(limit))
+        return [{"id": r[0], "source": r[1], "title": r[2], "url": r[3], "ts": r[4],
+                 "tags": r[5].split(",") if r[5] else [], "cluster": r[6] or r[0]}
+                for r in self.db.execute(q, args)]
+
+    def prune(self, max_age=MAX_AGE, now=None):
+        """Delete items older than max_age seconds, and clusters left with no
+        items. Returns how many items went."""
+        cutoff = (now if now is not None else time.time()) - max_age
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            n = self.db.execute("DELETE FROM items WHERE ts < ?", (int(cutoff),)).rowcount
+            if n:
+                self.db.execute("DELETE FROM clusters WHERE id NOT IN "
+                                "(SELECT cluster FROM items WHERE cluster IS NOT NULL)")
+                self.db.execute("DELETE FROM lsh WHERE cluster NOT IN (SELECT id FROM clusters)")
+            return n
+
+    def count(self, source=None):
+        if source is None:
+            return self.db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM items WHERE source = ?", (source,)).fetchone()[0]
@@ -0,0 +1,66 @@
+# overlay.py - Alpha-blend small sprites straight into RGB565 frames
+#
+# Sprites (menu button, badges, clock digits, ...) are encoded once into
+# 5/6/5 channel planes plus an 8-bit alpha mask. Blending then works on an
+# already-encoded frame over just the sprite's rectangle, so a button press
+# touches 24x24 pixels instead of decoding and re-encoding 480x320.
+#
+# Blending happens at panel precision (5/6/5 bits per channel); the result
+# can differ from PIL's 8-bit paste by one LSB on half-transparent edges.
+
+import numpy as np
+import rgb565
+
+class Sprite:
+    """Pre-encoded RGBA sprite: 5/6/5 planes (high/mid/low bit fields, so it
+    works for either pixel order) and alpha in 0..255."""
+    __slots__ = ("width", "height", "hi", "mid", "lo", "alpha", "packed")
+
+    def __init__(self, img, order=rgb565.DEFAULT_ORDER):
+        img = img.convert("RGBA")
+        rgba = np.asarray(img)
+        self.width, self.height = img.size
+        self.packed = rgb565.to_rgb565(rgba, order)
+        self.hi, self.mid, self.lo = split(self.packed)
+        self.alpha = rgba[..., 3].astype(np.uint16)
+
+def split(packed):
+    """uint16 RGB565 -> (hi5, mid6, lo5) uint16 planes."""
+    return packed >> 11, (packed >> 5) & 0x3F, packed & 0x1F
+
+def _clip(frame_shape, sprite, x, y):
+    """(frame slices, sprite slices) for the on-screen part, or None."""
+    fh, fw = frame_shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sprite.width, fw), min(y + sprite.height, fh)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return ((slice(y0, y1), slice(x0, x1)),
+            (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)))
+
+def blend_block(under, sprite, sl=None):
+    """Sprite over an HxW uint16 block (same size as the sprite, or the
+    sprite slice sl). Returns a new block."""
+    sl = sl or (slice(None), slice(None))
+    a = sprite.alpha[sl]
+    inv = 255 - a
+    uh, um, ul = split(under.astype(np.uint16))
+    hi = (sprite.hi[sl] * a + uh * inv + 127) // 255
+    mid = (sprite.mid[sl] * a + um * inv + 127) // 255
+    lo = (sprite.lo[sl] * a + ul * inv + 127) // 255
+    return ((hi << 11) | (mid << 5) | lo).astype(np.uint16)
+
+def blend(frame, sprite, x, y, under=None):
+    """Blend sprite into frame (HxW uint16) in place at (x, y).
+
+    under: optional clean copy of the frame to blend over instead of what is
+    in frame now, e.g. to swap the pressed menu icon back to normal without
+    the two icons mixing. Returns the (y0, y1, x0, x1) rectangle touched.
+    """
+    clipped = _clip(frame.shape, sprite, x, y)
+    if clipped is None:
+        return None
+    fsl, ssl = clipped
+    base = (under if under is not None else frame)[fsl]
+    frame[fsl] = blend_block(base, sprite, ssl)
+    return (fsl[0].start, fsl[0].stop, fsl[1].start, fsl[1].stop)
@@ -1,28 +1,129 @@
 # ~/pidisplay/render.py
 #!/usr/bin/env python3
+# Thin client: asks render_server.py to render; renders in-process if it isn't running.
+# --parallel renders each card in its own worker process instead (RenderPool),
+# which is also what display_slideshow.py uses for a full re-render.
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+import time
+import logging
 import argparse
-from cards import clock, weather, btc, news
+import render_server
+
+# ----------------------------------------------------------------------
+# Parallel mode: one warm worker per core
+# ----------------------------------------------------------------------
+def _init_worker():
+    render_server.metrics.process = "render_worker"
+    render_server.warm_up()   # cards, fonts, atlas, config: paid once per worker
+
+def _render_one(name):
+    return render_server.render_local([name])[name]
+
+def _ping():
+    return os.getpid()
+
+class RenderPool:
+    """Process pool that renders cards concurrently. Workers are spawned
+    (not forked: the display has threads running) and stay warm between
+    calls, so only the first render pays for imports and fonts."""
+
+    def __init__(self, workers=None):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        self.workers = workers or min(os.cpu_count() or 1, len(render_server.CARD_NAMES))
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker)
+
+    def warm(self):
+        """Start every worker now and wait for its warm-up."""
+        for f in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            f.result()
+
+    def render(self, names=None, on_done=None):
+        """Render cards (default all) across the workers. on_done(name, result)
+        runs in this process as each card finishes. Returns {name: result}."""
+        from concurrent.futures import as_completed
+        futures = {self._executor.submit(_render_one, n): n for n in names or render_server.CARD_NAMES}
+        results = {}
+        for f in as_completed(futures):
+            name = futures[f]
+            try:
+                results[name] = f.result()
+            except Exception as e:   # worker died (BrokenProcessPool) or pickling failed
+                results[name] = {"ok": False, "ms": 0.0, "error": str(e)}
+            if on_done is not None:
+                on_done(name, results[name])
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+_pool = None
+
+def render_parallel(names=None, on_done=None):
+    """Render with the process-wide RenderPool (created and warmed on first use)."""
+    global _pool
+    if _pool is None:
+        t0 = time.perf_counter()
+        _pool = RenderPool()
+        _pool.warm()
+        logging.info(f"Render pool: {_pool.workers} workers warm in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    return _pool.render(names, on_done)
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--only", nargs="*", help="Render only these cards")
+    parser.add_argument("--local", action="store_true", help="Render in this process, skip the render server")
+    parser.add_argument("--changed", action="store_true", help="Only cards whose inputs changed (render server only)")
+    parser.add_argument("--preview", action="store_true", help="Also write images/<card>.png previews")
+    parser.add_argument("--parallel", action="store_true", help="Render in a process pool, one card per core (skips the server)")
     args = parser.parse_args()
 
-    cards = {
-        "clock": clock,
-        "weather": weather,
-        "btc": btc,
-        "news": news,
-    }
+    to_render = args.only or list(render_server.CARD_NAMES)
+    unknown = [n for n in to_render if n not in render_server.CARD_NAMES]
+    to_render = [n for n in to_render if n in render_server.CARD_NAMES]
+    for name in unknown:
+        print(f"{name} error: unknown card")
 
-    to_render = args.only or cards.keys()
-    for name in to_render:
-        if name in cards:
-            try:
-                cards[name]()
-                print(f"Rendered {name}")
-            except Exception as e:
-                print(f"{name} error: {e}")
+    via = "local"
+    results = previews = None
+    if args.parallel:
+        results = render_parallel(to_render)
+        via = "parallel"
+    elif not args.local:
+        try:
+            send = render_server.refresh_remote if args.changed else render_server.render_remote
+            reply = send(to_render)
+            results = reply.get("results")
+            via = "server"
+            if args.preview:
+                previews = render_server.preview_remote(to_render).get("results")
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            print(f"Render server unavailable ({e}); rendering in-process")
+        except (OSError, ValueError) as e:
+            # Timed out or garbled: the server may still be writing these
+            # frames, so rendering them here too would race it
+            print(f"Render server error: {e!r}")
+            sys.exit(1)
+    if results is None:
+        from cards import base
+        render_server.metrics.configure(base.get_config())
+        results = render_server.render_local(to_render)
+        render_server.metrics.maybe_export()
+    if args.preview and previews is None:
+        previews = render_server.preview_local(to_render)
+
+    for name, r in results.items():
+        if r.get("skipped"):
+            print(f"Skipped {name} (inputs unchanged)")
+        elif r["ok"]:
+            print(f"Rendered {name} ({via}, {r['ms']} ms)")
+        else:
+            print(f"{name} error: {r.get('error')}")
+    for name, r in (previews or {}).items():
+        print(f"Preview {name}: {r['path'] if r['ok'] else 'error: ' + r['error']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
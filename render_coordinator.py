@@ -0,0 +1,171 @@
+# render_coordinator.py - Re-render a card only when something it reads changed
+#
+# cards/registry.py declares each card's state files, config sections and
+# time granularity. The coordinator fingerprints those (content hashes, not
+# mtimes: fetchers rewrite btc.json every 30 s with the same price) and
+# renders only cards whose fingerprint moved since their last good render.
+#
+# Runs inside render_server.py, which owns rendering: "refresh" requests
+# and the watcher thread both go through Coordinator.refresh(). The watcher
+# wakes on inotify events (watchdog) for the state dir and config.yaml and
+# at the next time bucket of cards like the clock, whichever is first.
+# Fingerprints and rendered/skipped counters persist in
+# state/render_coordinator.json.
+
+import os
+import json
+import time
+import logging
+import threading
+
+import config
+from cards import base, registry
+
+STATE_FILE = "render_coordinator.json"
+DEBOUNCE = 0.2   # seconds: tmp + rename, WAL + checkpoint arrive as bursts
+# writes only: opened / closed_no_write come from our own renders reading state
+WRITE_EVENTS = ("created", "modified", "moved", "closed", "deleted")
+RETRY_FAILED = 60.0   # seconds before a failed card is retried with unchanged inputs
+
+class Coordinator:
+    def __init__(self, render, snapshot=config.snapshot, clock=time.time, path=None):
+        """render(names) -> {name: {"ok", "ms", ...}} (render_server.render_local)."""
+        self.render = render
+        self.snapshot = snapshot
+        self.clock = clock
+        self.path = path or base.state_path(STATE_FILE)
+        self.lock = threading.Lock()
+        self.fingerprints = {}
+        self.failed = {}   # card -> (fingerprint, when): a render that raised; reading
+                           # news.db touches its -wal, so retrying on every event would spin
+        self.counts = {name: {"rendered": 0, "skipped": 0} for name in registry.CARDS}
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._observer = None
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+            self.fingerprints = saved.get("fingerprints") or {}
+            for name, c in (saved.get("counts") or {}).items():
+                self.counts.setdefault(name, {"rendered": 0, "skipped": 0}).update(c)
+        except (OSError, ValueError):
+            pass
+
+    def changed(self, names=None, force=False):
+        """([cards to render], [cards unchanged], {card: new fingerprint})."""
+        cfg, now = self.snapshot(), self.clock()
+        todo, same, fps = [], [], {}
+        for name in names or registry.CARDS:
+            card = registry.CARDS.get(name)
+            if card is None:
+                todo.append(name)   # let the renderer report it
+                continue
+            fps[name] = fp = registry.fingerprint(card, cfg, now)
+            failed_fp, failed_at = self.failed.get(name, (None, 0.0))
+            if not force and fp == failed_fp and now - failed_at < RETRY_FAILED:
+                same.append(name)
+            elif force or fp != self.fingerprints.get(name) or not registry.output_exists(name):
+                todo.append(name)
+            else:
+                same.append(name)
+        return todo, same, fps
+
+    def refresh(self, names=None, force=False):
+        """Render the named cards (default all) whose inputs changed; force
+        renders them regardless. Returns render results, with
+        {"ok": True, "ms": 0.0, "skipped": True} for the unchanged ones."""
+        with self.lock:
+            todo, same, fps = self.changed(names, force)
+            results = self.render(todo) if todo else {}
+            for name, r in results.items():
+                if name not in fps:
+                    continue
+                if r.get("ok"):
+                    self.fingerprints[name] = fps[name]
+                    self.failed.pop(name, None)
+                    self.counts[name]["rendered"] += 1
+                else:
+                    self.failed[name] = (fps[name], self.clock())
+            for name in same:
+                self.counts[name]["skipped"] += 1
+                results[name] = {"ok": True, "ms": 0.0, "skipped": True}
+            if todo:
+                self._save()
+        return results
+
+    def report(self):
+        return {"rendered": sum(c["rendered"] for c in self.counts.values()),
+                "skipped": sum(c["skipped"] for c in self.counts.values()),
+                "cards": self.counts}
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"fingerprints": self.fingerprints, "counts": self.counts}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning(f"render coordinator: can't save {self.path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Watching
+    # ------------------------------------------------------------------
+    def notify(self, path):
+        """A file changed (called from the inotify thread)."""
+        name = os.path.basename(path)
+        if name == config.CONFIG_PATH.name:
+            cards = list(registry.CARDS)
+        else:
+            cards = registry.cards_for_state(name)
+        if cards:
+            with self._pending_lock:
+                self._pending.update(cards)
+            self._wake.set()
+
+    def next_tick(self, now):
+        """Epoch second of the next time bucket among cards with `every`."""
+        ticks = [(now // c.every + 1) * c.every for c in registry.CARDS.values() if c.every]
+        return min(ticks) if ticks else now + 3600
+
+    def run(self, stop):
+        """Wake on file events or the next time bucket, refresh what's affected."""
+        while not stop.is_set():
+            now = self.clock()
+            tick = self.next_tick(now)
+            if self._wake.wait(max(tick - now, 0) + 0.05):
+                stop.wait(DEBOUNCE)
+                self._wake.clear()
+            with self._pending_lock:
+                names, self._pending = self._pending, set()
+            now = self.clock()
+            names |= {c.name for c in registry.CARDS.values() if c.every and now >= tick}
+            if not names:
+                continue
+            results = self.refresh(sorted(names))
+            done = [f"{n} {r['ms']}ms" for n, r in results.items() if not r.get("skipped")]
+            skipped = [n for n, r in results.items() if r.get("skipped")]
+            logging.info(f"refresh: rendered {', '.join(done) or '-'}; skipped {', '.join(skipped) or '-'}")
+
+    def start(self):
+        """Start the watchdog observer and the refresh thread. Returns the stop Event."""
+        import watchdog.events
+        import watchdog.observers
+
+        coord = self
+
+        class Handler(watchdog.events.FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory or event.event_type not in WRITE_EVENTS:
+                    return
+                coord.notify(getattr(event, "dest_path", "") or event.src_path)
+
+        os.makedirs(base.STATE_DIR, exist_ok=True)
+        self._observer = watchdog.observers.Observer()
+        self._observer.schedule(Handler(), path=base.STATE_DIR, recursive=False)
+        self._observer.schedule(Handler(), path=str(config.CONFIG_PATH.parent), recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        stop = threading.Event()
+        threading.Thread(target=self.run, args=(stop,), daemon=True, name="render-coordinator").start()
+        return stop
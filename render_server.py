@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# render_server.py - Long-lived card renderer behind a Unix socket
+#
+# Keeps PIL, fonts, the icon atlas and the config snapshot warm so a timer
+# tick costs one socket round trip instead of a fresh interpreter.
+#
+# Protocol: one request line per connection, one JSON reply line.
+#   render clock btc      -> {"ok": true, "results": {"clock": {"ok": true, "ms": 41.2}, ...}}
+#   render                -> render every card
+#   refresh [cards]       -> render only cards whose inputs changed (render_coordinator.py);
+#                            unchanged ones come back as {"ok": true, "ms": 0.0, "skipped": true}
+#   preview [cards]       -> write images/<card>.png from the last frame
+#                            {"ok": true, "results": {"clock": {"ok": true, "path": ".../clock.png"}}}
+#   stats                 -> per-card request counts and latency, frame writes avoided
+#   ping                  -> {"ok": true, "watch": true}  (watch: re-renders on config/state changes)
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+import json
+import time
+import socket
+import logging
+import socketserver
+import metrics
+
+SOCKET_PATH = os.path.expanduser("~/pidisplay/state/render.sock")
+CARD_NAMES = ("clock", "weather", "btc", "news")
+CLIENT_TIMEOUT = 30.0   # seconds; a cold weather render on the Pi is ~1-2 s
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+
+# ----------------------------------------------------------------------
+# Client side (used by render.py; must not import PIL/cards)
+# ----------------------------------------------------------------------
+def request(line, path=None, timeout=CLIENT_TIMEOUT):
+    """Send one request line, return the decoded reply.
+    Raises FileNotFoundError / ConnectionRefusedError if the server isn't
+    running, socket.timeout (an OSError) if it doesn't answer in time."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(path or SOCKET_PATH)
+        s.sendall(line.strip().encode() + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf)
+
+def render_remote(names=None, path=None):
+    return request("render " + " ".join(names or ()), path)
+
+def refresh_remote(names=None, path=None):
+    return request("refresh " + " ".join(names or ()), path)
+
+def preview_remote(names=None, path=None):
+    return request("preview " + " ".join(names or ()), path)
+
+# ----------------------------------------------------------------------
+# Server side
+# ----------------------------------------------------------------------
+def render_local(names=None, renderers=None):
+    """Render cards in this process. {name: {"ok", "ms"[, "error"]}}"""
+    if renderers is None:
+        import cards
+        renderers = {n: getattr(cards, n) for n in CARD_NAMES}
+    base = sys.modules.get("cards.base")   # per-phase timings, when real cards are loaded
+    results = {}
+    for name in names or renderers.keys():
+        fn = renderers.get(name)
+        if fn is None:
+            results[name] = {"ok": False, "ms": 0.0, "error": "unknown card"}
+            continue
+        if base is not None:
+            base.reset_phases()
+        t0 = time.perf_counter()
+        try:
+            fn()
+            ms = (time.perf_counter() - t0) * 1000
+            metrics.observe(f"render.card.{name}", ms)
+            if base is not None:
+                metrics.observe("render.draw", ms - sum(base.phase_ms.values()))
+            results[name] = {"ok": True, "ms": round(ms, 1)}
+        except Exception as e:
+            logging.exception(f"Render {name} failed")
+            results[name] = {"ok": False, "ms": round((time.perf_counter() - t0) * 1000, 1), "error": str(e)}
+    return results
+
+def preview_local(names=None):
+    """PNG previews of the named cards (default all) via base.save_png.
+    {name: {"ok", "path"|"error"}}"""
+    from cards import base
+    futures = {}
+    for name in names or CARD_NAMES:
+        try:
+            futures[name] = base.save_png(name)
+        except OSError as e:   # never rendered: no frame in memory, no .raw
+            futures[name] = e
+    results = {}
+    for name, fut in futures.items():
+        try:
+            if isinstance(fut, Exception):
+                raise fut
+            results[name] = {"ok": True, "path": fut.result(timeout=CLIENT_TIMEOUT)}
+        except Exception as e:
+            results[name] = {"ok": False, "error": str(e)}
+    return results
+
+class RenderServer(socketserver.UnixStreamServer):
+    """One request at a time: cards share base.OUT and module caches."""
+
+    def __init__(self, path, renderers, export_metrics=False, coordinator=None):
+        if os.path.exists(path):
+            os.unlink(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.renderers = renderers
+        self.export_metrics = export_metrics   # off for tests with fake renderers
+        self.coordinator = coordinator         # render_coordinator.Coordinator, or None
+        self.watching = False                  # coordinator's watcher thread running
+        self.stats = {}   # card -> {"count", "errors", "skipped", "total_ms", "max_ms", "last_ms"}
+        self.started = time.time()
+        super().__init__(path, RenderHandler)
+
+    def record(self, results):
+        for name, r in results.items():
+            st = self.stats.setdefault(name, {"count": 0, "errors": 0, "skipped": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+            if r.get("skipped"):
+                st["skipped"] += 1
+                continue
+            st["count"] += 1
+            st["errors"] += 0 if r["ok"] else 1
+            st["total_ms"] += r["ms"]
+            st["max_ms"] = max(st["max_ms"], r["ms"])
+            st["last_ms"] = r["ms"]
+
+    def export(self):
+        """Pick up metrics: config changes and export histograms when due."""
+        from cards import base
+        metrics.configure(base.get_config())
+        metrics.maybe_export()
+
+    def stats_report(self):
+        out = {}
+        for name, st in self.stats.items():
+            out[name] = dict(st, avg_ms=round(st["total_ms"] / st["count"], 1) if st["count"] else 0.0)
+        report = {"uptime_s": round(time.time() - self.started), "cards": out}
+        base = sys.modules.get("cards.base")
+        if base is not None:
+            report["saves"] = dict(base.save_stats)   # .raw writes done / avoided (same frame)
+        if self.coordinator is not None:
+            report["coordinator"] = self.coordinator.report()   # since first start, persisted
+        return report
+
+    def render(self, names, force=True):
+        if self.coordinator is not None:
+            return self.coordinator.refresh(names, force=force)
+        return render_local(names, self.renderers)
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        t0 = time.perf_counter()
+        line = self.rfile.readline(1024).decode(errors="replace").split()
+        cmd, args = (line[0].lower(), line[1:]) if line else ("", [])
+        if cmd in ("render", "refresh"):
+            results = self.server.render(args or None, force=cmd == "render")
+            self.server.record(results)
+            reply = {"ok": all(r["ok"] for r in results.values()), "results": results}
+        elif cmd == "preview":
+            results = preview_local(args or None)
+            reply = {"ok": all(r["ok"] for r in results.values()), "results": results}
+        elif cmd == "stats":
+            reply = {"ok": True, **self.server.stats_report()}
+        elif cmd == "ping":
+            reply = {"ok": True, "watch": self.server.watching}
+        else:
+            reply = {"ok": False, "error": f"unknown command: {cmd or '(empty)'}"}
+        reply["request_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+        if cmd in ("render", "refresh") and self.server.export_metrics:
+            self.server.export()
+        if cmd in ("render", "refresh"):
+            logging.info(f"{cmd} {' '.join(args) or 'all'}: " +
+                         ", ".join(f"{n} {'skipped' if r.get('skipped') else str(r['ms']) + 'ms'}"
+                                   f"{'' if r['ok'] else ' FAILED'}" for n, r in results.items()))
+
+def warm_up():
+    """Import cards and load config, atlas and common fonts before serving."""
+    import cards
+    from cards import base, atlas
+    t0 = time.perf_counter()
+    cfg = base.get_config()
+    metrics.configure(cfg)
+    atlas.get_atlas()
+    for size in set(cfg.fonts.values()):
+        base.font(size)
+    logging.info(f"Warm-up done in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    return {n: getattr(cards, n) for n in CARD_NAMES}
+
+def serve(path=None):
+    path = path or SOCKET_PATH
+    metrics.process = "render_server"
+    import render_coordinator
+    from cards import base
+    renderers = warm_up()
+
+    def render(names):
+        results = render_local(names, renderers)
+        server.export()   # watcher-driven renders don't pass through a request
+        return results
+
+    coordinator = render_coordinator.Coordinator(render)
+    server = RenderServer(path, renderers, export_metrics=True, coordinator=coordinator)
+    if (base.get_config().get("render") or {}).get("watch", True):
+        coordinator.start()
+        server.watching = True
+        logging.info("Watching state and config for changes")
+    logging.info(f"Render server listening on {path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+if __name__ == "__main__":
+    try:
+        serve(sys.argv[1] if len(sys.argv) > 1 else None)
+    except KeyboardInterrupt:
+        logging.info("Stopped by user")
@@ -0,0 +1,101 @@
+# rgb565.py - Shared 16bpp encoder for the SPI panel framebuffer
+#
+# Every path that turns pixels into /dev/fb1 bytes goes through here:
+# cards/base.atomic_save (.raw files), display_slideshow.composite_blit,
+# fb_show.py and the color probe scripts in tests/.
+#
+# .raw files, sprites and the live clock's glyphs are all DEFAULT_ORDER;
+# fbwriter.FramebufferWriter swaps red and blue on the way to a panel that
+# reports the other order (swap_rb), so frames and overlays always agree.
+
+import numpy as np
+
+ORDERS = ("rgb", "bgr")       # which channel lands in the high 5 bits
+ENDIANS = ("little", "big")   # byte order of each 16-bit pixel
+
+# The panel (fb_ili9486, bgr=1 in the overlay) takes RGB565 little-endian.
+DEFAULT_ORDER = "rgb"
+DEFAULT_ENDIAN = "little"
+
+def _check(order, endian):
+    if order not in ORDERS:
+        raise ValueError(f"Unknown pixel order: {order!r}")
+    if endian not in ENDIANS:
+        raise ValueError(f"Unknown endianness: {endian!r}")
+
+def pack_pixel(r, g, b, order=DEFAULT_ORDER):
+    """Pack one 8-bit RGB triple into a 16-bit int (5/6/5, truncating)."""
+    hi, lo = (r, b) if order == "rgb" else (b, r)
+    return ((hi & 0xF8) << 8) | ((g & 0xFC) << 3) | (lo >> 3)
+
+def pack_color(r, g, b, order=DEFAULT_ORDER, endian=DEFAULT_ENDIAN):
+    """Two framebuffer bytes for a solid color."""
+    _check(order, endian)
+    return pack_pixel(r, g, b, order).to_bytes(2, endian)
+
+def to_rgb565(pixels, order=DEFAULT_ORDER):
+    """HxWx3 (or x4) uint8 array -> HxW uint16 array in native byte order."""
+    a = np.asarray(pixels)
+    if a.ndim != 3 or a.shape[2] < 3:
+        raise ValueError(f"Expected HxWx3 pixels, got shape {a.shape}")
+    r = a[..., 0].astype(np.uint16)
+    g = a[..., 1].astype(np.uint16)
+    b = a[..., 2].astype(np.uint16)
+    hi, lo = (r, b) if order == "rgb" else (b, r)
+    out = (hi & 0xF8) << 8
+    out |= (g & 0xFC) << 3
+    out |= lo >> 3
+    return out
+
+def encode_array(pixels, order=DEFAULT_ORDER, endian=DEFAULT_ENDIAN):
+    """Like to_rgb565() but with an explicit byte order, ready for tobytes()."""
+    _check(order, endian)
+    packed = to_rgb565(pixels, order)
+    return packed.astype("<u2" if endian == "little" else ">u2", copy=False)
+
+def encode(img, order=DEFAULT_ORDER, endian=DEFAULT_ENDIAN):
+    """Encode a PIL image to raw framebuffer bytes (vectorized)."""
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return encode_array(np.asarray(img), order, endian).tobytes()
+
+def decode_array(data, w, h, order=DEFAULT_ORDER, endian=DEFAULT_ENDIAN):
+    """Framebuffer bytes -> HxWx3 uint8 array. Lossy the other way round:
+    the low bits come back as copies of the high ones (previews only)."""
+    _check(order, endian)
+    v = np.frombuffer(data, dtype="<u2" if endian == "little" else ">u2").reshape(h, w)
+    hi = (v >> 11) & 0x1F
+    g = (v >> 5) & 0x3F
+    lo = v & 0x1F
+    r, b = (hi, lo) if order == "rgb" else (lo, hi)
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    out[..., 0] = (r << 3) | (r >> 2)
+    out[..., 1] = (g << 2) | (g >> 4)
+    out[..., 2] = (b << 3) | (b >> 2)
+    return out
+
+def swap_rb(packed, out=None):
+    """Packed uint16 pixels with the 5-bit red and blue fields exchanged:
+    "rgb" <-> "bgr". out may be packed itself."""
+    v = np.asarray(packed, dtype=np.uint16)
+    ends = ((v & 0x1F) << 11) | (v >> 11)
+    res = np.bitwise_and(v, 0x07E0, out=out)
+    res |= ends
+    return res
+
+def encode_py(img, order=DEFAULT_ORDER, endian=DEFAULT_ENDIAN):
+    """Pure-Python reference encoder (the old per-pixel loop). Slow; used by
+    tests and tools/bench_rgb565.py to check encode() byte for byte."""
+    _check(order, endian)
+    data = bytearray()
+    w, h = img.size
+    pixels = img.convert("RGB").load()
+    for y in range(h):
+        for x in range(w):
+            r, g, b = pixels[x, y]
+            data.extend(pack_pixel(r, g, b, order).to_bytes(2, endian))
+    return bytes(data)
+
+def solid(r, g, b, w, h, order=DEFAULT_ORDER, endian=DEFAULT_ENDIAN):
+    """A full frame of one color (used by the color probes)."""
+    return pack_color(r, g, b, order, endian) * (w * h)
@@ -0,0 +1,102 @@
+# rss_stream.py - Incremental RSS 2.0 / Atom entry reader for the news fetchers
+#
+# feedparser builds the whole document (every content:encoded article body
+# included) before the fetcher looks at the first title. This feeds the
+# bytes to an XMLPullParser a chunk at a time and yields each <item>/<entry>
+# as soon as its end tag arrives, dropping the element afterwards. Feeds are
+# newest first, so once the fetcher's seen() says we are into entries the
+# store already has, the rest of the document is never parsed: in steady
+# state that is the channel header plus an item or two.
+#
+#   for e in rss_stream.entries(resp.content, seen=lambda e: ..., limit=25):
+#       e.title, e.link, e.id, e.published
+#
+# Raises xml.etree.ElementTree.ParseError on malformed XML; the fetchers
+# fall back to feedparser, which is more forgiving.
+
+import html
+import xml.etree.ElementTree as ET
+
+CHUNK = 8192
+ENTRY_TAGS = ("item", "entry")
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+class Entry:
+    __slots__ = ("title", "link", "id", "published")
+
+    def __init__(self, title, link, id, published):
+        self.title = title
+        self.link = link
+        self.id = id
+        self.published = published
+
+    def __repr__(self):
+        return f"Entry({self.title!r})"
+
+def _entry(elem):
+    """Entry from an <item> (RSS) or <entry> (Atom) element."""
+    title = link = guid = published = None
+    for child in elem:
+        name = _local(child.tag)
+        if name == "title":
+            title = html.unescape((child.text or "").strip())
+        elif name == "link":
+            href = child.get("href")
+            if href is None:                                     # RSS: <link>url</link>
+                link = link or (child.text or "").strip() or None
+            elif child.get("rel", "alternate") == "alternate":   # Atom: <link rel=alternate href=url/>
+                link = href
+        elif name in ("guid", "id"):
+            guid = (child.text or "").strip() or None
+        elif name in ("pubDate", "published", "updated") and published is None:
+            published = (child.text or "").strip() or None
+    return Entry(title or "", link, guid or link, published)
+
+def _chunks(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for i in range(0, len(view), CHUNK):
+            yield view[i:i + CHUNK]
+    else:   # file-like
+        while True:
+            chunk = source.read(CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+def entries(source, seen=None, stop_after=1, limit=None):
+    """Yield Entry objects from feed bytes (or a binary file) in document order.
+
+    seen(entry) -> True marks an entry the caller already has: it is not
+    yielded, and after stop_after of them in a row parsing stops. limit caps
+    how many entries are yielded."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack, depth, run, n = [], None, 0, 0
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                if depth is None and _local(elem.tag) in ENTRY_TAGS:
+                    depth = len(stack)
+                continue
+            stack.pop()
+            if depth is None or len(stack) != depth - 1:
+                continue
+            depth = None
+            e = _entry(elem)
+            if stack:
+                stack[-1].remove(elem)   # keep memory flat on long feeds
+            if seen is not None and seen(e):
+                run += 1
+                if run >= stop_after:
+                    return
+                continue
+            run = 0
+            yield e
+            n += 1
+            if limit is not None and n >= limit:
+                return
+    parser.close()
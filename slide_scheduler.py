@@ -0,0 +1,44 @@
+# slide_scheduler.py - Deadline-based wait for the slideshow main loop
+#
+# The loop used to sleep for the whole card interval and look at input in
+# between. Now it blocks on the one event queue everything posts to (touch
+# gestures, frame_ready from the images/ watcher, config from the reloader)
+# with a timeout that ends when the current slide is due to advance, so an
+# event is handled as soon as it arrives.
+#
+#   slides = SlideScheduler(event_queue)
+#   slides.start(interval)          # slide shown: next one due in `interval` s
+#   event = slides.wait()           # an event, or None when the slide is due
+#   slides.hold()                   # paused/menu: wait for events only
+
+import time
+import queue
+
+class SlideScheduler:
+    __slots__ = ("events", "clock", "deadline")
+
+    def __init__(self, events, clock=time.monotonic):
+        self.events = events      # queue.Queue of event dicts
+        self.clock = clock
+        self.deadline = None      # clock() time the slide advances; None: held
+
+    def start(self, interval):
+        self.deadline = self.clock() + interval
+
+    def hold(self):
+        self.deadline = None
+
+    @property
+    def remaining(self):
+        """Seconds until the slide is due (None while held)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.clock())
+
+    def wait(self):
+        """Next event, or None once the deadline passes (clears it)."""
+        try:
+            return self.events.get(timeout=self.remaining)
+        except queue.Empty:
+            self.deadline = None
+            return None
@@ -0,0 +1,5 @@
+# tests/conftest.py - make the repo root importable (rgb565, config, cards, ...)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -0,0 +1,51 @@
+# test_atlas.py — pre-scaled icon atlas cache file
+import os
+
+from PIL import Image
+
+from cards import atlas
+
+ICONS = os.path.join(os.path.dirname(__file__), "..", "icons")
+PADDING = {"hero_sz": 100, "icon_sz_tiny": 20, "news_icon_sz": 24}
+
+def test_icons_match_direct_lanczos_resize(tmp_path):
+    path = str(tmp_path / "icons.atlas")
+    a = atlas.load(path, ICONS, PADDING)
+    sun = a.get(os.path.join("weather", "base", "sun.png"), 100)
+    expected = Image.open(os.path.join(ICONS, "weather", "base", "sun.png")).convert("RGBA") \
+        .resize((100, 100), Image.Resampling.LANCZOS)
+    assert sun.tobytes() == expected.tobytes()
+    assert a.get(os.path.join("weather", "layers", "tiny_layers", "tiny_rain.png"), 20).size == (20, 20)
+    assert a.get("fox.png", 24).size == (24, 24)
+    assert a.get(os.path.join("menu", "menu.png"), 24).size == (24, 24)
+
+def test_cache_file_reused_until_sizes_change(tmp_path):
+    path = str(tmp_path / "icons.atlas")
+    first = atlas.load(path, ICONS, PADDING)
+    mtime = os.stat(path).st_mtime_ns
+    again = atlas.load(path, ICONS, PADDING)
+    assert again.sig == first.sig
+    assert os.stat(path).st_mtime_ns == mtime
+
+    bigger = atlas.load(path, ICONS, dict(PADDING, hero_sz=120))
+    assert bigger.sig != first.sig
+    assert bigger.get(os.path.join("weather", "base", "sun.png"), 120).size == (120, 120)
+    assert atlas.read(path, first.sig) is None
+
+def test_process_atlas_picks_up_new_icons(tmp_path, monkeypatch):
+    import shutil
+    import config
+    from cards import base
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.yaml")
+    config.save_default()
+    icons = tmp_path / "icons"
+    shutil.copytree(ICONS, icons)
+    monkeypatch.setattr(base, "ICON_DIR", str(icons))
+    monkeypatch.setattr(atlas, "ATLAS_PATH", str(tmp_path / "icons.atlas"))
+    monkeypatch.setattr(atlas, "RECHECK_SEC", 0.0)
+    monkeypatch.setattr(atlas, "_current", None)
+    before = atlas.get_atlas()
+    assert atlas.icon(str(icons / "menu" / "new.png"), 24) is None
+    Image.new("RGBA", (48, 48), (255, 0, 0, 255)).save(icons / "menu" / "new.png")
+    assert atlas.icon(str(icons / "menu" / "new.png"), 24).size == (24, 24)
+    assert atlas.get_atlas() is not before
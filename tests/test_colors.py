@@ -1,40 +1,24 @@
 #!/usr/bin/env python3
 # test_colors.py — RGB565/BGR565 probe
 import os
-import struct
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import rgb565
+import framebuffer
 
-FB = "/dev/fb1"
-W, H = 480, 320
-FB_SIZE = W * H * 2  # 307200 bytes
+FB = framebuffer.DEFAULT_DEVICE
 
 def fill_screen(r, g, b, invert=False, order='BGR'):
-    """Fill /dev/fb1 with solid color using BGR565 or RGB565."""
-    data = bytearray()
-    # Scale 0-255 → 5/6/5 bits
-    r5 = ((r * 31 + 127) // 255) & 0x1F
-    g6 = ((g * 63 + 127) // 255) & 0x3F
-    b5 = ((b * 31 + 127) // 255) & 0x1F
+    """Fill the framebuffer with solid color using BGR565 or RGB565."""
+    pixel = rgb565.pack_pixel(r, g, b, order=order.lower())
 
-    # Optional inversion
+    # Optional inversion (same as 31-r5 / 63-g6 / 31-b5)
     if invert:
-        r5 = 31 - r5
-        g6 = 63 - g6
-        b5 = 31 - b5
+        pixel ^= 0xFFFF
 
-    # Pack in BGR or RGB order
-    if order == 'BGR':
-        pixel = (b5 << 11) | (g6 << 5) | r5
-    else:  # RGB
-        pixel = (r5 << 11) | (g6 << 5) | b5
-
-    # Repeat pixel for entire screen
-    pixel_bytes = struct.pack("<H", pixel)
-    data.extend(pixel_bytes * (W * H))
-
-    # Write
-    with open(FB, "r+b", buffering=0) as f:
-        f.seek(0)
-        f.write(data)
+    # Deliberately ignores the driver's pixel order: this probe is how we find it
+    with framebuffer.open_framebuffer(FB) as fb:
+        fb.array[...] = pixel
 
 # === TEST MATRIX ===
 tests = [
@@ -1,20 +1,15 @@
 #!/usr/bin/env python3
 # test_colors2.py — FULL COLOR WHEEL PROBE
 import os
-import struct
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import framebuffer
 
-FB = "/dev/fb1"
-W, H = 480, 320
-FB_SIZE = W * H * 2  # 307200 bytes
+FB = framebuffer.DEFAULT_DEVICE
 
 def fill_screen(r, g, b):
-    r5 = (r >> 3) & 0x1F
-    g6 = (g >> 2) & 0x3F
-    b5 = (b >> 3) & 0x1F
-    pixel = (r5 << 11) | (g6 << 5) | b5  # RGB565
-    data = struct.pack("<H", pixel) * (480*320)
-    with open("/dev/fb1", "r+b") as f:
-        f.write(data)
+    with framebuffer.open_framebuffer(FB) as fb:
+        fb.fill(r, g, b)  # RGB565 in the driver's reported pixel order
 
 # === FULL COLOR WHEEL ===
 colors = [
@@ -0,0 +1,50 @@
+# test_config.py — mtime/size-validated, read-only config snapshots
+import os
+
+import pytest
+
+import config
+
+YAML = """colors:
+  bg: [12, 12, 12]
+fonts:
+  header_size: 19
+padding:
+  timestamp_x: 12
+intervals:
+  clock: 5
+"""
+
+@pytest.fixture
+def cfg_path(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text(YAML)
+    monkeypatch.setattr(config, "CONFIG_PATH", path)
+    return path
+
+def test_parsed_once_while_unchanged(cfg_path):
+    before = config.parse_count()
+    snaps = [config.snapshot() for _ in range(5)]
+    assert config.parse_count() == before + 1
+    assert all(s is snaps[0] for s in snaps)
+
+def test_reparsed_when_file_changes(cfg_path):
+    first = config.snapshot()
+    cfg_path.write_text(YAML.replace("header_size: 19", "header_size: 22"))
+    st = os.stat(cfg_path)
+    os.utime(cfg_path, ns=(st.st_atime_ns, first.stamp[0] + 1_000_000))
+    second = config.snapshot()
+    assert second is not first
+    assert first.fonts["header_size"] == 19
+    assert second.fonts["header_size"] == 22
+
+def test_precomputed_values_and_read_only(cfg_path):
+    snap = config.snapshot()
+    assert snap.colors["bg"] == (12, 12, 12)
+    assert snap["colors"]["bg"] == (12, 12, 12)
+    assert snap.padding["timestamp_x"] == 12
+    assert snap["intervals"].get("clock") == 5
+    with pytest.raises(TypeError):
+        snap["colors"]["bg"] = (0, 0, 0)
+    with pytest.raises(AttributeError):
+        snap.colors = {}
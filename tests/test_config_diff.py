@@ -0,0 +1,61 @@
+# test_config_diff.py — a config edit maps to the cards and display subsystems that read it
+import copy
+
+import pytest
+import yaml
+
+import config
+import config_diff
+from cards import registry
+
+@pytest.fixture
+def default(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_PATH", config.Path(tmp_path) / "config.yaml")
+    config.save_default()
+    with open(config.CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+def impact(raw, edit):
+    new = copy.deepcopy(raw)
+    edit(new)
+    return config_diff.diff(config.ConfigSnapshot("a", 1, raw), config.ConfigSnapshot("a", 2, new))
+
+def test_slideshow_edits_need_no_render(default):
+    i = impact(default, lambda d: d["intervals"].update(news=30))
+    assert i.keys == ["intervals.news"] and i.cards == [] and i.subsystems == {"slideshow"}
+    i = impact(default, lambda d: d["cards"].update(order=["news", "clock", "weather", "btc"]))
+    assert i.cards == [] and i.subsystems == {"slideshow"}
+    i = impact(default, lambda d: d["cards"]["enabled"].update(btc=False))
+    assert i.keys == ["cards.enabled"] and i.cards == []
+    assert impact(default, lambda d: d["transitions"].update(fps=20)).subsystems == {"transitions"}
+
+@pytest.mark.parametrize("section, key, cards, clock", [
+    ("colors", "bg", ["clock", "weather", "btc", "news"], True),
+    ("colors", "day_bg", ["weather"], False),
+    ("colors", "time_stamp", ["weather", "btc", "news"], True),
+    ("fonts", "btc_price_size", ["btc"], False),
+    ("fonts", "header_size", ["weather", "btc", "news"], False),
+    ("fonts", "clock_time_size", ["clock"], True),
+    ("padding", "hero_x", ["weather"], False),
+    ("padding", "timestamp_x", ["weather", "btc", "news"], True),
+    ("padding", "news_gap", [], False),   # not read by the news card (yet)
+])
+def test_styling_keys_map_to_cards(default, section, key, cards, clock):
+    i = impact(default, lambda d: d[section].update({key: [7, 7, 7] if section == "colors" else 7}))
+    assert i.keys == [f"{section}.{key}"]
+    assert i.cards == cards
+    assert ("live_clock" in i.subsystems) == clock
+
+def test_sources_and_new_sections(default):
+    i = impact(default, lambda d: d["sources"]["news"].update(fox=False))
+    assert i.keys == ["sources.news"] and i.cards == ["news"]
+    i = impact(default, lambda d: d.update(weather={"units": "metric"}))
+    assert i.keys == ["weather"] and i.cards == [] and i.subsystems == set()
+    assert impact(default, lambda d: None) == config_diff.Impact([], [], set())
+
+def test_registry_declares_only_default_keys(default):
+    """Every dotted key a card declares exists in the defaults (catches typos)."""
+    for card in registry.CARDS.values():
+        for key in card.config:
+            section, _, sub = key.partition(".")
+            assert section in default and (not sub or sub in default[section]), (card.name, key)
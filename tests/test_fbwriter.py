@@ -0,0 +1,77 @@
+# test_fbwriter.py — tile-diff writer against a regular file standing in for /dev/fb1
+import numpy as np
+import pytest
+
+from fbwriter import FramebufferWriter
+
+W, H = 480, 320
+
+@pytest.fixture
+def fb_path(tmp_path):
+    path = tmp_path / "fb1"
+    path.write_bytes(b"\xff" * (W * H * 2))
+    return str(path)
+
+def _frame(fill=0x0841):
+    return np.full((H, W), fill, dtype="<u2")
+
+def test_first_frame_written_in_full(fb_path):
+    with FramebufferWriter(fb_path) as fb:
+        st = fb.write(_frame().tobytes())
+    assert st.bytes_written == W * H * 2
+    assert open(fb_path, "rb").read() == _frame().tobytes()
+
+def test_identical_frame_writes_nothing(fb_path):
+    with FramebufferWriter(fb_path) as fb:
+        fb.write(_frame())
+        st = fb.write(_frame())
+    assert st.bytes_written == 0 and st.spans == 0
+
+def test_small_change_writes_only_its_rows(fb_path):
+    frame = _frame()
+    with FramebufferWriter(fb_path) as fb:
+        fb.write(frame)
+        frame[100:110, 300:340] = 0xF800     # e.g. clock digits
+        st = fb.write(frame)
+    # rows 96..112 (one 16-row tile band), full width
+    assert st.spans == 1
+    assert st.bytes_written == 16 * W * 2
+    assert st.tiles_changed == 2
+    assert open(fb_path, "rb").read() == frame.tobytes()
+
+def test_clipped_rows_and_separate_spans(fb_path):
+    frame = _frame()
+    with FramebufferWriter(fb_path, full_rows=False) as fb:
+        fb.write(frame)
+        frame[0:5, 0:10] = 1
+        frame[300:320, 470:480] = 2
+        st = fb.write(frame)
+    assert st.spans == 2
+    # 16 rows x 32 px tile + 32 rows (two bands: 288-320) x 32 px tile
+    assert st.bytes_written == (16 * 32 + 32 * 32) * 2
+    assert open(fb_path, "rb").read() == frame.tobytes()
+
+def test_invalidate_forces_full_write(fb_path):
+    with FramebufferWriter(fb_path) as fb:
+        fb.write(_frame())
+        fb.invalidate()
+        assert fb.write(_frame()).bytes_written == W * H * 2
+
+def test_bgr_panel_gets_card_and_sprite_in_its_order(tmp_path):
+    from PIL import Image
+    import framebuffer
+    import overlay
+    import rgb565
+    card = Image.new("RGB", (W, H), (200, 40, 10))
+    frame = np.frombuffer(rgb565.encode(card), dtype="<u2").reshape(H, W).copy()  # as atomic_save writes it
+    overlay.blend(frame, overlay.Sprite(Image.new("RGBA", (24, 24), (0, 0, 255, 255))), 4, 7)
+    with framebuffer.FakeFramebuffer(str(tmp_path / "fb1"), order="bgr") as dev:
+        with FramebufferWriter(dev) as fb:
+            fb.write(frame)
+            fb.patch(100, 100, np.full((4, 4), rgb565.pack_pixel(255, 0, 0), dtype="<u2"))
+            shown = fb.read()
+        panel = dev.read()
+    assert panel[0, 0] == rgb565.pack_pixel(200, 40, 10, "bgr")
+    assert panel[10, 10] == rgb565.pack_pixel(0, 0, 255, "bgr")       # sprite matches the card
+    assert panel[101, 101] == rgb565.pack_pixel(255, 0, 0, "bgr")     # patches too
+    assert shown[0, 0] == rgb565.pack_pixel(200, 40, 10)              # read() is back in .raw order
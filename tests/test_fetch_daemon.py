@@ -0,0 +1,195 @@
+# test_fetch_daemon.py — shared keep-alive pool, concurrency cap and coalescing scheduler
+# against a local HTTP/1.1 stand-in server
+import asyncio
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetch_btc
+import fetch_daemon
+import http_cache
+import http_client
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"     # keep-alive
+    routes = {}
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            path = self.path.split("?")[0]
+            if path == "/slow":
+                time.sleep(0.1)
+            if path in ("/moved", "/loop"):
+                self.send_response(301 if path == "/moved" else 302)
+                self.send_header("Location", "/gzip" if path == "/moved" else "/loop")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if path == "/headers":
+                cls.routes[path] = [[k, v] for k, v in self.headers.items()]
+            if path == "/chunked":
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for part in (b"hello ", b"chunked ", b"world"):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                self.wfile.write(b"0\r\n\r\n")
+                return
+            body = json.dumps(cls.routes.get(path, {"path": self.path})).encode()
+            self.send_response(200 if path in cls.routes or path == "/slow" or path == "/echo" else 404)
+            if path == "/gzip":
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path / "http_cache"))
+
+@pytest.fixture
+def server():
+    StandIn.routes = {"/gzip": {"zipped": True}}
+    StandIn.max_in_flight = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    t = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+def run(coro_fn, limit=3):
+    return http_client.run_once(coro_fn, limit=limit)
+
+def test_keep_alive_reuses_one_connection(server):
+    async def go(http):
+        a = (await http.get(server + "/echo", params={"q": "1"})).json()
+        b = (await http.get(server + "/gzip")).json()
+        c = (await http.get(server + "/chunked")).content
+        return a, b, c, http.stats()
+    a, b, c, st = run(go)
+    assert a["path"] == "/echo?q=1" and b == {"zipped": True} and c == b"hello chunked world"
+    assert st["requests"] == 3 and st["connections_opened"] == 1 and st["reused"] == 2
+
+def test_http_errors_raise_like_requests(server):
+    async def go(http):
+        return await http.get(server + "/missing")
+    resp = run(go)
+    assert resp.status == 404
+    with pytest.raises(http_client.HTTPError):
+        resp.raise_for_status()
+
+def test_redirect_is_followed(server):
+    async def go(http):
+        resp = await http.get(server + "/moved")
+        loop = await http.get(server + "/loop")
+        return resp, loop, http.stats()
+    resp, loop, st = run(go)
+    assert resp.status == 200 and resp.json() == {"zipped": True}
+    assert resp.url == server + "/gzip"
+    assert st["redirects"] == 1 + http_client.MAX_REDIRECTS and st["connections_opened"] == 1
+    assert loop.status == 302
+    with pytest.raises(http_client.HTTPError):
+        loop.raise_for_status()
+
+def test_caller_headers_replace_defaults(server):
+    async def go(http):
+        return (await http.get(server + "/headers", headers={"user-agent": "test/1", "Accept": "x/y"})).json()
+    sent = [(k.lower(), v) for k, v in run(go)]
+    assert [v for k, v in sent if k == "user-agent"] == ["test/1"]
+    assert ("accept", "x/y") in sent
+
+def test_global_concurrency_limit(server):
+    async def go(http):
+        await asyncio.gather(*(http.get(server + "/slow") for _ in range(6)))
+    run(go, limit=2)
+    assert StandIn.max_in_flight == 2
+
+def test_btc_source_against_stand_in(server, tmp_path, monkeypatch):
+    StandIn.routes.update({"/spot": {"data": {"amount": "100000.0"}},
+                           "/hist": {"data": {"prices": [{"price": "99000"}, {"price": "95000"}]}}})
+    monkeypatch.setattr(fetch_btc, "SPOT_URL", server + "/spot")
+    monkeypatch.setattr(fetch_btc, "HIST_URL", server + "/hist")
+    monkeypatch.setattr(fetch_btc, "OUT", str(tmp_path / "btc.json"))
+    monkeypatch.setattr(fetch_btc, "TMP", str(tmp_path / "btc.json.tmp"))
+    fetch_btc.fetch_coinbase_btc()
+    data = json.load(open(tmp_path / "btc.json"))
+    assert data["price"] == 100000.0 and data["chg_24h"] == 5.26
+
+def test_failed_source_is_reported_not_rendered(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_btc, "SPOT_URL", server + "/missing")
+    monkeypatch.setattr(fetch_btc, "OUT", str(tmp_path / "btc.json"))
+    monkeypatch.setattr(fetch_btc, "TMP", str(tmp_path / "btc.json.tmp"))
+    monkeypatch.setattr(fetch_daemon.metrics, "maybe_export", lambda: False)
+    rendered = []
+    cfg = {"fetch": {"intervals": {"btc": 30, "weather": 0, "geo": 0, "fox": 0, "breitbart": 0}}}
+    async def go(http):
+        await fetch_daemon.run(lambda: cfg, {"btc": fetch_btc.fetch}, rendered.append,
+                               clock=lambda: 0.0, max_batches=1, pool=http)
+    run(go)
+    assert rendered == []
+    assert "error" in json.load(open(tmp_path / "btc.json"))   # fallback still written
+
+@pytest.mark.parametrize("error, local", [(ConnectionRefusedError, True), (TimeoutError, False)])
+def test_render_request_falls_back_only_without_server(monkeypatch, error, local):
+    import render_server
+    def remote(cards):
+        raise error("stand-in")
+    rendered = []
+    monkeypatch.setattr(render_server, "refresh_remote", remote)
+    monkeypatch.setattr(render_server, "render_local",
+                        lambda cards: rendered.extend(cards) or {c: {"ok": True, "ms": 0.0} for c in cards})
+    fetch_daemon.request_render(["btc"])
+    assert rendered == (["btc"] if local else [])
+
+def test_scheduler_coalesces_sources_due_close_together():
+    s = fetch_daemon.Scheduler({"btc": 30, "fox": 180, "breitbart": 185, "weather": 600}, coalesce=20, now=0)
+    assert s.due(0) == ["breitbart", "btc", "fox", "weather"]
+    for n in s.due(0):
+        s.done(n, 0)
+    assert s.due(29) == []
+    assert s.due(30) == ["btc"]
+    s.done("btc", 170)           # btc next due at 200
+    assert s.due(180) == ["breitbart", "btc", "fox"]   # 185 and 200 pulled forward
+
+def test_weather_waits_for_geo_in_same_batch():
+    assert fetch_daemon.stages(["btc", "geo", "weather"]) == [["btc", "geo"], ["weather"]]
+    assert fetch_daemon.stages(["weather"]) == [["weather"]]
+
+def test_daemon_runs_batches_on_shared_pool(server, monkeypatch):
+    monkeypatch.setattr(fetch_daemon.metrics, "maybe_export", lambda: False)
+    calls, rendered = [], []
+    def fetcher(name):
+        async def fetch(http):
+            calls.append(name)
+            (await http.get(server + "/echo")).raise_for_status()
+        return fetch
+    cfg = {"fetch": {"intervals": {"btc": 30, "weather": 0, "geo": 0, "fox": 180, "breitbart": 180}}}
+    clock = [0.0]
+    async def go(http):
+        await fetch_daemon.run(lambda: cfg, {n: fetcher(n) for n in fetch_daemon.SOURCES},
+                               rendered.append, clock=lambda: clock[0], max_batches=1, pool=http)
+        return http.stats()
+    st = run(go)
+    assert sorted(calls) == ["breitbart", "btc", "fox"]
+    assert rendered == [["btc", "news"]]
+    assert st["requests"] == 3 and st["connections_opened"] <= 3
@@ -0,0 +1,22 @@
+# test_fonts.py — font registry and measurement cache in cards/base
+from PIL import Image, ImageDraw
+
+from cards import base
+
+def test_font_loaded_once_per_face_and_size():
+    before = base.font_cache_info()["fonts"]
+    a = base.font(23)
+    b = base.font(23)
+    after = base.font_cache_info()["fonts"]
+    assert a is b
+    assert after["hits"] - before["hits"] >= 1
+    assert base.font(23, face="mono") is not a
+
+def test_text_size_matches_uncached_textbbox():
+    d = ImageDraw.Draw(Image.new("RGB", (base.W, base.H)))
+    txt = "Sunset 5:42 PM"
+    l, t, r, b = d.textbbox((0, 0), txt, font=base.font(20))
+    assert base.text_size(d, txt, 20) == (r - l, b - t)
+    before = base.font_cache_info()["metrics"]["hits"]
+    base.text_size(d, txt, 20)
+    assert base.font_cache_info()["metrics"]["hits"] == before + 1
@@ -0,0 +1,29 @@
+# test_frame_cache.py — frames rebuilt only when the renderer replaces the file
+import os
+
+from frame_cache import FrameCache
+
+def _replace(path, data):
+    tmp = str(path) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)    # same as cards/base.atomic_save
+
+def test_hit_until_file_replaced(tmp_path):
+    png = tmp_path / "btc.png"
+    _replace(png, b"v1")
+    builds = []
+    build = lambda p: builds.append(open(p, "rb").read()) or builds[-1]
+    cache = FrameCache()
+
+    assert cache.get("btc", "normal", str(png), build) == (b"v1", False)
+    assert cache.get("btc", "normal", str(png), build) == (b"v1", True)
+    assert cache.get("btc", "pressed", str(png), build) == (b"v1", False)
+    assert len(builds) == 2
+
+    _replace(png, b"v2!")
+    assert cache.get("btc", "normal", str(png), build) == (b"v2!", False)
+    # the pressed variant of the old render is gone too
+    assert cache.get("btc", "pressed", str(png), build) == (b"v2!", False)
+    assert cache.hits == 1 and cache.misses == 4
+    assert cache.hit_rate == 0.2
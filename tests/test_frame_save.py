@@ -0,0 +1,72 @@
+# test_frame_save.py — atomic_save writes a .raw only when the frame changed; PNGs are lazy
+import os
+
+import pytest
+import yaml
+from PIL import Image
+
+import config
+import rgb565
+from cards import base
+
+@pytest.fixture
+def out(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_PATH", config.Path(tmp_path) / "config.yaml")
+    config.save_default()
+    monkeypatch.setattr(base, "OUT", str(tmp_path))
+    monkeypatch.setattr(base, "save_stats", dict.fromkeys(base.save_stats, 0))
+    monkeypatch.setattr(base, "_saved", {})
+    monkeypatch.setattr(base, "_last_image", {})
+    return tmp_path
+
+def frame(color):
+    return Image.new("RGB", (base.W, base.H), color)
+
+def set_render(**kw):
+    with open(config.CONFIG_PATH) as f:
+        doc = yaml.safe_load(f)
+    doc["render"].update(kw)
+    with open(config.CONFIG_PATH, "w") as f:
+        yaml.dump(doc, f)
+    st = os.stat(config.CONFIG_PATH)
+    os.utime(config.CONFIG_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+def test_same_frame_is_not_rewritten(out):
+    raw = base.atomic_save(frame((10, 20, 30)), "btc")
+    ino = os.stat(raw).st_ino
+    base.atomic_save(frame((10, 20, 30)), "btc")
+    assert os.stat(raw).st_ino == ino   # no tmp + rename
+    base.atomic_save(frame((200, 20, 30)), "btc")
+    assert os.stat(raw).st_ino != ino
+    size = base.W * base.H * 2
+    assert base.save_stats["writes"] == 2
+    assert base.save_stats["writes_avoided"] == 1
+    assert base.save_stats["bytes_saved"] == size
+    assert not (out / "btc.png").exists()   # previews are off by default
+
+def test_checks_disk_after_restart_and_outside_writes(out):
+    raw = base.atomic_save(frame((10, 20, 30)), "btc")
+    base._saved.clear()   # new process: hash what's on disk
+    base.atomic_save(frame((10, 20, 30)), "btc")
+    assert base.save_stats["writes_avoided"] == 1
+    with open(raw, "wb") as f:   # someone else replaced the frame
+        f.write(rgb565.encode(frame((0, 0, 0))))
+    base.atomic_save(frame((10, 20, 30)), "btc")
+    with open(raw, "rb") as f:
+        assert f.read() == rgb565.encode(frame((10, 20, 30)))
+
+def test_png_in_background_when_enabled(out):
+    set_render(png=True, png_compress=1)
+    base.atomic_save(frame((10, 20, 30)), "clock")
+    base.save_png("clock").result()   # queued after the one atomic_save started
+    with Image.open(out / "clock.png") as im:
+        assert im.getpixel((0, 0)) == (10, 20, 30)
+
+def test_preview_on_demand_from_raw(out):
+    base.atomic_save(frame((255, 0, 132)), "news")   # survives 565 + bit replication
+    base._last_image.clear()
+    path = base.save_png("news").result()
+    with Image.open(path) as im:
+        assert im.getpixel((5, 5)) == (255, 0, 132)
+    with pytest.raises(OSError):
+        base.save_png("weather")   # never rendered
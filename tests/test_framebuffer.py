@@ -0,0 +1,61 @@
+# test_framebuffer.py — sysfs geometry discovery and the file-backed fake device
+import numpy as np
+from PIL import Image
+
+import framebuffer
+import rgb565
+
+def _fake_sysfs(root, name="fb1", size="480,320", bpp="16", stride="960"):
+    d = root / name
+    d.mkdir(parents=True)
+    (d / "virtual_size").write_text(size + "\n")
+    (d / "bits_per_pixel").write_text(bpp + "\n")
+    if stride is not None:
+        (d / "stride").write_text(stride + "\n")
+    return str(root)
+
+def test_geometry_from_sysfs(tmp_path):
+    root = _fake_sysfs(tmp_path / "graphics", size="320,240", stride="704")
+    g = framebuffer.read_geometry("/dev/fb1", root)
+    assert g == framebuffer.Geometry(320, 240, 704, 16, "rgb")
+
+def test_stride_falls_back_to_width(tmp_path):
+    root = _fake_sysfs(tmp_path / "graphics", stride=None)
+    assert framebuffer.read_geometry("/dev/fb1", root).stride == 960
+
+def test_fake_device_is_zero_copy_view(tmp_path):
+    path = str(tmp_path / "fb1.raw")
+    with framebuffer.FakeFramebuffer(path) as fb:
+        fb.fill(255, 0, 0)
+        fb.array[0, 0] = 0x001F
+        fb.flush()
+        assert fb.frame_bytes == 480 * 320 * 2
+    data = np.fromfile(path, dtype="<u2").reshape(320, 480)
+    assert data[0, 0] == 0x001F
+    assert data[319, 479] == 0xF800
+
+def test_padded_stride_keeps_rows_aligned(tmp_path):
+    path = str(tmp_path / "fb.raw")
+    img = Image.new("RGB", (8, 4), (0, 0, 255))
+    with framebuffer.FakeFramebuffer(path, 8, 4, stride=32) as fb:
+        fb.show(img)
+    raw = open(path, "rb").read()
+    assert len(raw) == 32 * 4
+    row = rgb565.encode(img)[:16]
+    for y in range(4):
+        assert raw[y * 32:y * 32 + 16] == row
+        assert raw[y * 32 + 16:(y + 1) * 32] == b"\0" * 16
+
+def test_open_framebuffer_uses_fake_for_plain_files(tmp_path):
+    path = tmp_path / "fb.raw"
+    with framebuffer.open_framebuffer(str(path)) as fb:
+        assert isinstance(fb, framebuffer.FakeFramebuffer)
+        assert (fb.width, fb.height) == (480, 320)
+
+def test_visible_size_comes_from_the_driver(tmp_path, monkeypatch):
+    # double-buffered panel: sysfs virtual_size is twice the screen height
+    root = _fake_sysfs(tmp_path / "graphics", size="480,640")
+    info = (480, 320, 480, 640, 0, 0, 16, 0, 0, 5, 0, 5, 6, 0, 11, 5, 0, 0, 0, 0)
+    monkeypatch.setattr(framebuffer, "screen_info", lambda fd: info)
+    g = framebuffer.read_geometry("/dev/fb1", root, fd=3)
+    assert (g.width, g.height, g.stride, g.order) == (480, 320, 960, "bgr")
@@ -0,0 +1,110 @@
+# test_http_cache.py — conditional GET (ETag / Last-Modified), max-age, per-source counters
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_cache
+import http_client
+
+FEED = b"<rss><channel><item><title>Hello</title></item></channel></rss>" * 20
+
+class Origin(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = []
+
+    def do_GET(self):
+        type(self).hits.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/lastmod" and self.headers.get("If-Modified-Since") == "Mon, 10 Nov 2025 18:00:00 GMT":
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        elif self.path == "/lastmod":
+            self.send_header("Last-Modified", "Mon, 10 Nov 2025 18:00:00 GMT")
+        elif self.path == "/maxage":
+            self.send_header("Cache-Control", "public, max-age=60")
+        elif self.path == "/nostore":
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("ETag", '"x"')
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def origin():
+    Origin.hits = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Origin)
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+class Clock:
+    now = 1000.0
+    def __call__(self):
+        return self.now
+
+def fetch_twice(url, cache, advance=0.0):
+    async def go():
+        async with http_client.ConnectionPool() as pool:
+            http = cache.client(pool, "fox")
+            first = await http.get(url)
+            cache.clock.now += advance
+            second = await http.get(url)
+            if second.unchanged:
+                http.parse_avoided()
+            return first, second
+    return asyncio.run(go())
+
+@pytest.mark.parametrize("path", ["/etag", "/lastmod"])
+def test_revalidation_returns_cached_body_on_304(origin, tmp_path, path):
+    cache = http_cache.HTTPCache(str(tmp_path), clock=Clock())
+    first, second = fetch_twice(origin + path, cache)
+    assert first.from_cache is None and second.from_cache == "304"
+    assert second.content == FEED and second.status == 200
+    assert len(Origin.hits) == 2 and (Origin.hits[1][1] or Origin.hits[1][2])
+    st = cache.stats["fox"]
+    assert st["not_modified"] == 1 and st["parses_avoided"] == 1
+    assert st["bytes_saved"] > len(FEED) - 200
+
+def test_max_age_skips_the_request(origin, tmp_path):
+    cache = http_cache.HTTPCache(str(tmp_path), clock=Clock())
+    first, second = fetch_twice(origin + "/maxage", cache, advance=30)
+    assert second.from_cache == "fresh" and second.content == FEED
+    assert len(Origin.hits) == 1
+    assert cache.stats["fox"]["fresh"] == 1 and cache.stats["fox"]["network"] == 1
+
+def test_expired_max_age_goes_to_network(origin, tmp_path):
+    cache = http_cache.HTTPCache(str(tmp_path), clock=Clock())
+    first, second = fetch_twice(origin + "/maxage", cache, advance=61)
+    assert second.from_cache is None and len(Origin.hits) == 2
+
+def test_no_store_is_not_cached(origin, tmp_path):
+    cache = http_cache.HTTPCache(str(tmp_path), clock=Clock())
+    first, second = fetch_twice(origin + "/nostore", cache)
+    assert second.from_cache is None and Origin.hits[1][1] is None
+
+def test_stats_survive_restart(origin, tmp_path):
+    cache = http_cache.HTTPCache(str(tmp_path), clock=Clock())
+    fetch_twice(origin + "/etag", cache)
+    cache.save_stats()
+    assert http_cache.HTTPCache(str(tmp_path)).stats["fox"]["not_modified"] == 1
+
+def test_max_age_parsing():
+    assert http_cache.max_age({"cache-control": "public, max-age=300", "age": "100"}) == 200
+    assert http_cache.max_age({"cache-control": "no-cache, max-age=300"}) == 0
+    assert http_cache.max_age({}) == 0
@@ -0,0 +1,171 @@
+# test_input_handler.py — recorded evdev byte streams replayed through decoder, tracker and gestures
+import struct
+
+import pytest
+
+import input_handler as ih
+from input_handler import EV_SYN, EV_KEY, EV_ABS, SYN_REPORT, BTN_TOUCH, ABS_X, ABS_Y
+from input_handler import ABS_MT_SLOT, ABS_MT_TRACKING_ID, ABS_MT_POSITION_X, ABS_MT_POSITION_Y
+
+FMT32, FMT64 = "<iiHHi", "<qqHHi"   # armhf (16 bytes) / aarch64 (24 bytes) input_event
+
+def raw_for(x, y):
+    """Panel coordinates that calibrate to screen (x, y) (inverse of ih.calibrate)."""
+    ax = x * (ih.X_MAX - ih.X_MIN) / ih.W + ih.X_MIN
+    ay = y * (ih.Y_MAX - ih.Y_MIN) / ih.H + ih.Y_MIN
+    return round(ay), round(4095 - ax)
+
+class Recording:
+    """Builds the byte stream a touchscreen would produce."""
+    def __init__(self, fmt=FMT32, t=1000.0):
+        self.fmt, self.t, self.data = fmt, t, bytearray()
+
+    def ev(self, ev_type, code, value):
+        sec = int(self.t)
+        self.data += struct.pack(self.fmt, sec, round((self.t - sec) * 1e6), ev_type, code, value)
+
+    def syn(self, dt=0.0):
+        self.ev(EV_SYN, SYN_REPORT, 0)
+        self.t += dt
+
+    # single touch (ADS7846): ABS_X/Y + BTN_TOUCH
+    def st_path(self, points, dt, hold=0.0):
+        for i, (x, y) in enumerate(points):
+            rx, ry = raw_for(x, y)
+            self.ev(EV_ABS, ABS_X, rx)
+            self.ev(EV_ABS, ABS_Y, ry)
+            if i == 0:
+                self.ev(EV_KEY, BTN_TOUCH, 1)
+            self.syn(dt)
+        self.t += hold
+        self.ev(EV_KEY, BTN_TOUCH, 0)
+        self.syn()
+
+    # protocol B
+    def mt(self, slot, tid=None, x=None, y=None):
+        self.ev(EV_ABS, ABS_MT_SLOT, slot)
+        if tid is not None:
+            self.ev(EV_ABS, ABS_MT_TRACKING_ID, tid)
+        if x is not None:
+            rx, ry = raw_for(x, y)
+            self.ev(EV_ABS, ABS_MT_POSITION_X, rx)
+            self.ev(EV_ABS, ABS_MT_POSITION_Y, ry)
+
+def types(gestures):
+    return [g.type for g in gestures]
+
+def line(x0, y0, x1, y1, n):
+    return [(x0 + (x1 - x0) * i / (n - 1), y0 + (y1 - y0) * i / (n - 1)) for i in range(n)]
+
+def test_event_size_follows_platform_long():
+    assert ih.EVENT_SIZE == struct.calcsize("l") * 2 + 8
+    assert struct.calcsize(FMT32) == 16 and struct.calcsize(FMT64) == 24
+
+def test_decoder_batches_and_keeps_partial_events():
+    rec = Recording()
+    rec.st_path([(100, 100)], 0.01)
+    dec = ih.EventDecoder(FMT32)
+    data = bytes(rec.data)
+    first = list(dec.feed(data[:21]))   # one event + 5 bytes of the next
+    rest = list(dec.feed(data[21:]))
+    assert len(first) == 1 and len(first) + len(rest) == len(data) // 16
+    assert first[0][2:] == (EV_ABS, ABS_X, raw_for(100, 100)[0])
+
+@pytest.mark.parametrize("fmt", [FMT32, FMT64])
+def test_single_touch_tap_in_zone(fmt):
+    rec = Recording(fmt)
+    rec.st_path([(400, 200), (402, 201), (401, 199)], 0.03)
+    (g,) = ih.replay(bytes(rec.data), fmt)
+    assert g.type == "tap" and g.zone == "right" and g.vertical_zone == "bottom"
+    assert abs(g["cal_x"] - 401) <= 1 and g.get("ts") == pytest.approx(rec.t)
+
+def test_bounce_is_ignored():
+    rec = Recording()
+    rec.st_path([(200, 100)], 0.01)
+    assert ih.replay(bytes(rec.data), FMT32) == []
+
+def test_fast_swipe_vs_slow_drag():
+    fast = Recording()
+    fast.st_path(line(300, 160, 220, 165, 5), 0.02)   # 80 px in 80 ms
+    (g,) = ih.replay(bytes(fast.data), FMT32)
+    assert g.type == "swipe_left" and g.velocity > ih.SWIPE_MIN_SPEED and g.zone == "center"
+
+    slow = Recording()
+    slow.st_path(line(300, 160, 220, 165, 20), 0.05)  # same 80 px over a second
+    assert ih.replay(bytes(slow.data), FMT32) == []
+
+    long_drag = Recording()
+    long_drag.st_path(line(100, 60, 110, 260, 30), 0.05)   # 200 px slowly, downwards
+    assert types(ih.replay(bytes(long_drag.data), FMT32)) == ["swipe_down"]
+
+def test_long_press_fires_while_held():
+    rec = Recording()
+    rec.st_path([(240, 160)] * 30, 0.05)   # panel keeps reporting while held
+    gestures = ih.replay(bytes(rec.data), FMT32)
+    assert types(gestures) == ["long_press"]
+    assert gestures[0].zone == "center" and gestures[0].duration == pytest.approx(1.0, abs=0.06)
+
+def test_long_press_from_tick_and_quiet_release():
+    m = ih.GestureMachine()
+    assert m.frame(10.0, {0: (240, 160)}) == []
+    assert m.tick(10.5) == []
+    assert types(m.tick(11.1)) == ["long_press"]
+    assert m.frame(12.0, {}) == []   # already reported
+    q = ih.GestureMachine()            # no ticks at all: decided on release
+    q.frame(10.0, {0: (240, 160)})
+    assert types(q.frame(11.5, {})) == ["long_press"]
+
+def test_single_touch_double_tap_is_two_finger():
+    rec = Recording()
+    rec.st_path([(240, 160)], 0.08)
+    rec.t += 0.1
+    rec.st_path([(240, 160)], 0.08)
+    assert types(ih.replay(bytes(rec.data), FMT32)) == ["tap", "two_finger_tap"]
+
+def mt_two_fingers(a0, b0, a1, b1, steps=6, dt=0.03):
+    rec = Recording()
+    rec.mt(0, 7, *a0)
+    rec.mt(1, 8, *b0)
+    rec.syn(dt)
+    for (ax, ay), (bx, by) in list(zip(line(*a0, *a1, steps), line(*b0, *b1, steps)))[1:]:
+        rec.mt(0, None, ax, ay)
+        rec.mt(1, None, bx, by)
+        rec.syn(dt)
+    rec.mt(0, -1)
+    rec.syn(dt)
+    rec.mt(1, -1)
+    rec.syn()
+    return bytes(rec.data)
+
+def test_mt_two_finger_tap():
+    (g,) = ih.replay(mt_two_fingers((200, 150), (280, 150), (201, 151), (279, 150)), FMT32)
+    assert g.type == "two_finger_tap" and g.fingers == 2 and g.zone == "center"
+
+def test_mt_pinch_in_and_out():
+    (g,) = ih.replay(mt_two_fingers((150, 160), (330, 160), (220, 160), (260, 160)), FMT32)
+    assert g.type == "pinch_in" and g.scale < 0.5
+    (g,) = ih.replay(mt_two_fingers((220, 160), (260, 160), (120, 160), (360, 160)), FMT32)
+    assert g.type == "pinch_out" and g.scale > 2
+
+def test_mt_two_finger_swipe():
+    (g,) = ih.replay(mt_two_fingers((300, 100), (300, 180), (180, 100), (180, 180)), FMT32)
+    assert g.type == "two_finger_swipe_left"
+
+def test_mt_single_finger_swipe_ignores_legacy_emulation():
+    rec = Recording()
+    for i, (x, y) in enumerate(line(100, 160, 220, 160, 5)):
+        rec.mt(0, 3 if i == 0 else None, x, y)
+        rec.ev(EV_ABS, ABS_X, 0)             # the kernel's single-touch emulation
+        rec.ev(EV_KEY, BTN_TOUCH, 1)
+        rec.syn(0.02)
+    rec.mt(0, -1)
+    rec.ev(EV_KEY, BTN_TOUCH, 0)
+    rec.syn()
+    assert types(ih.replay(bytes(rec.data), FMT32)) == ["swipe_right"]
+
+def test_gesture_is_slotted_and_dict_like():
+    g = ih.Gesture("tap", 1.0, 10, 300)
+    assert not hasattr(g, "__dict__")
+    assert g["zone"] == "left" and g.get("vertical_zone") == "bottom" and g.get("nope", 5) == 5
+    with pytest.raises(KeyError):
+        g["nope"]
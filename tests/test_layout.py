@@ -0,0 +1,41 @@
+# test_layout.py — pixel-width wrapping and ellipsis fitting in cards/layout
+import json
+import os
+
+from cards import base, layout
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "news.json")
+MAX_W = 404
+
+def test_fixture_headlines_fit_width_and_line_count():
+    fnt = base.font(19)
+    for it in json.load(open(FIXTURE))["items"]:
+        lines = layout.wrap(it["title"], fnt, MAX_W, 2)
+        assert 1 <= len(lines) <= 2
+        for line in lines:
+            assert fnt.getlength(line) <= MAX_W
+        if not lines[-1].endswith(layout.ELLIPSIS):
+            assert " ".join(lines).split() == it["title"].split()
+
+def test_ellipsis_is_the_longest_fitting_prefix():
+    fnt = base.font(19)
+    text = "Negotiators scramble to reach a deal before the Thanksgiving recess"
+    out = layout.fit_ellipsis(fnt, text, 200)
+    assert out.endswith(layout.ELLIPSIS)
+    assert fnt.getlength(out) <= 200
+    # Pixel fit, not a fixed character cut: within a couple of glyphs of the edge
+    assert fnt.getlength(out) > 200 - fnt.getlength("MM")
+
+def test_overlong_single_word_is_truncated():
+    fnt = base.font(19)
+    lines = layout.wrap("Supercalifragilisticexpialidocious", fnt, 120, 2)
+    assert len(lines) == 1
+    assert lines[0].endswith(layout.ELLIPSIS)
+    assert fnt.getlength(lines[0]) <= 120
+
+def test_wrap_is_cached():
+    fnt = base.font(19)
+    layout.wrap("Cached headline", fnt, MAX_W, 2)
+    hits = layout.layout_cache_info()["lines"]["hits"]
+    layout.wrap("Cached headline", fnt, MAX_W, 2)
+    assert layout.layout_cache_info()["lines"]["hits"] == hits + 1
@@ -0,0 +1,62 @@
+# test_live_clock.py — 1 Hz clock patches only its bounding box, only on change
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import live_clock
+import config
+from fbwriter import FramebufferWriter
+
+W, H = 480, 320
+
+@pytest.fixture
+def cfg(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.yaml")
+    config.save_default()
+    return config.snapshot()
+
+@pytest.fixture
+def writer(tmp_path):
+    path = tmp_path / "fb1"
+    path.write_bytes(b"\x00" * (W * H * 2))
+    with FramebufferWriter(str(path)) as fb:
+        fb.write(np.zeros((H, W), dtype="<u2"))
+        yield fb
+
+def test_clock_text_matches_card_format():
+    assert live_clock.clock_text(datetime(2025, 11, 10, 16, 7)) == "4:07 PM"
+    assert live_clock.clock_text(datetime(2025, 11, 10, 0, 5)) == "12:05 AM"
+    assert live_clock.clock_text(datetime(2025, 11, 10, 9, 5, 3), seconds=True) == "9:05:03 AM"
+
+@pytest.mark.parametrize("placement", ["card", "corner"])
+def test_tick_patches_box_only_when_text_changes(cfg, writer, placement):
+    clk = live_clock.LiveClock(cfg, placement)
+    box = clk.box_w * clk.box_h * 2
+    assert clk.tick(writer, datetime(2025, 11, 10, 16, 7, 0)) == box
+    assert clk.tick(writer, datetime(2025, 11, 10, 16, 7, 1)) == 0
+    assert clk.tick(writer, datetime(2025, 11, 10, 16, 7, 2), force=True) == box
+    assert clk.tick(writer, datetime(2025, 11, 10, 16, 8, 0)) == box
+
+def test_boxes_stay_clear_of_other_lines(cfg):
+    card = live_clock.LiveClock(cfg, "card")
+    assert 0 <= card.box_y and card.box_y + card.box_h <= 160   # date line starts at y=160
+    corner = live_clock.LiveClock(cfg, "corner")
+    assert corner.box_x >= W // 2 and corner.box_x + corner.box_w <= W
+    assert corner.box_y + corner.box_h <= 40
+
+def test_corner_box_covers_the_card_timestamp(cfg):
+    from cards import base
+    corner = live_clock.LiveClock(cfg, "corner")
+    size, pad = cfg.fonts["timestamp_size"], cfg.padding["timestamp_x"]
+    stamp = datetime(2025, 9, 30, 12, 59).strftime(base.TIMESTAMP_FMT)
+    sw, _ = base.text_size(None, stamp, size)
+    assert corner.box_x <= W - sw - pad and corner.box_x + corner.box_w == W
+    block = corner.render("12:59 PM")
+    assert (block[:, -pad + 1:] == corner.bg).all()   # text stays right-aligned at the padding
+
+def test_render_draws_ink_on_background(cfg):
+    clk = live_clock.LiveClock(cfg, "card")
+    block = clk.render("12:59 PM")
+    assert block.shape == (clk.box_h, clk.box_w)
+    assert (block != clk.bg).any() and (block[:, 0] == clk.bg).all()
@@ -0,0 +1,61 @@
+# test_metrics.py — span histograms, config switch and the JSON / Prometheus exporters
+import json
+
+import pytest
+
+import metrics
+
+@pytest.fixture(autouse=True)
+def clean(monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr(metrics, "enabled", True)
+    monkeypatch.setattr(metrics, "_cfg", None)
+    yield
+    metrics.reset()
+
+def test_histogram_buckets_are_cumulative():
+    for ms in (0.2, 3, 3, 40, 9000):
+        metrics.observe("x", ms)
+    h = metrics.snapshot()["x"]
+    assert h["count"] == 5 and h["max_ms"] == 9000
+    assert h["buckets"]["0.5"] == 1 and h["buckets"]["5"] == 3
+    assert h["buckets"]["50"] == 4 and h["buckets"]["+Inf"] == 5
+
+def test_span_records_and_disabled_span_is_noop():
+    with metrics.span("work"):
+        pass
+    assert metrics.snapshot()["work"]["count"] == 1
+    metrics.configure({"metrics": {"enabled": False}})
+    with metrics.span("work"):
+        pass
+    metrics.observe("work", 1.0)
+    assert metrics.snapshot()["work"]["count"] == 1
+    assert not metrics.maybe_export()
+
+def test_export_merges_processes(tmp_path, monkeypatch):
+    j, p = str(tmp_path / "metrics.json"), str(tmp_path / "metrics.prom")
+    monkeypatch.setattr(metrics, "process", "render_server")
+    metrics.observe("render.png", 12.5)
+    metrics.export(j, p)
+    monkeypatch.setattr(metrics, "process", "display")
+    metrics.reset()
+    metrics.observe("display.fb_write", 0.8)
+    metrics.export(j, p)
+
+    doc = json.load(open(j))
+    assert set(doc["processes"]) == {"render_server", "display"}
+    assert doc["processes"]["render_server"]["spans"]["render.png"]["sum_ms"] == 12.5
+    prom = open(p).read()
+    assert "# TYPE pidisplay_span_seconds histogram" in prom
+    assert 'pidisplay_span_seconds_bucket{process="display",span="display.fb_write",le="0.001"} 1' in prom
+    assert 'pidisplay_span_seconds_sum{process="render_server",span="render.png"} 0.012500' in prom
+
+def test_maybe_export_respects_interval(monkeypatch):
+    calls = []
+    monkeypatch.setattr(metrics, "export", lambda: calls.append(1))
+    monkeypatch.setattr(metrics, "_last_export", 0.0)
+    monkeypatch.setattr(metrics, "export_interval", 60)
+    assert metrics.maybe_export(now=1000.0)
+    assert not metrics.maybe_export(now=1030.0)
+    assert metrics.maybe_export(now=1061.0)
+    assert len(calls) == 2
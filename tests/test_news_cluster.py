@@ -0,0 +1,69 @@
+# test_news_cluster.py — LSH clustering agrees with the pairwise 0.85 Jaccard rule
+import json
+import os
+import sqlite3
+
+import news_cluster
+import news_store
+from cards.news import cluster_news
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "news.json")
+
+def fixture_items():
+    with open(FIXTURE) as f:
+        return json.load(f)["items"]
+
+def summary(reps):
+    return [(r["id"], r["count"]) for r in reps]
+
+def test_threshold_edges():
+    c = news_cluster.Clusterer()
+    base = "one two three four five six seven eight nine ten eleven"
+    a = c.add("a", base.upper() + "!")
+    assert c.add("b", base + " twelve") == a                  # 11/12 = 0.92
+    assert c.add("c", base.replace("eleven", "zzz")) != a     # 10/12 = 0.83
+    assert c.add("d", "") not in (a, "c")                     # no tokens: never similar
+
+def test_in_memory_matches_pairwise_on_fixture():
+    items = fixture_items()
+    ref = news_cluster.pairwise(items, top_n=len(items))
+    assert any(r["count"] > 1 for r in ref)
+    assert summary(cluster_news(items, top_n=len(items))) == summary(ref)
+
+def test_store_matches_pairwise_on_fixture(tmp_path):
+    items = fixture_items()
+    ref = news_cluster.pairwise(items, top_n=len(items))
+    # arrival order: oldest first, a feed poll at a time
+    arrival = sorted(items, key=lambda it: it["ts"])
+    with news_store.NewsStore(str(tmp_path / "news.db")) as store:
+        for i in range(0, len(arrival), 25):
+            store.add(arrival[i:i + 25])
+        recent = store.recent(["fox", "breitbart"], since=0)
+    assert summary(cluster_news(recent, top_n=len(items))) == summary(ref)
+
+def test_assignments_persist_and_prune(tmp_path):
+    path = str(tmp_path / "news.db")
+    old = {"id": "1", "source": "fox", "title": "Storm hits the coast tonight", "ts": "2025-11-09T10:00:00Z"}
+    new = {"id": "2", "source": "breitbart", "title": "STORM HITS THE COAST TONIGHT", "ts": "2025-11-10T17:00:00Z"}
+    with news_store.NewsStore(path) as store:
+        store.add([old])
+    with news_store.NewsStore(path) as store:
+        store.add([new])
+        assert [it["cluster"] for it in store.recent(["fox", "breitbart"], since=0)] == ["1", "1"]
+        store.prune(now=news_store.to_epoch("2025-11-10T18:00:00Z"))
+        assert store.db.execute("SELECT COUNT(*) FROM lsh").fetchone()[0] == news_cluster.BANDS
+        store.prune(max_age=0, now=news_store.to_epoch("2025-11-11T00:00:00Z"))
+        assert store.db.execute("SELECT COUNT(*) FROM clusters").fetchone()[0] == 0
+        assert store.db.execute("SELECT COUNT(*) FROM lsh").fetchone()[0] == 0
+
+def test_v1_store_is_clustered_on_upgrade(tmp_path):
+    path = str(tmp_path / "news.db")
+    db = sqlite3.connect(path)
+    db.executescript(news_store.SCHEMA)
+    rows = [("1", "fox", "Storm hits coast", None, 1, "x", ""), ("2", "fox", "storm hits coast!", None, 2, "y", "")]
+    db.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    db.execute("PRAGMA user_version=1")
+    db.commit()
+    db.close()
+    with news_store.NewsStore(path) as store:
+        assert {it["cluster"] for it in store.recent(["fox"], since=0)} == {"1"}
@@ -0,0 +1,67 @@
+# test_news_store.py — dedup, 24 h / source queries, pruning, legacy import, concurrent writers
+import json
+import multiprocessing
+
+import pytest
+
+import news_store
+
+NOW = 1762797600  # 2025-11-10T18:00:00Z
+
+def item(i, source="fox", age=0):
+    return {"id": f"{source}-{i}", "source": source, "title": f"Headline {i}",
+            "url": f"https://example.com/{i}", "ts": news_store.to_iso(NOW - age), "tags": []}
+
+@pytest.fixture
+def store(tmp_path):
+    with news_store.NewsStore(str(tmp_path / "news.db")) as s:
+        yield s
+
+def test_wal_and_indexes(store):
+    assert store.db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = " ".join(r[-1] for r in store.db.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM items WHERE source IN ('fox') AND ts >= 0"))
+    assert "items_source_ts" in plan
+
+def test_insert_or_ignore(store):
+    assert store.add([item(1), item(2)]) == 2
+    assert store.add([item(2), item(3)]) == 1
+    assert store.count() == 3
+    assert store.known(["fox-1", "fox-9"]) == {"fox-1"}
+
+def test_recent_filters_source_and_age(store):
+    store.add([item(1, age=60), item(2, age=30 * 3600), item(3, "breitbart", age=120), item(4, "ap")])
+    got = store.recent(["fox", "breitbart"], now=NOW)
+    assert [it["id"] for it in got] == ["fox-1", "breitbart-3"]   # newest first
+    assert got[0]["ts"] == "2025-11-10T17:59:00Z"
+    assert store.recent([], now=NOW) == []
+
+def test_prune(store):
+    store.add([item(1, age=60), item(2, age=25 * 3600)])
+    assert store.prune(now=NOW) == 1
+    assert store.known(["fox-1", "fox-2"]) == {"fox-1"}
+
+def test_imports_legacy_json_once(tmp_path):
+    (tmp_path / "news.json").write_text(json.dumps({"items": [item(1), item(2), {"id": "bad"}]}))
+    with news_store.NewsStore(str(tmp_path / "news.db")) as s:
+        assert s.count() == 2
+        s.prune(max_age=0, now=NOW + 1)
+    with news_store.NewsStore(str(tmp_path / "news.db")) as s:
+        assert s.count() == 0   # not re-imported after pruning
+
+def _writer(path, source, n):
+    with news_store.NewsStore(path) as s:
+        for i in range(n):
+            s.add([item(i, source), item(i, "shared")])
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    path = str(tmp_path / "news.db")
+    news_store.NewsStore(path).close()
+    procs = [multiprocessing.Process(target=_writer, args=(path, src, 50)) for src in ("fox", "breitbart")]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+    with news_store.NewsStore(path) as s:
+        assert s.count("fox") == s.count("breitbart") == s.count("shared") == 50
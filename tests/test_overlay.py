@@ -0,0 +1,53 @@
+# test_overlay.py — RGB565-domain sprite blending vs PIL paste + re-encode
+import os
+
+import numpy as np
+from PIL import Image
+
+import overlay
+import rgb565
+
+ICONS = os.path.join(os.path.dirname(__file__), "..", "icons")
+
+def _card(w=64, h=48):
+    img = Image.new("RGB", (w, h))
+    img.putdata([((x * 5) % 256, (y * 7) % 256, ((x + y) * 3) % 256) for y in range(h) for x in range(w)])
+    return img
+
+def _menu_icon():
+    return Image.open(os.path.join(ICONS, "menu", "menu.png")).convert("RGBA").resize((24, 24))
+
+def test_matches_pil_paste_within_one_lsb():
+    card, icon = _card(), _menu_icon()
+    frame = rgb565.to_rgb565(np.asarray(card))
+    overlay.blend(frame, overlay.Sprite(icon), 4, 7)
+
+    pasted = card.copy()
+    pasted.paste(icon, (4, 7), icon)
+    expected = rgb565.to_rgb565(np.asarray(pasted))
+    for got, want in zip(overlay.split(frame), overlay.split(expected)):
+        assert np.abs(got.astype(int) - want.astype(int)).max() <= 1
+
+def test_opaque_and_transparent_pixels_exact():
+    sprite_img = Image.new("RGBA", (2, 1))
+    sprite_img.putdata([(255, 0, 0, 255), (0, 255, 0, 0)])
+    frame = np.full((4, 4), rgb565.pack_pixel(0, 0, 255), dtype=np.uint16)
+    rect = overlay.blend(frame, overlay.Sprite(sprite_img), 1, 1)
+    assert rect == (1, 2, 1, 3)
+    assert frame[1, 1] == rgb565.pack_pixel(255, 0, 0)
+    assert frame[1, 2] == rgb565.pack_pixel(0, 0, 255)
+
+def test_blend_over_clean_copy_and_clipping():
+    card = rgb565.to_rgb565(np.asarray(_card()))
+    shown = card.copy()
+    pressed = overlay.Sprite(Image.new("RGBA", (24, 24), (255, 255, 255, 128)))
+    normal = overlay.Sprite(Image.new("RGBA", (24, 24), (0, 0, 0, 128)))
+    overlay.blend(shown, pressed, 4, 7)
+    overlay.blend(shown, normal, 4, 7, under=card)
+    again = card.copy()
+    overlay.blend(again, normal, 4, 7)
+    assert np.array_equal(shown, again)     # no trace of the pressed sprite
+
+    rect = overlay.blend(card, normal, 50, 40)  # hangs off the 64x48 frame
+    assert rect == (40, 48, 50, 64)
+    assert overlay.blend(card, normal, 100, 100) is None
@@ -0,0 +1,149 @@
+# test_render_coordinator.py — renders only when a card's declared inputs change
+import json
+import os
+import threading
+import time
+
+import pytest
+import yaml
+
+import config
+import render_coordinator
+import render_server
+from cards import base, registry
+
+class Clock:
+    def __init__(self, t=1762797600.0):   # on a 15 min boundary
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_PATH", config.Path(tmp_path) / "config.yaml")
+    config.save_default()
+    state, out = tmp_path / "state", tmp_path / "images"
+    state.mkdir()
+    out.mkdir()
+    monkeypatch.setattr(base, "STATE_DIR", str(state))
+    monkeypatch.setattr(base, "OUT", str(out))
+    calls = []
+
+    def render(names):
+        calls.append(sorted(names))
+        for n in names:
+            (out / f"{n}.raw").write_bytes(b"x")
+        return {n: {"ok": True, "ms": 1.0} for n in names}
+
+    clock = Clock()
+    coord = render_coordinator.Coordinator(render, clock=clock)
+    return coord, calls, clock, state
+
+def write_state(state, name, doc):
+    (state / name).write_text(json.dumps(doc))
+
+def edit_config(fn):
+    with open(config.CONFIG_PATH) as f:
+        doc = yaml.safe_load(f)
+    fn(doc)
+    with open(config.CONFIG_PATH, "w") as f:
+        yaml.dump(doc, f)
+    st = os.stat(config.CONFIG_PATH)   # mtime granularity: make sure the snapshot sees it
+    os.utime(config.CONFIG_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+def test_first_pass_renders_then_skips(env):
+    coord, calls, _, state = env
+    write_state(state, "btc.json", {"price": 1})
+    coord.refresh()
+    assert calls == [sorted(registry.CARDS)]
+    results = coord.refresh()
+    assert calls == [sorted(registry.CARDS)]
+    assert all(r["skipped"] for r in results.values())
+    assert coord.report()["skipped"] == len(registry.CARDS)
+
+def test_same_bytes_skip_new_bytes_render(env):
+    coord, calls, _, state = env
+    write_state(state, "btc.json", {"price": 1})
+    coord.refresh()
+    write_state(state, "btc.json", {"price": 1})   # rewritten, identical
+    coord.refresh()
+    write_state(state, "btc.json", {"price": 2})
+    coord.refresh()
+    assert calls[1:] == [["btc"]]
+
+def test_time_buckets(env):
+    coord, calls, clock, _ = env
+    coord.refresh()
+    clock.t += 61
+    coord.refresh()
+    clock.t += 900
+    coord.refresh()
+    assert calls[1:] == [["clock"], ["clock", "weather"]]
+
+def test_config_sections(env):
+    coord, calls, _, _ = env
+    coord.refresh()
+    edit_config(lambda d: d["intervals"].update(btc=99))
+    coord.refresh()
+    edit_config(lambda d: d["sources"]["news"].update(fox=False))
+    coord.refresh()
+    edit_config(lambda d: d["colors"].update(bg=[1, 2, 3]))
+    coord.refresh()
+    assert calls[1:] == [["news"], sorted(registry.CARDS)]
+
+def test_failed_render_backs_off_and_missing_output_rerendered(env):
+    coord, calls, clock, state = env
+    coord.render = lambda names: {n: {"ok": False, "ms": 0.0, "error": "x"} for n in names}
+    coord.refresh(["btc"])
+    coord.render = lambda names: calls.append(names) or {n: {"ok": True, "ms": 1.0} for n in names}
+    assert coord.refresh(["btc"])["btc"]["skipped"]   # same inputs as the failure
+    clock.t += render_coordinator.RETRY_FAILED
+    coord.refresh(["btc"])
+    assert calls == [["btc"]]
+    coord.refresh(["btc"])   # still no btc.raw on disk
+    assert calls == [["btc"], ["btc"]]
+
+def test_fingerprints_and_counts_persist(env):
+    coord, calls, clock, _ = env
+    coord.refresh()
+    again = render_coordinator.Coordinator(coord.render, clock=clock)
+    again.refresh()
+    assert len(calls) == 1
+    assert again.report()["rendered"] == len(registry.CARDS)
+    assert again.report()["cards"]["btc"]["skipped"] == 1
+
+def test_watcher_refreshes_on_state_write(env):
+    coord, calls, clock, state = env
+    clock.t = time.time()
+    coord.clock = time.time
+    coord.refresh()
+    stop = coord.start()
+    try:
+        time.sleep(0.2)
+        write_state(state, "btc.json", {"price": 3})
+        deadline = time.monotonic() + 5
+        while ["btc"] not in calls and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert ["btc"] in calls
+    finally:
+        stop.set()
+        coord._observer.stop()
+
+def test_server_refresh_command(env, tmp_path):
+    coord, calls, _, _ = env
+    path = str(tmp_path / "render.sock")
+    srv = render_server.RenderServer(path, {}, coordinator=coord)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        render_server.refresh_remote(None, path)
+        reply = render_server.refresh_remote(["btc", "clock"], path)
+        assert reply["ok"] and all(r["skipped"] for r in reply["results"].values())
+        render_server.render_remote(["btc"], path)   # plain render always renders
+        assert calls[1:] == [["btc"]]
+        stats = render_server.request("stats", path)
+        assert stats["cards"]["btc"]["skipped"] == 1
+        assert stats["coordinator"]["rendered"] == len(registry.CARDS) + 1
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,39 @@
+# test_render_golden.py — every card rendered headless from fixture state vs golden hashes
+# (tools/render_harness.py --update regenerates them after a deliberate visual change)
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+import render_harness
+from cards import base
+import config
+
+pytestmark = pytest.mark.skipif(not os.path.exists(base.FONT_FACES["sans"]), reason="DejaVu fonts not installed")
+
+@pytest.fixture(scope="module")
+def results():
+    return render_harness.run(runs=1)
+
+def test_frames_match_goldens(results):
+    # raw only: PNG bytes also depend on the zlib build
+    assert render_harness.compare(results, render_harness.load_golden(), kinds=("raw",)) == []
+
+def test_cases_render_distinct_frames(results):
+    assert results["full"]["weather"]["raw"] != results["night"]["weather"]["raw"]
+    assert results["full"]["news"]["raw"] != results["offline"]["news"]["raw"]
+    assert results["offline"]["news"]["raw"] == results["empty"]["news"]["raw"]   # both "No news data"
+    assert results["full"]["clock"]["raw"] == results["empty"]["clock"]["raw"]    # frozen clock
+
+def test_phase_timings_recorded(results):
+    ms = results["full"]["weather"]["ms"]
+    assert set(ms) == set(render_harness.PHASES) | {"total", "png"}
+    assert ms["png"] > 0 and ms["encode"] > 0 and ms["state"] > 0
+    assert abs(sum(ms[p] for p in render_harness.PHASES) - ms["total"]) < 0.1
+
+def test_sandbox_restores_paths(tmp_path):
+    out, state, cfg_path = base.OUT, base.STATE_DIR, config.CONFIG_PATH
+    with render_harness.sandbox(str(tmp_path), "empty"):
+        assert base.OUT.startswith(str(tmp_path))
+    assert (base.OUT, base.STATE_DIR, config.CONFIG_PATH) == (out, state, cfg_path)
@@ -0,0 +1,90 @@
+# test_render_server.py — Unix-socket render API with fake card renderers
+import os
+import threading
+
+import pytest
+
+import render_server
+
+@pytest.fixture
+def server(tmp_path):
+    calls = []
+    def ok():
+        calls.append("clock")
+    def boom():
+        raise RuntimeError("no data")
+    path = str(tmp_path / "render.sock")
+    srv = render_server.RenderServer(path, {"clock": ok, "btc": boom})
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield path, calls
+    srv.shutdown()
+    srv.server_close()
+
+def test_render_reports_per_card_latency(server):
+    path, calls = server
+    reply = render_server.render_remote(["clock"], path)
+    assert reply["ok"] and calls == ["clock"]
+    assert reply["results"]["clock"]["ok"]
+    assert reply["results"]["clock"]["ms"] >= 0
+
+def test_render_errors_and_stats(server):
+    path, _ = server
+    reply = render_server.render_remote(["clock", "btc", "nope"], path)
+    assert not reply["ok"]
+    assert reply["results"]["btc"]["error"] == "no data"
+    assert reply["results"]["nope"]["error"] == "unknown card"
+    stats = render_server.request("stats", path)
+    assert stats["cards"]["clock"]["count"] == 1
+    assert stats["cards"]["btc"]["errors"] == 1
+
+def test_client_raises_when_server_missing(tmp_path):
+    with pytest.raises(OSError):
+        render_server.request("ping", str(tmp_path / "absent.sock"))
+
+def test_render_pool_renders_in_workers(tmp_path, monkeypatch):
+    import shutil
+    import config
+    import render
+    root = os.path.join(os.path.dirname(__file__), "..")
+    pd = tmp_path / "pidisplay"
+    (pd / "state").mkdir(parents=True)
+    (pd / "images").mkdir()
+    os.symlink(os.path.abspath(os.path.join(root, "icons")), pd / "icons")
+    shutil.copy(os.path.join(root, "tests", "fixtures", "state", "btc.json"), pd / "state" / "btc.json")
+    monkeypatch.setattr(config, "CONFIG_PATH", config.Path(pd) / "config.yaml")
+    config.save_default()
+    monkeypatch.setenv("HOME", str(tmp_path))   # spawned workers resolve ~/pidisplay here
+    pool = render.RenderPool(workers=2)
+    try:
+        done = []
+        results = pool.render(["btc", "clock", "nope"], on_done=lambda n, r: done.append(n))
+    finally:
+        pool.close()
+    assert sorted(done) == ["btc", "clock", "nope"]
+    assert results["btc"]["ok"] and results["clock"]["ok"]
+    assert results["nope"]["error"] == "unknown card"
+    assert (pd / "images" / "btc.raw").stat().st_size == 480 * 320 * 2
+
+@pytest.mark.parametrize("error, local", [(ConnectionRefusedError, True), (FileNotFoundError, True),
+                                          (TimeoutError, False)])
+def test_client_falls_back_only_when_server_is_down(monkeypatch, error, local):
+    import sys
+    import render
+    def remote(names):
+        raise error("stand-in")
+    rendered = []
+    monkeypatch.setattr(render_server, "render_remote", remote)
+    monkeypatch.setattr(render_server, "render_local",
+                        lambda names: rendered.extend(names) or {n: {"ok": True, "ms": 0.0} for n in names})
+    monkeypatch.setattr(render_server.metrics, "configure", lambda cfg: None)
+    monkeypatch.setattr(render_server.metrics, "maybe_export", lambda: None)
+    monkeypatch.setattr("cards.base.get_config", lambda: None)
+    monkeypatch.setattr(sys, "argv", ["render.py", "--only", "clock"])
+    if local:
+        render.main()
+        assert rendered == ["clock"]
+    else:
+        with pytest.raises(SystemExit):
+            render.main()
+        assert rendered == []
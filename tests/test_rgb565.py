@@ -0,0 +1,85 @@
+# test_rgb565.py — every encoder path must produce identical framebuffer bytes
+import random
+import struct
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import rgb565
+
+W, H = 480, 320
+
+def _noise_image(w=64, h=40, seed=565):
+    rnd = random.Random(seed)
+    img = Image.new("RGB", (w, h))
+    img.putdata([(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)) for _ in range(w * h)])
+    return img
+
+def _legacy_atomic_save_bytes(img):
+    """The per-pixel loop cards/base.atomic_save used before rgb565.py."""
+    data = bytearray()
+    w, h = img.size
+    pixels = img.convert("RGB").load()
+    for y in range(h):
+        for x in range(w):
+            r, g, b = pixels[x, y]
+            pixel = (((r >> 3) & 0x1F) << 11) | (((g >> 2) & 0x3F) << 5) | ((b >> 3) & 0x1F)
+            data.extend(pixel.to_bytes(2, "little"))
+    return bytes(data)
+
+def _legacy_composite_bytes(img):
+    """The NumPy packer display_slideshow.composite_blit used before rgb565.py."""
+    pixels = np.array(img, dtype=np.uint16)
+    r = (pixels[:, :, 0] >> 3) & 0x1F
+    g = (pixels[:, :, 1] >> 2) & 0x3F
+    b = (pixels[:, :, 2] >> 3) & 0x1F
+    return ((r << 11) | (g << 5) | b).astype(np.uint16).tobytes("C")
+
+@pytest.mark.parametrize("order", rgb565.ORDERS)
+@pytest.mark.parametrize("endian", rgb565.ENDIANS)
+def test_vectorized_matches_reference(order, endian):
+    img = _noise_image()
+    assert rgb565.encode(img, order, endian) == rgb565.encode_py(img, order, endian)
+
+def test_matches_legacy_encoders():
+    img = _noise_image()
+    fast = rgb565.encode(img)
+    assert fast == _legacy_atomic_save_bytes(img)
+    assert fast == _legacy_composite_bytes(img)
+
+@pytest.mark.parametrize("order", rgb565.ORDERS)
+@pytest.mark.parametrize("endian", rgb565.ENDIANS)
+def test_solid_color_matches_frame_encoder(order, endian):
+    color = (12, 200, 255)
+    img = Image.new("RGB", (8, 4), color)
+    assert rgb565.solid(*color, 8, 4, order, endian) == rgb565.encode(img, order, endian)
+    fmt = "<H" if endian == "little" else ">H"
+    assert rgb565.pack_color(*color, order, endian) == struct.pack(fmt, rgb565.pack_pixel(*color, order))
+
+def test_known_values():
+    assert rgb565.pack_pixel(255, 0, 0) == 0xF800
+    assert rgb565.pack_pixel(0, 255, 0) == 0x07E0
+    assert rgb565.pack_pixel(0, 0, 255) == 0x001F
+    assert rgb565.pack_pixel(255, 0, 0, order="bgr") == 0x001F
+    assert rgb565.pack_color(255, 0, 0) == b"\x00\xf8"
+    assert rgb565.pack_color(255, 0, 0, endian="big") == b"\xf8\x00"
+
+def test_full_frame_size_and_rgba_input():
+    img = Image.new("RGBA", (W, H), (10, 20, 30, 128))
+    data = rgb565.encode(img)
+    assert len(data) == W * H * 2
+    assert data == rgb565.encode(img.convert("RGB"))
+
+def test_bad_order_rejected():
+    with pytest.raises(ValueError):
+        rgb565.encode(_noise_image(4, 4), order="grb")
+
+@pytest.mark.parametrize("order", rgb565.ORDERS)
+@pytest.mark.parametrize("endian", rgb565.ENDIANS)
+def test_decode_round_trips_565_values(order, endian):
+    img = _noise_image()
+    data = rgb565.encode(img, order, endian)
+    back = rgb565.decode_array(data, *img.size, order, endian)
+    assert back.shape == (img.size[1], img.size[0], 3)
+    assert rgb565.encode_array(back, order, endian).tobytes() == data
@@ -0,0 +1,88 @@
+# test_rss_stream.py — streaming RSS/Atom entries, early stop at stored ids, fetcher integration
+import asyncio
+import importlib
+import io
+import os
+
+import http_client
+import news_store
+import rss_stream
+
+FEEDS = os.path.join(os.path.dirname(__file__), "fixtures", "feeds")
+
+def feed(name):
+    with open(os.path.join(FEEDS, name), "rb") as f:
+        return f.read()
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><title>First &amp; best</title><id>urn:1</id><updated>2025-11-10T18:00:00Z</updated>
+<link rel="enclosure" href="https://x/img.jpg"/><link href="https://x/1"/></entry>
+<entry><title type="html">Second</title><id>urn:2</id><link rel="alternate" href="https://x/2"/></entry>
+</feed>"""
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, n=-1):
+        chunk = super().read(n)
+        self.bytes_read += len(chunk)
+        return chunk
+
+def test_rss_fixtures():
+    fox = list(rss_stream.entries(feed("fox_latest.xml")))
+    assert len(fox) == 50
+    assert fox[0].link.startswith("https://www.foxnews.com/") and fox[0].id == fox[0].link
+    assert fox[0].published == "Mon, 10 Nov 2025 12:50:00 -0500"
+    assert any(e.title.endswith("‘next steps’") for e in fox)
+    bb = list(rss_stream.entries(feed("breitbart.xml")))
+    assert len(bb) == 40
+    assert bb[0].title == "Treasury slams tax cut extension"
+    assert bb[0].id == "https://www.breitbart.com/?p=2100000"
+    assert any(e.title.endswith(" & Congress") for e in bb)
+
+def test_atom():
+    got = list(rss_stream.entries(ATOM))
+    assert [(e.title, e.link, e.id) for e in got] == [("First & best", "https://x/1", "urn:1"),
+                                                      ("Second", "https://x/2", "urn:2")]
+    assert got[0].published == "2025-11-10T18:00:00Z"
+
+def test_stops_at_first_seen_without_reading_the_rest():
+    data = feed("fox_latest.xml")
+    titles = [e.title for e in rss_stream.entries(data)]
+    known = set(titles[3:])
+    src = CountingReader(data)
+    got = [e.title for e in rss_stream.entries(src, seen=lambda e: e.title in known)]
+    assert got == titles[:3]
+    assert src.bytes_read < len(data) / 5
+
+def test_stop_after_tolerates_a_bumped_story_and_limit():
+    titles = [e.title for e in rss_stream.entries(feed("breitbart.xml"))]
+    known = {titles[0]} | set(titles[5:])
+    got = [e.title for e in rss_stream.entries(feed("breitbart.xml"), seen=lambda e: e.title in known, stop_after=3)]
+    assert got == titles[1:5]
+    assert len(list(rss_stream.entries(feed("breitbart.xml"), limit=7))) == 7
+
+class FeedHTTP:
+    def __init__(self, body):
+        self.body = body
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        return http_client.Response(url, 200, "OK", {}, self.body, len(self.body))
+
+    def parse_avoided(self, n=1):
+        pass
+
+def test_fetcher_adds_only_new_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_store, "STATE_DIR", str(tmp_path))
+    fox = importlib.import_module("fetch_news.fetch_fox")
+    asyncio.run(fox.fetch(FeedHTTP(feed("fox_latest.xml"))))
+    with news_store.NewsStore() as store:
+        assert store.count("fox") == 25
+        first = store.ids("fox")
+    asyncio.run(fox.fetch(FeedHTTP(feed("fox_latest.xml"))))
+    with news_store.NewsStore() as store:
+        assert store.ids("fox") == first
+    assert fox.parse(feed("fox_latest.xml"), first) == []
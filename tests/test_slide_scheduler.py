@@ -0,0 +1,37 @@
+# test_slide_scheduler.py — the main loop's wait ends on an event or when the slide is due
+import queue
+import threading
+import time
+
+import slide_scheduler
+
+def test_event_wakes_before_deadline():
+    q = queue.Queue()
+    slides = slide_scheduler.SlideScheduler(q)
+    slides.start(20)
+    threading.Timer(0.05, q.put, args=({"type": "tap"},)).start()
+    t0 = time.monotonic()
+    assert slides.wait() == {"type": "tap"}
+    assert time.monotonic() - t0 < 1
+    assert 19 < slides.remaining <= 20   # the slide keeps its deadline
+
+def test_deadline_returns_none_and_clears():
+    slides = slide_scheduler.SlideScheduler(queue.Queue())
+    slides.start(0.02)
+    assert slides.wait() is None
+    assert slides.deadline is None and slides.remaining is None
+
+def test_overdue_slide_does_not_block():
+    now = [100.0]
+    slides = slide_scheduler.SlideScheduler(queue.Queue(), clock=lambda: now[0])
+    slides.start(5)
+    now[0] = 106.0
+    assert slides.remaining == 0.0
+    assert slides.wait() is None
+
+def test_hold_waits_for_events_only():
+    q = queue.Queue()
+    slides = slide_scheduler.SlideScheduler(q)
+    slides.hold()
+    threading.Timer(0.1, q.put, args=({"type": "config"},)).start()
+    assert slides.wait() == {"type": "config"}
@@ -0,0 +1,79 @@
+# test_transitions.py — slide/fade frames from packed RGB565, monotonic pacing with frame drops
+import numpy as np
+import pytest
+
+import overlay
+import transitions
+
+H, W = 32, 48
+
+def _frames():
+    rng = np.random.default_rng(0)
+    return (rng.integers(0, 0x10000, (H, W), dtype=np.uint16),
+            rng.integers(0, 0x10000, (H, W), dtype=np.uint16))
+
+@pytest.mark.parametrize("direction", [1, -1])
+def test_slide_endpoints_and_shift(direction):
+    a, b = _frames()
+    assert (transitions.slide_frame(a, b, 0.0, direction) == a).all()
+    assert (transitions.slide_frame(a, b, 1.0, direction) == b).all()
+    half = transitions.slide_frame(a, b, 0.5, direction)
+    if direction == 1:
+        assert (half[:, :W // 2] == a[:, W // 2:]).all() and (half[:, W // 2:] == b[:, :W // 2]).all()
+    else:
+        assert (half[:, W // 2:] == a[:, :W // 2]).all() and (half[:, :W // 2] == b[:, W // 2:]).all()
+
+def test_fade_endpoints_and_midpoint():
+    a, b = _frames()
+    f = transitions.Fader(a, b)
+    assert (f.frame(0.0) == a).all()
+    assert (f.frame(1.0) == b).all()
+    mid = overlay.split(f.frame(0.5))
+    for got, pa, pb in zip(mid, overlay.split(a), overlay.split(b)):
+        want = (pa.astype(int) + pb.astype(int)) // 2
+        assert np.abs(got.astype(int) - want).max() <= 1
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+    def sleep(self, s):
+        self.now += s
+
+class SlowWriter:
+    """Stands in for FramebufferWriter; each write costs write_s of fake time."""
+    height, width = H, W
+    def __init__(self, clock, write_s):
+        self.clock, self.write_s, self.frames = clock, write_s, []
+    def write(self, frame):
+        self.clock.now += self.write_s
+        self.frames.append(frame.copy())
+
+def test_fast_panel_shows_every_intermediate_frame():
+    a, b = _frames()
+    clk = FakeClock()
+    w = SlowWriter(clk, 0.001)
+    written = []
+    st = transitions.run(w, a, b, "slide", fps=30, duration=0.3, clock=clk, sleep=clk.sleep,
+                         on_write=lambda: written.append(clk.now))
+    assert (st.frames_shown, st.frames_dropped) == (8, 0)     # frames 1..8; frame 9 is b, pushed by the caller
+    # frame i goes out at its slot i / fps, not one slot early; input latency is stamped at the first
+    assert written == pytest.approx([i / 30 + 0.001 for i in range(1, 9)])
+    assert clk.now == pytest.approx(0.3)                      # b is due at slot 9
+
+def test_slow_panel_drops_frames_instead_of_running_long():
+    a, b = _frames()
+    clk = FakeClock()
+    w = SlowWriter(clk, 0.05)   # 20 fps panel, 60 fps target
+    st = transitions.run(w, a, b, "fade", fps=60, duration=0.3, clock=clk, sleep=clk.sleep)
+    assert st.frames_dropped > 0
+    assert st.frames_shown + st.frames_dropped == 17
+    assert clk.now <= 0.3 + 0.05 + 1e-9
+
+def test_none_mode_writes_nothing():
+    a, b = _frames()
+    clk = FakeClock()
+    w = SlowWriter(clk, 0.0)
+    assert transitions.run(w, a, b, "none", clock=clk, sleep=clk.sleep).frames_shown == 0
+    assert w.frames == []
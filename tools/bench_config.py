@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# tools/bench_config.py - YAML parses and config cost per full render cycle
+import os, sys, time, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pathlib import Path
+import config
+from cards import base, clock, weather, btc, news
+
+def main():
+    config.CONFIG_PATH = Path(os.path.join(os.path.dirname(__file__), "..", "config.yaml"))
+    with tempfile.TemporaryDirectory() as out:
+        base.OUT = out
+        for cycle in range(3):
+            before = config.parse_count()
+            t0 = time.perf_counter()
+            for render in (clock, weather, btc, news):
+                render()
+            dt = (time.perf_counter() - t0) * 1000
+            print(f"cycle {cycle}: {config.parse_count() - before} YAML parse(s), {dt:7.1f} ms for 4 cards")
+
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        config.snapshot()
+    print(f"snapshot() when unchanged: {(time.perf_counter() - t0) * 1000:.3f} us/call")
+
+if __name__ == "__main__":
+    main()
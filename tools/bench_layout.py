@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# tools/bench_layout.py - wrap 200 fixture headlines: old wrap_text_px vs cards/layout
+import os, sys, json, time
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+from PIL import Image, ImageDraw, ImageFont
+from cards import base, layout
+
+FIXTURE = os.path.join(ROOT, "tests", "fixtures", "news.json")
+FONT_PATH = os.path.join(base.FONT_DIR, "DejaVuSans.ttf")
+MAX_W = base.W - 12 - 8 - 24 - 8 - 12   # title width in a news cell
+
+def legacy_wrap(d, text, fnt, max_w, max_lines=2):
+    """wrap_text_px as it was: re-measure the whole candidate line per word,
+    building a fresh font for every measurement."""
+    words = text.split()
+    lines, cur = [], []
+    for word in words:
+        test = " ".join(cur + [word])
+        l, t, r, b = d.textbbox((0, 0), test, font=ImageFont.truetype(FONT_PATH, fnt.size))
+        if r - l <= max_w:
+            cur.append(word)
+        else:
+            if cur:
+                lines.append(" ".join(cur))
+                cur = [word]
+            else:
+                lines.append(word)
+                cur = []
+        if len(lines) >= max_lines:
+            break
+    if cur:
+        lines.append(" ".join(cur))
+    if len(lines) > max_lines:
+        lines[-1] = lines[-1][:-3] + "..."
+    return lines
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+def main():
+    titles = [it["title"] for it in json.load(open(FIXTURE))["items"]]
+    d = ImageDraw.Draw(Image.new("RGB", (base.W, base.H)))
+    fnt = base.font(19)
+
+    old = timed(lambda: [legacy_wrap(d, t, fnt, MAX_W) for t in titles])
+    cold = timed(lambda: [layout.wrap(t, fnt, MAX_W, 2) for t in titles])
+    warm = timed(lambda: [layout.wrap(t, fnt, MAX_W, 2) for t in titles])
+
+    print(f"{len(titles)} headlines, max_w={MAX_W}px")
+    print(f"legacy wrap_text_px : {old:8.1f} ms")
+    print(f"layout.wrap (cold)  : {cold:8.1f} ms")
+    print(f"layout.wrap (warm)  : {warm:8.2f} ms")
+    print(f"ellipsized          : {sum(1 for t in titles if layout.wrap(t, fnt, MAX_W, 2)[-1].endswith(layout.ELLIPSIS))}")
+    print(layout.layout_cache_info())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# tools/bench_metrics.py - cost of metrics spans, and render overhead with metrics on vs off
+import os, sys, time, statistics
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+import metrics
+import render_harness
+
+def per_span_us(n=200_000):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        with metrics.span("bench"):
+            pass
+    return (time.perf_counter() - t0) / n * 1e6
+
+def render_ms(runs):
+    totals = []
+    for _ in range(runs):
+        res = render_harness.run(["full"], 1)
+        totals.append(sum(r["ms"]["total"] for r in res["full"].values()))
+    return statistics.median(totals)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    metrics.enabled = True
+    on_us = per_span_us()
+    metrics.enabled = False
+    off_us = per_span_us()
+    print(f"span enter/exit: {on_us:.2f} us enabled, {off_us:.2f} us disabled")
+
+    render_ms(1)   # warm fonts/atlas
+    metrics.reset()
+    off_runs, on_runs = [], []
+    for _ in range(runs):   # interleave so drift hits both sides
+        metrics.enabled = False
+        off_runs.append(render_ms(1))
+        metrics.enabled = True
+        on_runs.append(render_ms(1))
+    off, on = statistics.median(off_runs), statistics.median(on_runs)
+    print(f"render all cards (median of {runs}): {off:.1f} ms off, {on:.1f} ms on "
+          f"-> overhead {100 * (on - off) / off:+.2f}% (noise included)")
+    spans = sum(h["count"] for h in metrics.snapshot().values())
+    print(f"spans recorded: {spans}; modelled cost {spans * on_us / 1000:.3f} ms "
+          f"= {100 * spans * on_us / 1000 / (on * runs):.3f}% of render time")
+
+if __name__ == "__main__":
+    main()
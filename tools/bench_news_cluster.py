@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# tools/bench_news_cluster.py - pairwise headline clustering vs MinHash/LSH (in memory and in news.db)
+#
+#   python tools/bench_news_cluster.py            # 1k and 10k synthetic headlines
+#   python tools/bench_news_cluster.py --full     # also time the pairwise pass at 10k (minutes)
+import os, sys, time, random, argparse, tempfile
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+import news_cluster
+import news_store
+
+WORDS = ("senate house vote budget storm fire court judge ruling police city state border trade "
+         "tariff market stocks oil prices election governor mayor school strike union deal talks "
+         "report shows new plan bill law wins loses says warns amid after over record high low "
+         "china russia ukraine israel iran mexico texas florida california york").split()
+# plus a long tail of rarer words, Zipf-weighted like real headline vocabulary
+VOCAB = WORDS + [f"{w}{i}" for i in range(40) for w in ("name", "place", "topic")]
+WEIGHTS = [1 / (rank + 1) ** 0.8 for rank in range(len(VOCAB))]
+
+def stream(n, dup_rate=0.3, seed=1):
+    """n headlines, one a minute, oldest first; dup_rate of them restate an
+    earlier headline (case/punctuation changes or one extra word)."""
+    rnd = random.Random(seed)
+    items, t0 = [], 1762700000
+    for i in range(n):
+        if items and rnd.random() < dup_rate:
+            src = rnd.choice(items[-300:])["title"]
+            title = src.upper() + "!" if rnd.random() < 0.5 else src + " " + rnd.choice(WORDS) + "s"
+        else:
+            words = []
+            while len(words) < rnd.randint(8, 13):
+                w = rnd.choices(VOCAB, WEIGHTS)[0]
+                if w not in words:
+                    words.append(w)
+            title = " ".join(words).capitalize()
+        items.append({"id": f"s{i}", "source": rnd.choice(("fox", "breitbart")), "title": title,
+                      "url": None, "ts": news_store.to_iso(t0 + 60 * i), "tags": []})
+    return items
+
+def groups_by(assign):
+    out = {}
+    for item_id, cluster in assign.items():
+        out.setdefault(cluster, []).append(item_id)
+    return out.values()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000")
+    ap.add_argument("--full", action="store_true", help="run the pairwise pass at every size")
+    args = ap.parse_args()
+
+    for n in map(int, args.sizes.split(",")):
+        items = stream(n)
+        newest_first = sorted(items, key=lambda x: x["ts"], reverse=True)
+        print(f"--- {n} headlines")
+
+        t0 = time.perf_counter()
+        c = news_cluster.Clusterer()
+        lsh = {it["id"]: c.add(it["id"], it["title"]) for it in newest_first}
+        lsh_ms = (time.perf_counter() - t0) * 1000
+        print(f"lsh in memory : {lsh_ms:9.1f} ms  {len(c.leaders)} clusters, "
+              f"{c.compared / n:.2f} exact checks/item")
+
+        if n <= 2000 or args.full:
+            # same loop as news_cluster.pairwise, keeping membership for the comparison
+            t0 = time.perf_counter()
+            groups = []
+            for it in newest_first:
+                toks = news_cluster.tokens(it["title"])
+                for g in groups:
+                    if news_cluster.jaccard(toks, news_cluster.tokens(g[0]["title"])) >= news_cluster.THRESHOLD:
+                        g.append(it)
+                        break
+                else:
+                    groups.append([it])
+            pw_ms = (time.perf_counter() - t0) * 1000
+            same = sorted(sorted(it["id"] for it in g) for g in groups) == \
+                sorted(sorted(g) for g in groups_by(lsh))
+            print(f"pairwise      : {pw_ms:9.1f} ms  {len(groups)} clusters  "
+                  f"-> {pw_ms / lsh_ms:.0f}x, partitions {'match' if same else 'DIFFER'}")
+        else:
+            print("pairwise      :   skipped (O(n x groups); --full to run)")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with news_store.NewsStore(os.path.join(tmp, "news.db")) as store:
+                t0 = time.perf_counter()
+                for i in range(0, n, 25):   # a feed poll's worth at a time
+                    store.add(items[i:i + 25])
+                ingest_ms = (time.perf_counter() - t0) * 1000
+                t0 = time.perf_counter()
+                recent = store.recent(["fox", "breitbart"], since=0)
+                reps = news_cluster.group(recent, 5)
+                render_ms = (time.perf_counter() - t0) * 1000
+        print(f"store ingest  : {ingest_ms:9.1f} ms  ({ingest_ms / n * 1000:.0f} us/item incl. commit per 25)")
+        print(f"store render  : {render_ms:9.1f} ms  query + group, top cluster x{reps[0]['count']}")
+
+if __name__ == "__main__":
+    main()
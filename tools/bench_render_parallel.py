@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# tools/bench_render_parallel.py - full re-render (all cards): serial vs the render.py process pool
+#
+#   python tools/bench_render_parallel.py [runs]
+#
+# Runs against fixture state in a throwaway $HOME. "render.py subprocess" is
+# what display_slideshow used to block on after a config change: a fresh
+# interpreter rendering the cards one after another. Speedups are against
+# that and against a warm serial render; on a 1-core box the pool can't win.
+import os, sys, time, shutil, statistics, subprocess, tempfile
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+STATE = {"btc.json": "state/btc.json", "weather.json": "state/weather_day.json", "news.json": "news.json"}
+
+def fake_home():
+    home = tempfile.mkdtemp(prefix="bench_render_")
+    pd = os.path.join(home, "pidisplay")
+    os.makedirs(os.path.join(pd, "state"))
+    os.makedirs(os.path.join(pd, "images"))
+    os.symlink(os.path.join(ROOT, "icons"), os.path.join(pd, "icons"))
+    for dst, src in STATE.items():
+        shutil.copy(os.path.join(FIXTURES, src), os.path.join(pd, "state", dst))
+    return home
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    home = fake_home()
+    os.environ["HOME"] = home   # before config/cards compute their ~ paths; inherited by workers
+    sys.path.insert(0, ROOT)
+    import config
+    config.save_default()
+    import render, render_server
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        cmd = [sys.executable, os.path.join(ROOT, "render.py"), "--local"]
+        sub_ms = timed(lambda: subprocess.run(cmd, check=True, capture_output=True), max(1, runs // 2))
+
+        renderers = render_server.warm_up()
+        render_server.render_local(None, renderers)
+        serial_ms = timed(lambda: render_server.render_local(None, renderers), runs)
+
+        t0 = time.perf_counter()
+        pool = render.RenderPool()
+        pool.warm()
+        warm_ms = (time.perf_counter() - t0) * 1000
+        pool.render()
+        parallel_ms = timed(pool.render, runs)
+        pool.close()
+
+        print(f"cores: {os.cpu_count()}, pool workers: {pool.workers}, cards: {len(render_server.CARD_NAMES)}")
+        print(f"{'render.py subprocess (old)':28s} {sub_ms:8.1f} ms")
+        print(f"{'serial, warm process':28s} {serial_ms:8.1f} ms")
+        print(f"{'pool, warm workers':28s} {parallel_ms:8.1f} ms   "
+              f"x{sub_ms / parallel_ms:.1f} vs subprocess, x{serial_ms / parallel_ms:.2f} vs warm serial")
+        print(f"{'pool start + warm-up (once)':28s} {warm_ms:8.1f} ms")
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
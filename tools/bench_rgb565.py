@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# tools/bench_rgb565.py - per-frame RGB565 encode time, old loop vs rgb565.encode()
+import os, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from PIL import Image, ImageDraw
+import rgb565
+
+W, H = 480, 320
+
+def sample_frame():
+    img = Image.new("RGB", (W, H), (12, 12, 12))
+    d = ImageDraw.Draw(img)
+    for i in range(0, W, 8):
+        d.line([(i, 0), (W - i, H)], fill=(i % 256, (i * 3) % 256, 255 - i % 256))
+    return img
+
+def bench(fn, img, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn(img)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    img = sample_frame()
+    slow = bench(rgb565.encode_py, img, 3)
+    fast = bench(rgb565.encode, img, 20)
+    print(f"per-pixel loop : {slow * 1000:8.1f} ms/frame")
+    print(f"rgb565.encode  : {fast * 1000:8.1f} ms/frame")
+    print(f"speedup        : {slow / fast:8.1f}x")
+    for order in rgb565.ORDERS:
+        for endian in rgb565.ENDIANS:
+            t = bench(lambda im: rgb565.encode(im, order, endian), img, 20)
+            print(f"  {order}565 {endian:6}: {t * 1000:6.2f} ms/frame")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# tools/bench_rss.py - feedparser vs rss_stream on the fixture Fox/Breitbart feeds: time and peak memory
+#
+#   python tools/bench_rss.py [runs]
+#
+# feedparser is what the fetchers used to parse every poll with; it is
+# optional here (the fetchers only need it as a fallback for broken XML).
+import os, sys, time, statistics, tracemalloc, importlib
+import xml.etree.ElementTree as ET
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+import rss_stream
+
+FEEDS = os.path.join(ROOT, "tests", "fixtures", "feeds")
+FILES = {"fox": "fox_latest.xml", "breitbart": "breitbart.xml"}
+
+def measure(fn, runs):
+    """(median ms, peak KiB) of fn(); peak from a separate tracemalloc run."""
+    fn()
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    try:
+        feedparser = importlib.import_module("feedparser")
+    except ImportError:
+        feedparser = None
+
+    for src, name in FILES.items():
+        with open(os.path.join(FEEDS, name), "rb") as f:
+            data = f.read()
+        titles = [e.title for e in rss_stream.entries(data)]
+        print(f"--- {src}: {len(data) / 1024:.0f} KiB, {len(titles)} entries")
+        cases = {}
+        if feedparser is not None:
+            cases["feedparser (full parse)"] = lambda: feedparser.parse(data).entries[:25]
+        cases["ElementTree (whole document)"] = lambda: ET.fromstring(data)
+        cases["rss_stream, first poll (25)"] = lambda: list(rss_stream.entries(data, limit=25))
+        new3 = set(titles[3:])
+        cases["rss_stream, 3 new entries"] = lambda: list(
+            rss_stream.entries(data, seen=lambda e: e.title in new3, stop_after=3, limit=25))
+        every = set(titles)
+        cases["rss_stream, steady state"] = lambda: list(
+            rss_stream.entries(data, seen=lambda e: e.title in every, stop_after=3, limit=25))
+        for label, fn in cases.items():
+            ms, kib = measure(fn, runs)
+            print(f"{label:30s} {ms:8.2f} ms  peak {kib:8.0f} KiB")
+        if feedparser is None:
+            print("feedparser                      not installed (pip install feedparser to compare)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# tools/bench_transitions.py - frames per second per transition mode
+#
+# Runs on the device against /dev/fb1 (or PIDISPLAY_FB=/tmp/fb1.raw headless):
+#   python tools/bench_transitions.py [--fps 30] [--duration 0.3] [--runs 5]
+# "compute" is frame generation alone; "paced" is transitions.run() through
+# FramebufferWriter at the target FPS, with frames dropped when behind.
+import os, sys, time, argparse
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+import numpy as np
+import framebuffer, fbwriter, transitions
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fps", type=int, default=30)
+    ap.add_argument("--duration", type=float, default=0.3)
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    fb = framebuffer.open_framebuffer(framebuffer.DEFAULT_DEVICE)
+    writer = fbwriter.FramebufferWriter(fb)
+    shape = (fb.height, fb.width)
+    rng = np.random.default_rng(1)
+    a = rng.integers(0, 0x10000, shape, dtype=np.uint16)
+    b = rng.integers(0, 0x10000, shape, dtype=np.uint16)
+    out = np.empty(shape, dtype=np.uint16)
+    print(f"{fb.device}: {fb.width}x{fb.height}, target {args.fps} fps, {args.duration * 1000:.0f} ms")
+
+    for mode in ("slide", "fade"):
+        n = 60
+        t0 = time.perf_counter()
+        if mode == "fade":
+            f = transitions.Fader(a, b)
+            for i in range(n):
+                f.frame(i / n, out)
+        else:
+            for i in range(n):
+                transitions.slide_frame(a, b, i / n, 1, out)
+        compute = n / (time.perf_counter() - t0)
+
+        shown = dropped = 0
+        ms = 0.0
+        for _ in range(args.runs):
+            writer.write(a)
+            st = transitions.run(writer, a, b, mode, fps=args.fps, duration=args.duration)
+            shown += st.frames_shown
+            dropped += st.frames_dropped
+            ms += st.ms
+        print(f"{mode:5s}: compute {compute:7.1f} fps | paced {shown / (ms / 1000):5.1f} fps, "
+              f"{shown} shown / {dropped} dropped over {args.runs} runs")
+    writer.close()
+    fb.close()
+
+if __name__ == "__main__":
+    main()
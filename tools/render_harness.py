@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# tools/render_harness.py - headless golden-image renders + per-card phase timings
+#
+# Renders every card against fixture state (tests/fixtures/state) in a temp
+# dir with a frozen clock, hashes the .raw/.png output and compares with
+# tests/golden/render_hashes.json. Timings are split into the phases
+# cards/base.py records: state load, draw, encode, frame hash, raw write,
+# fsync. The .png preview is written afterwards (base.save_png) and timed
+# on its own, outside the render total.
+#
+#   python tools/render_harness.py             # check + timing table
+#   python tools/render_harness.py --runs 5    # median over 5 renders per card
+#   python tools/render_harness.py --update    # rewrite the golden hashes
+#
+# Goldens depend on the DejaVu/FreeType/Pillow build; regenerate with
+# --update after a deliberate visual change or a platform upgrade.
+import os, sys, json, time, shutil, hashlib, argparse, tempfile, importlib, statistics
+from contextlib import contextmanager
+from datetime import datetime, timezone
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+import config
+import cards
+from cards import base, atlas
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+STATE_FIXTURES = os.path.join(FIXTURES, "state")
+GOLDEN = os.path.join(ROOT, "tests", "golden", "render_hashes.json")
+ICON_DIR = os.path.join(ROOT, "icons")
+
+CARDS = ("clock", "weather", "btc", "news")
+PHASES = ("state", "draw", "encode", "hash", "write", "fsync")
+
+# 13:07 in New York == 18:07 UTC; fixture timestamps are relative to this
+FROZEN_LOCAL = datetime(2025, 11, 10, 13, 7, 0)
+FROZEN_UTC = datetime(2025, 11, 10, 18, 7, 0, tzinfo=timezone.utc)
+
+# case -> {state file: fixture file}
+CASES = {
+    "full":    {"btc.json": "state/btc.json", "weather.json": "state/weather_day.json",
+                "news.json": "news.json"},
+    "night":   {"btc.json": "state/btc_down.json", "weather.json": "state/weather_night.json",
+                "news.json": "news.json"},
+    "offline": {"btc.json": "state/offline_btc.json", "weather.json": "state/offline_weather.json",
+                "news.json": "state/news_stale.json"},
+    "empty":   {},
+}
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        if tz is None:
+            return cls.fromisoformat(FROZEN_LOCAL.isoformat())
+        return cls.fromisoformat(FROZEN_UTC.astimezone(tz).isoformat())
+
+    @classmethod
+    def utcnow(cls):
+        return cls.fromisoformat(FROZEN_UTC.replace(tzinfo=None).isoformat())
+
+_ICON_NAMES = ("ICON_DIR", "ICON_WEATHER_BASE", "ICON_WEATHER_LAYERS", "ICON_WEATHER_TINY")
+# cards/__init__ rebinds cards.btc etc. to the render functions; we need the modules
+_CARD_MODULES = (base,) + tuple(importlib.import_module(f"cards.{n}") for n in CARDS)
+
+def _set(saved, mod, name, value):
+    saved.append((mod, name, getattr(mod, name)))
+    setattr(mod, name, value)
+
+@contextmanager
+def sandbox(root, case):
+    """Point config, base.OUT, state, icons and the atlas at root; fill
+    root/state with the case's fixtures; freeze datetime.now() in the cards.
+    Everything is restored on exit."""
+    out, state = os.path.join(root, "images"), os.path.join(root, "state")
+    os.makedirs(out, exist_ok=True)
+    shutil.rmtree(state, ignore_errors=True)
+    os.makedirs(state)
+    for dst, src in CASES[case].items():
+        shutil.copy(os.path.join(FIXTURES, src), os.path.join(state, dst))
+
+    icons = {
+        "ICON_DIR": ICON_DIR,
+        "ICON_WEATHER_BASE": os.path.join(ICON_DIR, "weather", "base"),
+        "ICON_WEATHER_LAYERS": os.path.join(ICON_DIR, "weather", "layers"),
+        "ICON_WEATHER_TINY": os.path.join(ICON_DIR, "weather", "layers", "tiny_layers"),
+    }
+    saved = []
+    try:
+        _set(saved, config, "CONFIG_PATH", config.Path(root) / "config.yaml")
+        if not config.CONFIG_PATH.exists():
+            config.save_default()   # goldens follow the defaults, not the local config.yaml
+        _set(saved, base, "OUT", out)
+        _set(saved, base, "STATE_DIR", state)
+        _set(saved, atlas, "ATLAS_PATH", os.path.join(root, "icons.atlas"))
+        for mod in _CARD_MODULES:
+            for name in _ICON_NAMES:
+                if hasattr(mod, name):
+                    _set(saved, mod, name, icons[name])
+            _set(saved, mod, "datetime", FrozenDatetime)
+        atlas._current = None
+        base._icon_cache.clear()
+        yield root
+    finally:
+        for mod, name, value in reversed(saved):
+            setattr(mod, name, value)
+        atlas._current = None
+        base._icon_cache.clear()
+
+def _sha(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def render_card(name):
+    """Render one card (inside a sandbox). Returns hashes + phase timings in ms."""
+    base.reset_phases()
+    t0 = time.perf_counter()
+    getattr(cards, name)()
+    total = (time.perf_counter() - t0) * 1000
+    ms = {p: base.phase_ms.get(p, 0.0) for p in PHASES if p != "draw"}
+    ms["draw"] = total - sum(ms.values())
+    ms["total"] = total
+    t0 = time.perf_counter()
+    base.save_png(name).result()
+    ms["png"] = (time.perf_counter() - t0) * 1000
+    return {
+        "raw": _sha(os.path.join(base.OUT, f"{name}.raw")),
+        "png": _sha(os.path.join(base.OUT, f"{name}.png")),
+        "ms": ms,
+    }
+
+def run(cases=None, runs=1, root=None):
+    """{case: {card: {"raw", "png", "ms": {phase: median ms}}}}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = root or tmp
+        for case in cases or CASES:
+            with sandbox(root, case):
+                results[case] = {}
+                for name in CARDS:
+                    samples = [render_card(name) for _ in range(runs)]
+                    r = samples[-1]
+                    r["ms"] = {p: round(statistics.median(s["ms"][p] for s in samples), 2)
+                               for p in r["ms"]}
+                    results[case][name] = r
+    return results
+
+def load_golden(path=GOLDEN):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, golden, kinds=("raw", "png")):
+    """[(case, card, kind)] for every hash that differs from the goldens.
+    The .raw hash is the panel frame; the .png hash also depends on zlib."""
+    bad = []
+    for case, by_card in results.items():
+        for name, r in by_card.items():
+            want = golden.get(case, {}).get(name, {})
+            for kind in kinds:
+                if r[kind] != want.get(kind):
+                    bad.append((case, name, kind))
+    return bad
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--update", action="store_true", help="write current hashes as the goldens")
+    ap.add_argument("--case", nargs="*", choices=list(CASES))
+    args = ap.parse_args()
+
+    results = run(args.case, args.runs)
+    cols = PHASES + ("total", "png")
+    print(f"{'case':8s} {'card':8s} " + " ".join(f"{p:>7s}" for p in cols) + "  (ms, median)")
+    for case, by_card in results.items():
+        for name, r in by_card.items():
+            print(f"{case:8s} {name:8s} " + " ".join(f"{r['ms'][p]:7.1f}" for p in cols))
+
+    if args.update:
+        os.makedirs(os.path.dirname(GOLDEN), exist_ok=True)
+        golden = {case: {n: {"raw": r["raw"], "png": r["png"]} for n, r in by_card.items()}
+                  for case, by_card in results.items()}
+        with open(GOLDEN + ".tmp", "w") as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(GOLDEN + ".tmp", GOLDEN)
+        print(f"Wrote {GOLDEN}")
+        return
+    bad = compare(results, load_golden())
+    for case, name, kind in bad:
+        print(f"MISMATCH {case}/{name} {kind}")
+    print("golden: OK" if not bad else f"golden: {len(bad)} mismatch(es)")
+    sys.exit(1 if bad else 0)
+
+if __name__ == "__main__":
+    main()
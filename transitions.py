@@ -0,0 +1,109 @@
+# transitions.py - Slide / cross-fade between two cached RGB565 frames
+#
+# Intermediate frames are built straight from the packed HxW uint16 frames
+# the slideshow already keeps in frame_cache: a slide is two row-block
+# copies, a fade blends the 5/6/5 channel planes with integer weights.
+# Frames are paced to a target FPS against time.monotonic(); if the panel
+# (or the Pi) falls behind, late frames are dropped so the transition
+# still ends on time instead of running long.
+#
+# Only intermediate frames are written here - the caller pushes the final
+# frame itself (push_frame), so logging and the live clock stay in one place.
+
+import time
+from collections import namedtuple
+import numpy as np
+import overlay
+
+MODES = ("none", "slide", "fade")
+DEFAULT_FPS = 30
+DEFAULT_DURATION = 0.3   # seconds
+
+TransitionStats = namedtuple("TransitionStats", "mode frames_shown frames_dropped ms fps")
+
+def _as_frame(frame, shape=None):
+    if isinstance(frame, np.ndarray):
+        return frame
+    a = np.frombuffer(frame, dtype="<u2")
+    return a.reshape(shape) if shape else a
+
+def slide_frame(a, b, t, direction=1, out=None):
+    """Frame t (0..1) of b sliding in over a. direction=1: b enters from the
+    right (next card), -1: from the left (previous card)."""
+    h, w = a.shape
+    s = min(max(int(round(t * w)), 0), w)
+    out = np.empty_like(a) if out is None else out
+    if direction >= 0:
+        out[:, :w - s] = a[:, s:]
+        out[:, w - s:] = b[:, :s]
+    else:
+        out[:, s:] = a[:, :w - s]
+        out[:, :s] = b[:, w - s:]
+    return out
+
+class Fader:
+    """Cross-fade a -> b. Channel planes are split once; each frame is
+    (a * (256 - k) + b * k) >> 8 per plane, all in uint16."""
+
+    def __init__(self, a, b):
+        self.a = overlay.split(a.astype(np.uint16))
+        self.b = overlay.split(b.astype(np.uint16))
+        self._tmp = np.empty_like(a, dtype=np.uint16)
+
+    def frame(self, t, out=None):
+        k = min(max(int(round(t * 256)), 0), 256)
+        out = np.empty(self._tmp.shape, dtype=np.uint16) if out is None else out
+        tmp = self._tmp
+        out[...] = 0
+        for shift, pa, pb in zip((11, 5, 0), self.a, self.b):
+            # max 63 * 256 per plane: fits uint16 without widening
+            np.multiply(pa, 256 - k, out=tmp)
+            tmp += pb * np.uint16(k)
+            tmp >>= 8
+            tmp <<= shift
+            out |= tmp
+        return out
+
+def run(writer, a, b, mode="slide", direction=1, fps=DEFAULT_FPS, duration=DEFAULT_DURATION,
+        clock=time.monotonic, sleep=time.sleep, on_write=None):
+    """Write the intermediate frames of an a -> b transition to writer
+    (FramebufferWriter). Frame i is computed, held until its slot at
+    start + i / fps and then written; frames whose slot has already passed
+    are skipped. Returns at slot n, when the caller writes b. on_write()
+    runs after each frame written. Returns TransitionStats."""
+    t0 = clock()
+    n = max(int(round(duration * fps)), 1)   # frame n is b itself, left to the caller
+    if mode not in ("slide", "fade") or n < 2:
+        return TransitionStats(mode, 0, 0, 0.0, 0.0)
+    shape = (writer.height, writer.width)
+    a, b = _as_frame(a, shape), _as_frame(b, shape)
+    out = np.empty(shape, dtype=np.uint16)
+    fader = Fader(a, b) if mode == "fade" else None
+
+    shown = dropped = 0
+    i = 0
+    while True:
+        due = int((clock() - t0) * fps) + 1    # first slot that hasn't passed yet
+        if due >= n:
+            dropped += n - 1 - i
+            break
+        dropped += due - i - 1
+        i = due
+        t = i / n
+        if fader is not None:
+            fader.frame(t, out)
+        else:
+            slide_frame(a, b, t, direction, out)
+        delay = t0 + i / fps - clock()
+        if delay > 0:
+            sleep(delay)
+        writer.write(out)
+        shown += 1
+        if on_write is not None:
+            on_write()
+    delay = t0 + n / fps - clock()
+    if shown and delay > 0:
+        sleep(delay)   # the last frame gets its full slot before b replaces it
+    ms = (clock() - t0) * 1000
+    return TransitionStats(mode, shown, dropped, round(ms, 1),
+                           round(shown / (ms / 1000), 1) if ms else 0.0)